@@ -1,4 +1,4 @@
-from copy import deepcopy
+from copy import copy
 from dataclasses import dataclass
 
 from flanker_ai.components import AiConfigComponent
@@ -27,6 +27,7 @@ from flanker_core.models.outcomes import InvalidAction
 from flanker_core.systems.action_system import ActionSystem
 from flanker_core.systems.initiative_system import InitiativeSystem
 from flanker_core.systems.objective_system import ObjectiveSystem
+from flanker_core.utils.component_cloner import ComponentCloner
 
 _MAX_ACTION_PER_INITIATIVE = 20
 
@@ -40,9 +41,18 @@ class AiActionResult:
 
 
 @dataclass
-class _AiAgentInstanceComponent:
-    faction: InitiativeState.Faction
-    agent: "AiAgent"
+class _AiAgentRegistryComponent:
+    """Singleton component that keeps the built agent of each faction."""
+
+    agents: dict[InitiativeState.Faction, "AiAgent"]
+
+
+# Agents are runtime objects bound to the state that built them, so copies
+# start empty and build their own agents on first use
+ComponentCloner.register(
+    _AiAgentRegistryComponent,
+    lambda _: _AiAgentRegistryComponent({}),
+)
 
 
 class AiAgent:
@@ -78,7 +88,7 @@ class AiAgent:
                 break
 
             # Prepare the representation and run the policy on it
-            rs = deepcopy(self.rs)
+            rs = copy(self.rs)
             rs.update_state(self.gs)
             action, size = self.policy.get_action(rs)
             if action == None:
@@ -93,11 +103,11 @@ class AiAgent:
             ai_action_result = AiActionResult(
                 action=action,
                 result=result,
-                result_gs=self.gs,
+                # Prevent mutation by creating a copy
+                result_gs=self.gs.copy(),
                 search_size=size,
             )
-            # Prevent mutation by creating a copy
-            action_results.append(deepcopy(ai_action_result))
+            action_results.append(ai_action_result)
             halt_counter += 1
         return action_results
 
@@ -108,11 +118,12 @@ class AiAgent:
     ) -> "AiAgent":
         """Use the config to build an AI agent, or reuse agent if exists."""
 
-        # Get the agent instance component if already exists
-        for _, agent_instance in gs.query(_AiAgentInstanceComponent):
-            if agent_instance.faction != faction:
-                continue
-            return agent_instance.agent
+        # Get the agent instance if already exists
+        if registry := gs.try_singleton(_AiAgentRegistryComponent):
+            if faction in registry.agents:
+                return registry.agents[faction]
+        else:
+            gs.set_singleton(_AiAgentRegistryComponent({}))
 
         # If not exist, create a new empty one using config
         config_component: AiConfigComponent | None = None
@@ -175,10 +186,5 @@ class AiAgent:
                         )
 
         agent = AiAgent(gs, faction, state, policy)
-        gs.add_entity(
-            _AiAgentInstanceComponent(
-                faction=faction,
-                agent=agent,
-            )
-        )
+        gs.get_mut_singleton(_AiAgentRegistryComponent).agents[faction] = agent
         return agent
@@ -7,47 +7,46 @@ from flanker_core.systems.fire_system import FireSystem
 class AiBranchAbstractionService:
 
     @staticmethod
-    def _find_one_mergable_branch_pair(
-        branches: list[tuple[float, GameState]],
+    def _is_mergable(
+        branch_left: GameState,
+        branch_right: GameState,
         action: Action,
-    ) -> tuple[int, int] | None:
+    ) -> bool:
         """
-        Returns a pair of branch indices that are considered mergable.
+        Returns whether two branches are considered mergable.
         This uses a simple criteria that the two units must be the same.
         """
-        for left_id, (_, branch_left) in enumerate(branches):
-            for right_id, (_, branch_right) in enumerate(branches):
-                if left_id == right_id:
-                    continue
+        # Filter on combat unit equality
+        unit_left = branch_left.try_component(action.unit_id, CombatUnit)
+        unit_right = branch_right.try_component(action.unit_id, CombatUnit)
+        if unit_left != unit_right:
+            return False
 
-                # Filter on combat unit equality
-                unit_left = branch_left.try_component(action.unit_id, CombatUnit)
-                unit_right = branch_right.try_component(action.unit_id, CombatUnit)
-                if unit_left != unit_right:
-                    continue
+        # Killed in both branches; nothing else to compare
+        if unit_left is None:
+            return True
 
-                # Filter on unit status equality
-                left_unit_status = FireSystem.get_status(branch_left, action.unit_id)
-                right_unit_status = FireSystem.get_status(branch_right, action.unit_id)
-                if left_unit_status != right_unit_status:
-                    continue
+        # Filter on unit status equality
+        left_unit_status = FireSystem.get_status(branch_left, action.unit_id)
+        right_unit_status = FireSystem.get_status(branch_right, action.unit_id)
+        if left_unit_status != right_unit_status:
+            return False
 
-                # Filter on fire controls equality
-                match action:
-                    case FireAction():
-                        unit_left_fire = branch_left.try_component(
-                            action.unit_id, FireControls
-                        )
-                        unit_right_fire = branch_left.try_component(
-                            action.unit_id, FireControls
-                        )
-                        if unit_left_fire != unit_right_fire:
-                            continue
-                    case _:
-                        ...
+        # Filter on fire controls equality
+        match action:
+            case FireAction():
+                unit_left_fire = branch_left.try_component(
+                    action.unit_id, FireControls
+                )
+                unit_right_fire = branch_right.try_component(
+                    action.unit_id, FireControls
+                )
+                if unit_left_fire != unit_right_fire:
+                    return False
+            case _:
+                ...
 
-                return (left_id, right_id)
-        return None
+        return True
 
     @staticmethod
     def merge_branches(
@@ -58,28 +57,18 @@ class AiBranchAbstractionService:
         if branches == []:
             raise ValueError("The provided branches list is empty.")
 
-        new_branches: list[tuple[float, GameState]] = list(branches)
-
-        # Keep merging until can't merge no more.
-        while True:
-            # Find a pair that can be merged
-            pair = AiBranchAbstractionService._find_one_mergable_branch_pair(
-                new_branches, action
-            )
-            if pair == None:
-                break
-
-            # Pair found, add a new merged branch. Assume that the
-            # left branch is considered representative of both branches.
-            left_index, right_index = pair
-            left_probability, left_branch = new_branches[left_index]
-            right_probability, _ = new_branches[right_index]
-            new_probability = left_probability + right_probability
-            new_state = left_branch
-
-            # Update the list of branches
-            new_branches[left_index] = (new_probability, new_state)
-            new_branches.pop(right_index)
+        # Merge each branch into the first similar one. Assume that the
+        # first branch is considered representative of the merged branches.
+        new_branches: list[tuple[float, GameState]] = []
+        for probability, branch in branches:
+            for i, (merged_probability, merged_branch) in enumerate(new_branches):
+                if AiBranchAbstractionService._is_mergable(
+                    merged_branch, branch, action
+                ):
+                    new_branches[i] = (merged_probability + probability, merged_branch)
+                    break
+            else:
+                new_branches.append((probability, branch))
         return new_branches
 
     @staticmethod
@@ -1,7 +1,5 @@
-from dataclasses import replace
 from itertools import product
 from math import prod
-from typing import Any
 from uuid import UUID
 
 from flanker_core.gamestate import GameState
@@ -12,21 +10,23 @@ from flanker_core.models.actions import (
     MoveAction,
     PivotAction,
 )
-from flanker_core.models.components import (
-    AssaultControls,
-    CombatUnit,
-    EliminationWinCondition,
-    FireControls,
-    InitiativeState,
-    StallLoseCondition,
-    Transform,
-)
+from flanker_core.models.components import AssaultControls, CombatUnit, FireControls
 from flanker_core.models.outcomes import AssaultOutcomes, FireOutcomes, InvalidAction
 from flanker_core.models.vec2 import Vec2
 from flanker_core.systems.action_system import ActionSystem
 from flanker_core.systems.fire_system import FireSystem
 from flanker_core.systems.move_system import MoveSystem
 
+_REACTIVE_FIRE_PROBABILITIES = {
+    FireOutcomes.PIN: 0.6,
+    FireOutcomes.SUPPRESS: 0.4,
+}
+_FIRE_PROBABILITIES = {
+    # Make AI assume it's more likely to suppress
+    FireOutcomes.SUPPRESS: 0.6,
+    FireOutcomes.PIN: 0.4,
+}
+
 
 class AiBranchingService:
     """
@@ -63,107 +63,97 @@ class AiBranchingService:
 
     @staticmethod
     def copy(gs: GameState) -> GameState:
-        """Selectively copy the game state for mutating entities."""
-
-        return gs.selective_copy(
-            # Copy the combat units
-            Transform,
-            CombatUnit,
-            FireControls,
-            AssaultControls,
-            # Copy the match-level data
-            InitiativeState,
-            EliminationWinCondition,
-            StallLoseCondition,
-            copy_method=replace,
-        )
+        """Copy the game state; components are only cloned once mutated."""
+        return gs.fork()
 
     @staticmethod
-    def get_reactive_fire_branches(
+    def get_reactive_fire_outcomes(
+        interrupt_candidates: list[tuple[Vec2, list[UUID]]],
+        outcome_probabilities: dict[FireOutcomes, float],
+    ) -> list[tuple[float, dict[UUID, FireOutcomes]]]:
+        """
+        Get the probability of each distinct reactive fire result of a move,
+        and the fire outcomes of the spotters that produce it. Spotters at
+        an interrupt fire in order and any hit stops the move, so a result
+        only depends on the interrupt and the worst outcome suffered there.
+        """
+        miss = outcome_probabilities.get(FireOutcomes.MISS, 0.0)
+        pin = outcome_probabilities.get(FireOutcomes.PIN, 0.0)
+        suppress = outcome_probabilities.get(FireOutcomes.SUPPRESS, 0.0)
+
+        outcomes: list[tuple[float, dict[UUID, FireOutcomes]]] = []
+        missed: dict[UUID, FireOutcomes] = {}  # Spotters of earlier interrupts
+        reach_probability = 1.0
+        for _, spotter_ids in interrupt_candidates:
+            n = len(spotter_ids)
+            all_miss = reach_probability * miss**n
+            # Pinned if no shot suppressed or killed, suppressed if exactly
+            # one suppressed; a second suppress or any kill is fatal
+            pinned = reach_probability * ((miss + pin) ** n - miss**n)
+            suppressed = reach_probability * n * suppress * (miss + pin) ** (n - 1)
+            killed = reach_probability - all_miss - pinned - suppressed
+
+            # Represent each result by its most likely order of outcomes
+            first, *rest = spotter_ids
+            if pinned > 0:
+                overrides = {uid: FireOutcomes.PIN for uid in spotter_ids}
+                outcomes.append((pinned, missed | overrides))
+            if suppressed > 0:
+                overrides = {uid: FireOutcomes.PIN for uid in rest}
+                overrides[first] = FireOutcomes.SUPPRESS
+                outcomes.append((suppressed, missed | overrides))
+            if killed > 1e-12:
+                if n >= 2 and suppress > 0:
+                    overrides = {uid: FireOutcomes.SUPPRESS for uid in spotter_ids}
+                else:
+                    overrides = {uid: FireOutcomes.KILL for uid in spotter_ids}
+                outcomes.append((killed, missed | overrides))
+
+            missed = missed | {uid: FireOutcomes.MISS for uid in spotter_ids}
+            reach_probability = all_miss
+            if reach_probability == 0:
+                break
+
+        # No interrupt hit; the move is completed
+        if reach_probability > 0:
+            outcomes.append((reach_probability, missed))
+        return outcomes
+
+    @staticmethod
+    def get_override_branches(
         gs: GameState,
-        unit_id: UUID,
-        move_to: Vec2,
+        outcomes: list[tuple[float, dict[UUID, FireOutcomes]]],
     ) -> list[tuple[float, GameState]]:
-        """Get new game state branches configured with reactive fire overrides."""
-
-        reactive_fire_candidates = MoveSystem.get_interrupt_candidates(
-            gs, unit_id, move_to
-        )
-        reactive_fire_ids = {
-            uid for _, uuid_list in reactive_fire_candidates for uid in uuid_list
-        }
+        """Get new game state branches configured with fire overrides."""
 
-        if len(reactive_fire_ids) == 0:
-            new_state = AiBranchingService.copy(gs)
-            return [(1, new_state)]
-
-        # Reactive fire found; configure all permutations
-        permutations: list[tuple[float, dict[UUID, FireOutcomes]]]
-        permutations = AiBranchingService.get_permutations(
-            unit_ids=reactive_fire_ids,
-            outcome_probabilities={
-                FireOutcomes.PIN: 0.6,
-                FireOutcomes.SUPPRESS: 0.4,
-            },
-        )
-        if len(permutations) == 0:
-            raise Exception("Permutations are empty, something went wrong!")
+        if len(outcomes) == 0:
+            raise Exception("Outcomes are empty, something went wrong!")
 
-        # Permutation configured; create branches
+        # Outcomes configured; create branches
         branching_states: list[tuple[float, GameState]] = []
-        for probability, unit_fire_outcomes in permutations:
+        for probability, unit_fire_outcomes in outcomes:
             new_state = AiBranchingService.copy(gs)
             for firer_id, firer_outcome in unit_fire_outcomes.items():
-                fire_controls = new_state.get_component(firer_id, FireControls)
+                fire_controls = new_state.get_mut_component(firer_id, FireControls)
                 fire_controls.override = firer_outcome
             branching_states.append((probability, new_state))
         return branching_states
 
     @staticmethod
-    def get_fire_branches(
+    def get_reactive_fire_branches(
         gs: GameState,
         unit_id: UUID,
+        move_to: Vec2,
     ) -> list[tuple[float, GameState]]:
-        """Get new game state branches configured with active fire overrides."""
-
-        permutations: list[tuple[float, dict[UUID, FireOutcomes]]]
-        permutations = AiBranchingService.get_permutations(
-            unit_ids={unit_id},
-            outcome_probabilities={
-                # Make AI assume it's more likely to suppress
-                FireOutcomes.SUPPRESS: 0.6,
-                FireOutcomes.PIN: 0.4,
-            },
-        )
-
-        branching_states: list[tuple[float, GameState]] = []
-        for probability, outcomes in permutations:
-            new_state = AiBranchingService.copy(gs)
-            for id_to_override, outcome in outcomes.items():
-                fire_controls = new_state.get_component(id_to_override, FireControls)
-                fire_controls.override = outcome
-            branching_states.append((probability, new_state))
-        return branching_states
+        """Get new game state branches configured with reactive fire overrides."""
 
-    @staticmethod
-    def get_assault_branches(
-        gs: GameState,
-        unit_id: UUID,
-        target_id: UUID,
-    ) -> list[tuple[float, GameState]]:
-        target_transform = gs.get_component(target_id, Transform)
-        branches = AiBranchingService.get_reactive_fire_branches(
-            gs=gs,
-            unit_id=unit_id,
-            move_to=target_transform.position,
+        reactive_fire_candidates = MoveSystem.get_interrupt_candidates(
+            gs, unit_id, move_to
         )
-        for _, new_state in branches:
-            assault_controls = new_state.get_component(unit_id, AssaultControls)
-            if FireSystem.get_status(gs, target_id) == CombatUnit.Status.SUPPRESSED:
-                assault_controls.override = AssaultOutcomes.SUCCESS
-            else:
-                assault_controls.override = AssaultOutcomes.FAIL
-        return branches
+        outcomes = AiBranchingService.get_reactive_fire_outcomes(
+            reactive_fire_candidates, _REACTIVE_FIRE_PROBABILITIES
+        )
+        return AiBranchingService.get_override_branches(gs, outcomes)
 
     @staticmethod
     def get_action_branches(
@@ -171,42 +161,40 @@ class AiBranchingService:
     ) -> list[tuple[float, GameState]]:
         """
         Returns a list of branching states and their probabilities
-        from a given action.
+        from a given action. The action is previewed once, so validation
+        and LOS aren't repeated for each branch.
         """
+        preview = ActionSystem.preview(gs, action)
+        # Invalid action won't be performable.
+        if isinstance(preview, InvalidAction):
+            return []
+
         # Prepare a list of configured branches
-        branches: list[tuple[float, GameState]]
+        outcomes: list[tuple[float, dict[UUID, FireOutcomes]]]
         match action:
-            case MoveAction():
-                branches = AiBranchingService.get_reactive_fire_branches(
-                    gs=gs,
-                    unit_id=action.unit_id,
-                    move_to=action.to,
-                )
-            case PivotAction():
-                transform = gs.get_component(action.unit_id, Transform)
-                branches = AiBranchingService.get_reactive_fire_branches(
-                    gs=gs,
-                    unit_id=action.unit_id,
-                    move_to=transform.position,
+            case FireAction():
+                outcomes = AiBranchingService.get_permutations(
+                    unit_ids={action.unit_id},
+                    outcome_probabilities=_FIRE_PROBABILITIES,
                 )
-            case AssaultAction():
-                branches = AiBranchingService.get_assault_branches(
-                    gs=gs,
-                    unit_id=action.unit_id,
-                    target_id=action.target_id,
+            case MoveAction() | PivotAction() | AssaultAction():
+                outcomes = AiBranchingService.get_reactive_fire_outcomes(
+                    preview.interrupt_candidates, _REACTIVE_FIRE_PROBABILITIES
                 )
-            case FireAction():
-                branches = AiBranchingService.get_fire_branches(
-                    gs=gs,
-                    unit_id=action.unit_id,
+        branches = AiBranchingService.get_override_branches(gs, outcomes)
+        if isinstance(action, AssaultAction):
+            target_status = FireSystem.get_status(gs, action.target_id)
+            for _, new_state in branches:
+                assault_controls = new_state.get_mut_component(
+                    action.unit_id, AssaultControls
                 )
+                if target_status == CombatUnit.Status.SUPPRESSED:
+                    assault_controls.override = AssaultOutcomes.SUCCESS
+                else:
+                    assault_controls.override = AssaultOutcomes.FAIL
 
         # Perform the actions
         for _, new_state in branches:
-            result: Any | InvalidAction
-            result = ActionSystem.perform(new_state, action)
-            # Invalid action won't be performable.
-            if isinstance(result, InvalidAction):
-                return []
+            ActionSystem.apply_preview(new_state, preview)
 
         return branches
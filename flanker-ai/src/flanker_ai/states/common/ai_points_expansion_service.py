@@ -1,15 +1,19 @@
-from itertools import pairwise
+from itertools import combinations, pairwise
+
+import numpy as np
 
 from flanker_ai.config_models import PointsConfig
 from flanker_ai.states.common.ai_waypoints_initialize_service import (
     AiWaypointsInitializeService,
 )
 from flanker_core.gamestate import GameState
-from flanker_core.models.components import CombatUnit, TerrainFeature, Transform
-from flanker_core.models.vec2 import Vec2
+from flanker_core.models.components import CombatUnit, Transform
+from flanker_core.models.vec2 import Vec2, Vec2Key
+from flanker_core.models.vec2_array import Vec2Array
 from flanker_core.systems.los_system import LosSystem
-from flanker_core.utils.intersect_getter import IntersectGetter
-from flanker_core.utils.linear_transform import LinearTransform
+from flanker_core.systems.terrain_system import TerrainSystem
+from flanker_core.utils.edge_grid import EdgeGrid
+from flanker_core.utils.prepared_polygon import PreparedPolygon
 
 
 class AiPointsExpansionService:
@@ -105,81 +109,67 @@ class AiPointsExpansionService:
         Given a list of waypoints, expand and create more waypoints
         representing move interrupt candidates.
         """
-        waypoints_los_polygon: dict[Vec2, list[Vec2]] = {}
-
         # FIXME: set does not guarantee co-location filter
         waypoints = set(initial_waypoints)
-
-        terrain_vertices: list[list[Vec2]] = []
-        for _, terrain, transform in gs.query(TerrainFeature, Transform):
-            vertices = LinearTransform.apply(terrain.vertices, transform)
-            if terrain.is_closed_loop:
-                vertices.append(vertices[0])
-            terrain_vertices.append(vertices)
-
-        processed_pair: list[tuple[Vec2, Vec2]] = []
+        waypoint_list = list(waypoints)
+
+        # Polylines to intersect are the terrains, followed by the LOS
+        # polygon of each waypoint. For now, consider polygon-edge as
+        # interrupts. Let's ignore FOV constraints for now.
+        grid = EdgeGrid[int]()
+        for _, _, geometry in TerrainSystem.get_geometries(gs):
+            grid.set_polyline(len(grid), geometry.vertices)
+        terrain_count = len(grid)
+        if len(waypoint_list) > 2:  # Pairs only check the other waypoints
+            for waypoint in waypoint_list:
+                los_polygon = LosSystem.get_los_polygon(gs, waypoint)
+                grid.set_polyline(len(grid), Vec2Array.from_vec2s(los_polygon))
+
+        # Intersect the line of every waypoint pair in one batch
+        pairs = list(combinations(range(len(waypoint_list)), 2))
+        points = np.array([(w.x, w.y) for w in waypoint_list], dtype=np.float64)
+        hits = grid.get_intersects_many(
+            points[np.array(pairs, dtype=np.int64).reshape(-1, 2)],
+        )
 
         # Loop through each waypoint pair to consider new
         # waypoint candidates to add. Note that this loop
         # can't add (mutate) directly to the waypoints set
         # while looping.
         new_waypoints: set[Vec2] = set()
-        for waypoint_a in waypoints:
-            for waypoint_b in waypoints:
-                intersects: list[Vec2] = []
-
-                # Ignore redundant pairs.
-                if waypoint_a == waypoint_b:
-                    continue
-                if (waypoint_a, waypoint_b) in processed_pair:
-                    continue
-                if (waypoint_b, waypoint_a) in processed_pair:
+        for line_index, (a, b) in enumerate(pairs):
+            waypoint_a = waypoint_list[a]
+            waypoint_b = waypoint_list[b]
+
+            # Check against all terrain and all other waypoints for interrupts.
+            _, hit_polylines = hits.get(line_index)
+            intersects = [
+                point
+                for point, polyline in zip(
+                    hits.get_points(line_index),
+                    hit_polylines.tolist(),
+                )
+                if polyline - terrain_count not in (a, b)
+            ]
+
+            # Remove some intersects that are too closely packed
+            unique_intersects: list[Vec2] = []
+            for p in intersects:
+                if any(
+                    (p - unique_p).length() <= tolerance
+                    for unique_p in unique_intersects
+                ):
                     continue
-                processed_pair.append((waypoint_a, waypoint_b))
+                unique_intersects.append(p)
 
-                # Check against all terrain for intersections.
-                for terrain in terrain_vertices:
-                    intersects += IntersectGetter.get_intersects(
-                        line=(waypoint_a, waypoint_b),
-                        polyline=terrain,
-                    )
-
-                # Check against all other waypoints for interrupts.
-                for other_waypoint in waypoints:
-                    if other_waypoint in [waypoint_a, waypoint_b]:
-                        continue
-
-                    if other_waypoint not in waypoints_los_polygon:
-                        waypoints_los_polygon[other_waypoint] = (
-                            LosSystem.get_los_polygon(gs, other_waypoint)
-                        )
-                    los_polygon = waypoints_los_polygon[other_waypoint]
-
-                    # For now, consider polygon-edge as interrupts.
-                    # Let's ignore FOV constraints for now.
-                    intersects += IntersectGetter.get_intersects(
-                        line=(waypoint_a, waypoint_b),
-                        polyline=los_polygon,
-                    )
-
-                # Remove some intersects that are too closely packed
-                unique_intersects: list[Vec2] = []
-                for p in intersects:
-                    if any(
-                        (p - unique_p).length() <= tolerance
-                        for unique_p in unique_intersects
-                    ):
-                        continue
-                    unique_intersects.append(p)
-
-                # Loop through each subsegment on this waypoint line pair
-                # and add a new waypoint on the midpoint of subsegment.
-                points_on_line: list[Vec2] = list(set(unique_intersects))
-                points_on_line.append(waypoint_a)
-                points_on_line.append(waypoint_b)
-                points_on_line.sort(key=lambda p: (waypoint_a - p).length())
-                for left_point, right_point in pairwise(points_on_line):
-                    new_waypoints.add((left_point + right_point) / 2)
+            # Loop through each subsegment on this waypoint line pair
+            # and add a new waypoint on the midpoint of subsegment.
+            points_on_line: list[Vec2] = list(set(unique_intersects))
+            points_on_line.append(waypoint_a)
+            points_on_line.append(waypoint_b)
+            points_on_line.sort(key=lambda p: (waypoint_a - p).length())
+            for left_point, right_point in pairwise(points_on_line):
+                new_waypoints.add((left_point + right_point) / 2)
 
         # The 'or' operator |= is set concat
         waypoints |= new_waypoints
@@ -190,17 +180,13 @@ class AiPointsExpansionService:
         gs: GameState,
         waypoint: Vec2,
         flag_waypoints: list[Vec2],
-    ) -> dict[Vec2, bool]:
+    ) -> dict[Vec2Key, bool]:
         """
         Return visibility mapping of this waypoint against other flag waypoints.
         """
-        waypoint_los_polygon = LosSystem.get_los_polygon(gs, waypoint)
-        return {
-            other_waypoint: IntersectGetter.is_inside(
-                other_waypoint, waypoint_los_polygon
-            )
-            for other_waypoint in flag_waypoints
-        }
+        waypoint_los_polygon = PreparedPolygon(LosSystem.get_los_polygon(gs, waypoint))
+        inside = waypoint_los_polygon.contains_many(flag_waypoints).tolist()
+        return {Vec2Key.from_vec2(p): i for p, i in zip(flag_waypoints, inside)}
 
     @staticmethod
     def prune_waypoints_by_flags(
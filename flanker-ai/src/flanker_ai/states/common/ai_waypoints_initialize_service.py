@@ -1,10 +1,9 @@
 import random
 
 from flanker_core.gamestate import GameState
-from flanker_core.models.components import TerrainFeature, Transform
+from flanker_core.models.components import TerrainFeature
 from flanker_core.models.vec2 import Vec2
-from flanker_core.utils.intersect_getter import IntersectGetter
-from flanker_core.utils.linear_transform import LinearTransform
+from flanker_core.systems.terrain_system import TerrainGeometry, TerrainSystem
 
 
 class AiWaypointsInitializeService:
@@ -13,6 +12,15 @@ class AiWaypointsInitializeService:
     This does not perform any analysis.
     """
 
+    @staticmethod
+    def _get_boundary(gs: GameState) -> TerrainGeometry | None:
+        """Gets the geometry of the map boundary terrain, if exists."""
+        boundary: TerrainGeometry | None = None
+        mask = TerrainFeature.Flag.BOUNDARY
+        for _, _, geometry in TerrainSystem.get_geometries(gs, mask):
+            boundary = geometry
+        return boundary
+
     @staticmethod
     def get_grid_coordinates(
         gs: GameState,
@@ -21,69 +29,41 @@ class AiWaypointsInitializeService:
     ) -> list[Vec2]:
 
         # Grab the map boundary
-        mask = TerrainFeature.Flag.BOUNDARY
-        boundary_vertices: list[Vec2] = []
-        for _, terrain, transform in gs.query(TerrainFeature, Transform):
-            if terrain.flag & mask:
-                boundary_vertices = LinearTransform.apply(
-                    terrain.vertices,
-                    transform,
-                )
-                if terrain.is_closed_loop:
-                    boundary_vertices.append(boundary_vertices[0])
-
-        if len(boundary_vertices) < 3:
+        boundary = AiWaypointsInitializeService._get_boundary(gs)
+        if boundary is None or boundary.polygon is None:
             raise ValueError("Can't generate coordinates; boundary terrain missing!")
 
         # Generates waypoints at spacing within boundary
-        min_x = min(v.x for v in boundary_vertices) + offset
-        max_x = max(v.x for v in boundary_vertices)
-        min_y = min(v.y for v in boundary_vertices) + offset
-        max_y = max(v.y for v in boundary_vertices)
+        min_x, min_y, max_x, max_y = boundary.bbox
+        min_x += offset
+        min_y += offset
         points: list[Vec2] = []
         y = min_y
         while y <= max_y:
             x = min_x
             while x <= max_x:
-                p = Vec2(x, y)
-
-                # Keep only points inside polygon
-                if IntersectGetter.is_inside(p, boundary_vertices):
-                    points.append(p)
-
+                points.append(Vec2(x, y))
                 x += spacing
             y += spacing
-        return points
+
+        # Keep only points inside polygon
+        inside = boundary.polygon.contains_many(points)
+        return [p for p, is_inside in zip(points, inside) if is_inside]
 
     @staticmethod
     def get_random_coordinates(
         gs: GameState,
         count: int,
     ) -> list[Vec2]:
-        boundary_vertices: list[Vec2] = []
-        mask = TerrainFeature.Flag.BOUNDARY
-        for _, terrain, transform in gs.query(TerrainFeature, Transform):
-            if terrain.flag & mask:
-                boundary_vertices = LinearTransform.apply(
-                    terrain.vertices,
-                    transform,
-                )
-                if terrain.is_closed_loop:
-                    boundary_vertices.append(boundary_vertices[0])
-        min_x = int(min(v.x for v in boundary_vertices))
-        max_x = int(max(v.x for v in boundary_vertices))
-        min_y = int(min(v.y for v in boundary_vertices))
-        max_y = int(max(v.y for v in boundary_vertices))
+        boundary = AiWaypointsInitializeService._get_boundary(gs)
+        if boundary is None or boundary.polygon is None:
+            raise ValueError("Can't generate coordinates; boundary terrain missing!")
+        min_x, min_y, max_x, max_y = (int(v) for v in boundary.bbox)
 
         move_candidates: list[Vec2] = []
         for _ in range(count):
             rand_x = random.randrange(min_x, max_x)
             rand_y = random.randrange(min_y, max_y)
-            move_candidate = Vec2(rand_x, rand_y)
-            if not IntersectGetter.is_inside(
-                point=move_candidate,
-                polygon=boundary_vertices,
-            ):
-                continue
-            move_candidates.append(move_candidate)
-        return move_candidates
+            move_candidates.append(Vec2(rand_x, rand_y))
+        inside = boundary.polygon.contains_many(move_candidates)
+        return [p for p, is_inside in zip(move_candidates, inside) if is_inside]
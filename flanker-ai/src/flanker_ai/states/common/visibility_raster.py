@@ -0,0 +1,179 @@
+import hashlib
+import json
+import math
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+from flanker_core.gamestate import GameState
+from flanker_core.models.components import TerrainFeature
+from flanker_core.models.vec2 import Vec2
+from flanker_core.models.vec2_array import Vec2Array
+from flanker_core.systems.los_system import LosSystem
+from flanker_core.systems.terrain_system import TerrainSystem
+from flanker_core.utils.component_cloner import ComponentCloner
+from flanker_core.utils.prepared_polygon import PreparedPolygon
+from numpy.typing import NDArray
+
+# Terrains that visibility depends on
+_TERRAIN_MASK = TerrainFeature.Flag.OPAQUE | TerrainFeature.Flag.BOUNDARY
+
+
+@dataclass(frozen=True)
+class VisibilityRaster:
+    """
+    Precomputed cell-to-cell visibility of a scene. The playable area is
+    split into square cells, and each cell stores a bitset of the cells
+    visible from its center. Cells outside the boundary see nothing.
+    """
+
+    origin: tuple[float, float]  # Min x, min y of cell (0, 0)
+    cell_size: float
+    shape: tuple[int, int]  # Cells along x, y
+    terrain_digest: str  # Digest of the terrain this was built on
+    bits: NDArray[np.uint8]  # Row `i` is the packed visible cells of cell `i`
+
+    def get_cell(self, position: Vec2) -> int | None:
+        """Gets the index of the cell containing a position, if within."""
+        col = math.floor((position.x - self.origin[0]) / self.cell_size)
+        row = math.floor((position.y - self.origin[1]) / self.cell_size)
+        if not (0 <= col < self.shape[0] and 0 <= row < self.shape[1]):
+            return None
+        return row * self.shape[0] + col
+
+    def get_center(self, cell: int) -> Vec2:
+        """Gets the center position of a cell."""
+        row, col = divmod(cell, self.shape[0])
+        return Vec2(
+            self.origin[0] + (col + 0.5) * self.cell_size,
+            self.origin[1] + (row + 0.5) * self.cell_size,
+        )
+
+    def is_cell_visible(self, spotter_cell: int, target_cell: int) -> bool:
+        byte = self.bits[spotter_cell, target_cell >> 3]
+        return bool(byte & (0x80 >> (target_cell & 7)))
+
+    def is_visible(self, spotter_pos: Vec2, target_pos: Vec2) -> bool:
+        """Approximates LOS as visibility between the cell centers."""
+        spotter_cell = self.get_cell(spotter_pos)
+        target_cell = self.get_cell(target_pos)
+        if spotter_cell is None or target_cell is None:
+            return False
+        return self.is_cell_visible(spotter_cell, target_cell)
+
+    def save(self, path: str | Path) -> None:
+        """
+        Saves the bitsets as an `.npy` file that loads memory-mapped, with
+        the rest in a `.json` file next to it.
+        """
+        path = Path(path).with_suffix(".npy")
+        np.save(path, self.bits)
+        header = {
+            "origin": self.origin,
+            "cell_size": self.cell_size,
+            "shape": self.shape,
+            "terrain_digest": self.terrain_digest,
+        }
+        path.with_suffix(".json").write_text(json.dumps(header))
+
+    @staticmethod
+    def load(path: str | Path) -> "VisibilityRaster":
+        """Loads a saved raster, memory-mapping the bitsets."""
+        path = Path(path).with_suffix(".npy")
+        header = json.loads(path.with_suffix(".json").read_text())
+        return VisibilityRaster(
+            origin=(header["origin"][0], header["origin"][1]),
+            cell_size=header["cell_size"],
+            shape=(header["shape"][0], header["shape"][1]),
+            terrain_digest=header["terrain_digest"],
+            bits=np.load(path, mmap_mode="r"),
+        )
+
+    @staticmethod
+    def get_path(scene_path: str | Path) -> Path:
+        """Gets where the raster of a scene JSON file is saved."""
+        scene_path = Path(scene_path)
+        return scene_path.with_name(f"{scene_path.stem}.visibility.npy")
+
+    @staticmethod
+    def get_terrain_digest(gs: GameState) -> str:
+        """
+        Digests the terrain that visibility depends on. Unlike the terrain
+        key of `TerrainSystem`, this is stable across processes.
+        """
+        entries: list[bytes] = []
+        for _, terrain, geometry in TerrainSystem.get_geometries(gs, _TERRAIN_MASK):
+            flag = (terrain.flag & _TERRAIN_MASK).to_bytes(4, "little")
+            entries.append(flag + geometry.vertices.array.tobytes())
+        digest = hashlib.sha256()
+        for entry in sorted(entries):
+            digest.update(entry)
+        return digest.hexdigest()
+
+    @staticmethod
+    def build(gs: GameState, cell_size: float) -> "VisibilityRaster":
+        """
+        Rasterizes the playable area inside the boundary terrain, computing
+        the LOS polygon of every cell center. This is an offline step, as it
+        costs one LOS polygon per cell.
+        """
+        boundary: PreparedPolygon | None = None
+        mask = TerrainFeature.Flag.BOUNDARY
+        for _, _, geometry in TerrainSystem.get_geometries(gs, mask):
+            boundary = geometry.polygon
+        if boundary is None:
+            raise ValueError("Can't build raster; boundary terrain missing!")
+
+        min_x, min_y, max_x, max_y = boundary.bbox
+        shape = (
+            max(1, math.ceil((max_x - min_x) / cell_size)),
+            max(1, math.ceil((max_y - min_y) / cell_size)),
+        )
+        cols, rows = np.meshgrid(np.arange(shape[0]), np.arange(shape[1]))
+        centers = Vec2Array(
+            np.column_stack(
+                (
+                    min_x + (cols.ravel() + 0.5) * cell_size,
+                    min_y + (rows.ravel() + 0.5) * cell_size,
+                )
+            )
+        )
+        inside = boundary.contains_many(centers)
+
+        n_cells = shape[0] * shape[1]
+        bits = np.zeros((n_cells, (n_cells + 7) // 8), dtype=np.uint8)
+        for cell in np.flatnonzero(inside).tolist():
+            center = Vec2(*centers.array[cell].tolist())
+            los_polygon = PreparedPolygon(LosSystem.get_los_polygon(gs, center))
+            bits[cell] = np.packbits(los_polygon.contains_many(centers) & inside)
+
+        return VisibilityRaster(
+            origin=(min_x, min_y),
+            cell_size=cell_size,
+            shape=shape,
+            terrain_digest=VisibilityRaster.get_terrain_digest(gs),
+            bits=bits,
+        )
+
+    @staticmethod
+    def set_raster(gs: GameState, raster: "VisibilityRaster") -> None:
+        """Sets the raster of a game state, which must share its terrain."""
+        if raster.terrain_digest != VisibilityRaster.get_terrain_digest(gs):
+            raise ValueError("Raster was built on a different terrain.")
+        gs.set_singleton(_VisibilityRasterComponent(raster))
+
+    @staticmethod
+    def get_raster(gs: GameState) -> "VisibilityRaster":
+        """Gets the raster configured in a game state."""
+        if component := gs.try_singleton(_VisibilityRasterComponent):
+            return component.raster
+        raise ValueError("Visibility raster not configured in this game state.")
+
+
+@dataclass
+class _VisibilityRasterComponent:
+    raster: VisibilityRaster
+
+
+# The raster is never mutated, so copies share it
+ComponentCloner.register(_VisibilityRasterComponent, lambda component: component)
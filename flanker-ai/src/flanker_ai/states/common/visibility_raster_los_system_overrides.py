@@ -0,0 +1,59 @@
+import math
+from uuid import UUID
+
+from flanker_ai.states.common.visibility_raster import VisibilityRaster
+from flanker_core.gamestate import GameState
+from flanker_core.models.components import Transform
+from flanker_core.models.vec2 import Vec2
+from flanker_core.systems.los_system import LosSystem
+
+
+class VisibilityRasterLosSystemOverrides:
+    """
+    Approximate LOS in O(1) per query, using the precomputed visibility
+    raster configured in the game state.
+    """
+
+    @staticmethod
+    def has_los(
+        gs: GameState,
+        spotter_pos: Vec2,
+        target_pos: Vec2,
+    ) -> bool:
+        """
+        Override using precomputed cell visibility.
+        """
+        raster = VisibilityRaster.get_raster(gs)
+        return raster.is_visible(spotter_pos, target_pos)
+
+    @staticmethod
+    def get_los_from_line(
+        gs: GameState,
+        spotter_id: UUID,
+        line: tuple[Vec2, Vec2],
+    ) -> Vec2 | None:
+        """
+        Override using precomputed cell visibility. This samples the move
+        path at half a cell apart, and returns the earliest sample that
+        is visible to and within FOV of the spotter.
+        """
+        raster = VisibilityRaster.get_raster(gs)
+        spotter_transform = gs.get_component(spotter_id, Transform)
+        spotter_cell = raster.get_cell(spotter_transform.position)
+        if spotter_cell is None:
+            return None
+
+        start, end = line
+        steps = max(1, math.ceil((end - start).length() / (raster.cell_size / 2)))
+        for step in range(steps + 1):
+            sample = start + (end - start) * (step / steps)
+            sample_cell = raster.get_cell(sample)
+            if sample_cell is None:
+                continue
+            if not raster.is_cell_visible(spotter_cell, sample_cell):
+                continue
+            if not LosSystem.in_fov(spotter_transform, sample):
+                continue
+            return sample
+
+        return None
@@ -1,4 +1,3 @@
-from copy import deepcopy
 from typing import Sequence, override
 
 from flanker_ai.config_models import PointsConfig
@@ -125,7 +124,7 @@ class UnabstractedState(IRepresentationState[Action]):
         return InitiativeSystem.get_initiative(self._gs)
 
     def update_state(self, gs: GameState) -> None:
-        self._gs = deepcopy(gs)
+        self._gs = gs.copy()
         # Regenerate the move candidate for each update
         self.move_candidates = AiPointsExpansionService.get_points(
             self._gs, self._move_candidates_config
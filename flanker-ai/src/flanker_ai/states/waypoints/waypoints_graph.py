@@ -3,7 +3,7 @@ from dataclasses import dataclass
 from flanker_core.gamestate import GameState
 from flanker_core.models.vec2 import Vec2
 from flanker_core.systems.los_system import LosSystem
-from flanker_core.utils.intersect_getter import IntersectGetter
+from flanker_core.utils.prepared_polygon import PreparedPolygon
 
 
 @dataclass
@@ -29,8 +29,7 @@ class WaypointsGraph:
         gs: GameState,
     ) -> dict[int, WaypointNode]:
         """Get a configured waypoints dictionary"""
-        if entities := gs.query(_WaypointsGraphComponent):
-            _, component = entities[0]
+        if component := gs.try_singleton(_WaypointsGraphComponent):
             return component.waypoints
         else:
             raise ValueError("Waypoints not configured in this game state.")
@@ -65,13 +64,9 @@ class WaypointsGraph:
         path_tolerance: float,
     ) -> None:
         """Sets a new waypoints graph configured on the given waypoints"""
-        # Creates or resets a new empty singleton graph if not exists.
-        if entities := gs.query(_WaypointsGraphComponent):
-            _, component = entities[0]
-        else:
-            gs.add_entity(component := _WaypointsGraphComponent({}))
-        waypoints = component.waypoints
-        waypoints.clear()
+        # Creates or resets a new empty singleton graph.
+        waypoints: dict[int, WaypointNode] = {}
+        gs.set_singleton(_WaypointsGraphComponent(waypoints))
 
         # Add new empty waypoints placed on specific coordinates
         for point_id, point in enumerate(points):
@@ -132,18 +127,21 @@ class WaypointsGraph:
         # The LOS polygon might be overkill for now,
         # but future cases might need it
         waypoints = WaypointsGraph.get_waypoints(gs)
-        waypoint_LOS_polygons: dict[int, list[Vec2]] = {}
+        waypoint_LOS_polygons: dict[int, PreparedPolygon] = {}
         for waypoint_id, waypoint in waypoints.items():
-            waypoint_LOS_polygons[waypoint_id] = LosSystem.get_los_polygon(
-                gs, waypoint.position
+            waypoint_LOS_polygons[waypoint_id] = PreparedPolygon(
+                LosSystem.get_los_polygon(gs, waypoint.position)
             )
 
-        # Add visibility relationships between nodes
+        # Add visibility relationships between nodes, testing all
+        # waypoints against each LOS polygon in one batch
+        positions = [waypoint.position for waypoint in waypoints.values()]
         for waypoint_id, waypoint in waypoints.items():
-            for other_id, other_waypoint in waypoints.items():
+            visible = waypoint_LOS_polygons[waypoint_id].contains_many(positions)
+            for (other_id, other_waypoint), is_visible in zip(
+                waypoints.items(), visible.tolist()
+            ):
                 # Add visibility relationship
-                if IntersectGetter.is_inside(
-                    other_waypoint.position, waypoint_LOS_polygons[waypoint_id]
-                ):
+                if is_visible:
                     waypoint.visible_nodes.add(other_id)
                     other_waypoint.visible_nodes.add(waypoint_id)
@@ -1,5 +1,4 @@
 import random
-from copy import deepcopy
 from typing import override
 from uuid import UUID
 
@@ -198,7 +197,7 @@ class WaypointsState(IRepresentationState[Action]):
         gs: GameState,
     ) -> None:
 
-        self.gs = deepcopy(gs)
+        self.gs = gs.copy()
         self.gs.add_entity(
             LosSystemOverrides.GetLosFromLine(
                 method=WaypointsLosSystemOverrides.get_los_from_line,
@@ -17,6 +17,7 @@ from flanker_core.models.components import (
     Transform,
 )
 from flanker_core.models.vec2 import Vec2
+from flanker_core.systems.command_system import CommandSystem
 from flanker_core.systems.move_system import MoveSystem
 
 
@@ -94,25 +95,23 @@ def fixture() -> Fixture:
 def test_copy(fixture: Fixture) -> None:
     new_gs = AiBranchingService.copy(fixture.gs)
 
-    # Check that combat units are copied
-    for unit_id, unit, transform, fire_controls in new_gs.query(
-        CombatUnit, Transform, FireControls
-    ):
-        old_unit = fixture.gs.get_component(unit_id, CombatUnit)
-        old_transform = fixture.gs.get_component(unit_id, Transform)
-        old_fire_controls = fixture.gs.get_component(unit_id, FireControls)
+    # Check that components are shared until mutated
+    for unit_id, unit, transform in new_gs.query(CombatUnit, Transform):
+        assert unit is fixture.gs.get_component(unit_id, CombatUnit)
+        assert transform is fixture.gs.get_component(unit_id, Transform)
 
-        assert id(old_unit) != id(unit)
-        assert id(old_transform) != id(transform)
-        assert id(old_fire_controls) != id(fire_controls)
+    # Check that mutating the copy leaves the original untouched
+    transform = new_gs.get_mut_component(fixture.unit_move, Transform)
+    transform.position = Vec2(5, 5)
+    old_transform = fixture.gs.get_component(fixture.unit_move, Transform)
+    assert old_transform is not transform
+    assert old_transform.position == Vec2(0, -10)
+    rows = new_gs.query(Transform, CombatUnit)
+    assert (fixture.unit_move, transform) in [(i, t) for i, t, _ in rows]
 
     # Check that terrains are not copied
     for terrain_id, transform, terrain in new_gs.query(Transform, TerrainFeature):
-        old_transform = fixture.gs.get_component(terrain_id, Transform)
-        old_terrain = fixture.gs.get_component(terrain_id, TerrainFeature)
-
-        assert id(old_transform) != id(transform)
-        assert id(old_terrain) == id(terrain)
+        assert terrain is fixture.gs.get_component(terrain_id, TerrainFeature)
 
 
 def test_one_interrupt(fixture: Fixture) -> None:
@@ -153,6 +152,27 @@ def test_branches(fixture: Fixture) -> None:
         total_probability += probability
     assert total_probability == 1, "The total probability must be 1"
 
-    assert len(merged_branches) < len(
+    assert len(branches) == 3, "Expects pinned, suppressed and killed branches"
+    assert len(merged_branches) == len(
         branches
-    ), "The merged branches must be smaller than original branches"
+    ), "The branches must already be distinct"
+
+
+def test_merge_killed_branches(fixture: Fixture) -> None:
+    move_action = MoveAction(
+        unit_id=fixture.unit_move,
+        to=Vec2(20, -10),
+    )
+    branches: list[tuple[float, GameState]] = []
+    for probability in (0.25, 0.75):
+        new_gs = AiBranchingService.copy(fixture.gs)
+        CommandSystem.kill_unit(new_gs, fixture.unit_move)
+        branches.append((probability, new_gs))
+
+    merged_branches = AiBranchAbstractionService.merge_branches(
+        branches=branches,
+        action=move_action,
+    )
+    assert merged_branches == [
+        (1, branches[0][1])
+    ], "Branches where the unit is killed must merge"
@@ -4,12 +4,14 @@ from uuid import UUID, uuid4
 import pytest
 from flanker_ai.states.common.ai_branching_service import AiBranchingService
 from flanker_core.models.outcomes import FireOutcomes
+from flanker_core.models.vec2 import Vec2
 
 
 @dataclass
 class Fixture:
     enemy_1: UUID = uuid4()
     enemy_2: UUID = uuid4()
+    enemy_3: UUID = uuid4()
 
 
 @pytest.fixture
@@ -84,3 +86,38 @@ def test_permutation_four_outcomes(fixture: Fixture) -> None:
             fixture.enemy_2: FireOutcomes.SUPPRESS,
         },
     ) in permutations
+
+
+def test_reactive_fire_outcomes(fixture: Fixture) -> None:
+    interrupts = [
+        (Vec2(0, 0), [fixture.enemy_1, fixture.enemy_2]),
+        (Vec2(1, 0), [fixture.enemy_3]),
+    ]
+    outcomes = AiBranchingService.get_reactive_fire_outcomes(
+        interrupts,
+        outcome_probabilities={
+            FireOutcomes.MISS: 0.5,
+            FireOutcomes.PIN: 0.3,
+            FireOutcomes.SUPPRESS: 0.2,
+        },
+    )
+    probabilities = [probability for probability, _ in outcomes]
+    assert probabilities == pytest.approx(
+        [
+            0.8**2 - 0.5**2,  # Pinned at the first interrupt
+            2 * 0.2 * 0.8,  # Suppressed at the first interrupt
+            0.2**2,  # Killed at the first interrupt
+            0.5**2 * 0.3,  # Pinned at the second interrupt
+            0.5**2 * 0.2,  # Suppressed at the second interrupt
+            0.5**3,  # Never hit
+        ]
+    )
+    assert outcomes[1][1] == {
+        fixture.enemy_1: FireOutcomes.SUPPRESS,
+        fixture.enemy_2: FireOutcomes.PIN,
+    }, "The first spotter expects to suppress"
+    assert outcomes[3][1] == {
+        fixture.enemy_1: FireOutcomes.MISS,
+        fixture.enemy_2: FireOutcomes.MISS,
+        fixture.enemy_3: FireOutcomes.PIN,
+    }, "Spotters of earlier interrupts expect to miss"
@@ -4,8 +4,10 @@ from uuid import UUID
 
 import pytest
 from flanker_ai.ai_agent import AiAgent
+from flanker_ai.ai_match import AiMatch
 from flanker_ai.components import AiConfigComponent
 from flanker_ai.config_models import (
+    HeuristicPolicyConfig,
     PointsConfig,
     SearchPolicyConfig,
     UnabstractedStateConfig,
@@ -219,3 +221,35 @@ def test_optimal_actions(
     assert isinstance(
         last_action_result.action, FireAction
     ), "AI must fire at the enemy once."
+
+
+def test_match_on_copy(fixture: Fixture) -> None:
+    for faction in InitiativeState.Faction:
+        fixture.gs.add_entity(
+            AiConfigComponent(
+                faction=faction,
+                config=HeuristicPolicyConfig(policy_type="RandomHeuristic"),
+            ),
+        )
+    # Blue rifles always kill, so the match is won by elimination
+    for unit_id in (fixture.friendly_1, fixture.friendly_2):
+        fire_controls = fixture.gs.get_mut_component(unit_id, FireControls)
+        fire_controls.override = FireOutcomes.KILL
+    # Build the agents on the original first, so the copy has a registry
+    agent = AiAgent.get_agent(fixture.gs, InitiativeState.Faction.BLUE)
+    transform = fixture.gs.get_component(fixture.friendly_1, Transform)
+    position = transform.position
+
+    new_gs = fixture.gs.copy()
+    result = AiMatch.run_match(new_gs)
+    assert (
+        result.winner == InitiativeState.Faction.BLUE
+    ), "The match must be played to the end on the copy."
+    assert (
+        AiAgent.get_agent(new_gs, InitiativeState.Faction.BLUE).gs is new_gs
+    ), "The copy must build its own agents."
+    assert agent.gs is fixture.gs
+    assert (
+        fixture.gs.get_component(fixture.friendly_1, Transform) is transform
+        and transform.position == position
+    ), "The original state must be untouched."
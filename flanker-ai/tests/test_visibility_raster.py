@@ -0,0 +1,101 @@
+from dataclasses import dataclass
+from pathlib import Path
+from uuid import UUID
+
+import pytest
+from flanker_ai.states.common.visibility_raster import VisibilityRaster
+from flanker_ai.states.common.visibility_raster_los_system_overrides import (
+    VisibilityRasterLosSystemOverrides,
+)
+from flanker_core.gamestate import GameState
+from flanker_core.models.components import TerrainFeature, Transform
+from flanker_core.models.vec2 import Vec2
+from flanker_core.systems.los_system import LosSystem, LosSystemOverrides
+
+
+@dataclass
+class Fixture:
+    gs: GameState
+    spotter_id: UUID
+    raster: VisibilityRaster
+
+
+@pytest.fixture
+def fixture() -> Fixture:
+    gs = GameState()
+    spotter_id = gs.add_entity(Transform(position=Vec2(5, 5), degrees=45))
+
+    # Opaque wall off the cell grid, rising from the bottom of the map
+    gs.add_entity(
+        Transform(Vec2(0, 0)),
+        TerrainFeature(
+            vertices=[Vec2(17, 0), Vec2(23, 0), Vec2(23, 11), Vec2(17, 11)],
+            flag=TerrainFeature.Flag.OPAQUE,
+        ),
+    )
+    # Boundary box terrain
+    gs.add_entity(
+        Transform(Vec2(0, 0)),
+        TerrainFeature(
+            vertices=[Vec2(0, 0), Vec2(40, 0), Vec2(40, 40), Vec2(0, 40)],
+            flag=TerrainFeature.Flag.OPAQUE | TerrainFeature.Flag.BOUNDARY,
+        ),
+    )
+
+    raster = VisibilityRaster.build(gs, cell_size=5)
+    return Fixture(gs, spotter_id, raster)
+
+
+def test_visibility_raster(fixture: Fixture) -> None:
+    raster = fixture.raster
+    assert raster.shape == (8, 8)
+    assert raster.is_visible(Vec2(5, 5), Vec2(5, 35)), "Nothing in between."
+    assert not raster.is_visible(Vec2(5, 5), Vec2(35, 5)), "Wall in between."
+    assert not raster.is_visible(Vec2(5, 5), Vec2(45, 5)), "Outside the map."
+
+    # Agrees with exact LOS between cell centers
+    for spotter_cell in range(64):
+        for target_cell in range(64):
+            spotter_pos = raster.get_center(spotter_cell)
+            target_pos = raster.get_center(target_cell)
+            assert raster.is_visible(spotter_pos, target_pos) == LosSystem.has_los(
+                fixture.gs, spotter_pos, target_pos
+            )
+
+
+def test_visibility_raster_save_load(fixture: Fixture, tmp_path: Path) -> None:
+    path = VisibilityRaster.get_path(tmp_path / "scene.json")
+    fixture.raster.save(path)
+    loaded = VisibilityRaster.load(path)
+    assert loaded.shape == fixture.raster.shape
+    assert (loaded.bits == fixture.raster.bits).all()
+
+    # Rasters only apply to the terrain they were built on
+    VisibilityRaster.set_raster(fixture.gs, loaded)
+    fixture.gs.add_entity(
+        Transform(Vec2(0, 0)),
+        TerrainFeature(
+            vertices=[Vec2(0, 30), Vec2(5, 30), Vec2(5, 35)],
+            flag=TerrainFeature.Flag.OPAQUE,
+        ),
+    )
+    with pytest.raises(ValueError):
+        VisibilityRaster.set_raster(fixture.gs, loaded)
+
+
+def test_visibility_raster_overrides(fixture: Fixture) -> None:
+    VisibilityRaster.set_raster(fixture.gs, fixture.raster)
+    fixture.gs.add_entity(
+        LosSystemOverrides.HasLos(method=VisibilityRasterLosSystemOverrides.has_los),
+        LosSystemOverrides.GetLosFromLine(
+            method=VisibilityRasterLosSystemOverrides.get_los_from_line
+        ),
+    )
+    assert LosSystem.has_los(fixture.gs, Vec2(5, 5), Vec2(5, 35))
+    assert not LosSystem.has_los(fixture.gs, Vec2(5, 5), Vec2(35, 5))
+
+    # Moving out from behind the wall, stopping at the first visible sample
+    interrupt = LosSystem.get_los_from_line(
+        fixture.gs, fixture.spotter_id, (Vec2(35, 5), Vec2(35, 35))
+    )
+    assert interrupt is not None and 17.5 <= interrupt.y <= 22.5
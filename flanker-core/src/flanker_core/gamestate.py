@@ -1,40 +1,532 @@
-from copy import deepcopy
-from typing import Any, Callable, overload
+from contextlib import contextmanager
+from dataclasses import dataclass
+from heapq import merge
+from itertools import count
+from operator import itemgetter
+from typing import Any, Iterable, Iterator, overload
 from uuid import UUID, uuid4
 
+from flanker_core.utils.component_cloner import ComponentCloner
+
+
+class _Archetype:
+    """
+    Stores entities that share the exact same set of component types.
+    Components are kept as columns, one list per component type, and
+    rows are kept in insertion order.
+    """
+
+    def __init__(self, signature: frozenset[type]) -> None:
+        self.signature = signature
+        self.handles: list[int] = []
+        self.entity_ids: list[UUID] = []
+        self.rows: dict[int, int] = {}
+        self.columns: dict[type, list[Any]] = {t: [] for t in signature}
+
+    def append(
+        self,
+        handle: int,
+        entity_id: UUID,
+        components: dict[type, Any],
+    ) -> None:
+        """Appends a new row for the entity's components."""
+        self.rows[handle] = len(self.handles)
+        self.handles.append(handle)
+        self.entity_ids.append(entity_id)
+        for component_type, column in self.columns.items():
+            column.append(components[component_type])
+
+    def copy(self) -> "_Archetype":
+        """Returns a copy of the rows and columns, sharing components."""
+        new_archetype = _Archetype(self.signature)
+        new_archetype.handles = self.handles.copy()
+        new_archetype.entity_ids = self.entity_ids.copy()
+        new_archetype.rows = self.rows.copy()
+        new_archetype.columns = {t: c.copy() for t, c in self.columns.items()}
+        return new_archetype
+
+    def insert(
+        self,
+        row: int,
+        handle: int,
+        entity_id: UUID,
+        components: dict[type, Any],
+    ) -> None:
+        """Inserts a row for the entity's components, shifting the rows after."""
+        for moved_handle in self.handles[row:]:
+            self.rows[moved_handle] += 1
+        self.rows[handle] = row
+        self.handles.insert(row, handle)
+        self.entity_ids.insert(row, entity_id)
+        for component_type, column in self.columns.items():
+            column.insert(row, components[component_type])
+
+    def remove(self, handle: int) -> None:
+        """Removes the entity's row while keeping the rows order."""
+        row = self.rows.pop(handle)
+        self.handles.pop(row)
+        self.entity_ids.pop(row)
+        for column in self.columns.values():
+            column.pop(row)
+        # Shift the rows that came after the removed one
+        for moved_handle in self.handles[row:]:
+            self.rows[moved_handle] -= 1
+
+
+@dataclass(frozen=True)
+class _ReplacedComponent:
+    handle: int
+    component: Any  # The instance that was replaced
+
+
+@dataclass(frozen=True)
+class _InsertedEntity:
+    entity_id: UUID
+
+
+@dataclass(frozen=True)
+class _RemovedEntity:
+    handle: int
+    row: int  # Row in its archetype
+    components: dict[type, Any]
+
+
+type _JournalEntry = _ReplacedComponent | _InsertedEntity | _RemovedEntity
+
+# Component versions come from one counter shared by every state, so states
+# that diverge after a fork never hand out the same version
+_VERSIONS = count(1)
+
+
+class GameStateJournal:
+    """
+    Records how to undo the changes made to a game state, so a search can
+    apply actions in place and roll them back. Components are never mutated
+    in place while journaling; the first mutation since a checkpoint swaps
+    in a clone, and the journal keeps the original instance to swap back.
+    """
+
+    def __init__(self) -> None:
+        # Undo entries, most recent last
+        self.entries: list[_JournalEntry] = []
+        # Number of entries at each checkpoint
+        self.checkpoints: list[int] = []
+        # IDs of the components created since the last checkpoint
+        self.fresh: set[int] = set()
+
 
 class GameState:
-    """Encapsulates ECS entities & components into a game state."""
+    """
+    Encapsulates ECS entities & components into a game state.
+
+    Entities are identified by UUIDs, but are stored under dense integer
+    handles internally. A UUID is only hashed once per lookup, to find its
+    handle; everything after that (tables, rows, singletons) is indexed by
+    handle. Handles are never reused within a state.
+
+    States made by `fork` share their tables and component instances
+    (copy-on-write). Anything that mutates a component must get it with
+    `get_mut_component`, which clones a shared component on first use.
+
+    Component types that only ever have one instance can be looked up as
+    singletons; the owning entity is resolved once and then kept in a slot.
+
+    Query results are cached and shared between calls, so callers must not
+    mutate the returned lists. Changing the tables patches or drops only the
+    stale results; `batch` defers adds and deletes so this happens once.
+    `query` returns rows in insertion order, merging the archetypes by
+    handle. The lazy `iter_query` and `query_one_type` skip the merge, and
+    yield rows grouped by archetype instead.
+
+    Each component type has a version that changes whenever an entity with
+    that type is added, deleted or has a component gotten for mutation, so
+    systems can memoize what they derive from a type on its version.
+
+    Taking a `checkpoint` journals every change after it, so `rollback` can
+    revert the state in place instead of keeping a copy per checkpoint.
+    """
 
     def __init__(self) -> None:
         """Initializes the game state with empty entities."""
-        self._entities: dict[UUID, dict[type[Any], Any]] = {}
-        self._query_cache: dict[tuple[type, ...], list[UUID]] = {}
+        self._handles: dict[UUID, int] = {}
+        self._entity_ids: list[UUID] = []
+        # Components of each entity by handle, `None` once deleted
+        self._entities: list[dict[type[Any], Any] | None] = []
+        self._archetypes: dict[frozenset[type], _Archetype] = {}
+        self._query_cache: dict[tuple[type, ...], list[frozenset[type]]] = {}
+        self._query_results: dict[tuple[type, ...], list[tuple[Any, ...]]] = {}
+        # IDs of the objects that are not shared with any forked state
+        self._owned: set[int] = {id(self._handles), id(self._entity_ids)}
+        # Handle of the entity holding each singleton type, `None` if none
+        self._singletons: dict[type, int | None] = {}
+        # Queued adds (ID & components) and deletes (ID) while batching
+        self._pending: list[tuple[UUID, dict[type, Any]] | UUID] | None = None
+        # Undo log since the first checkpoint, `None` if not journaling
+        self._journal: GameStateJournal | None = None
+        # Version of each component type, see `get_version`
+        self._versions: dict[type, int] = {}
+
+    def _get_archetype(self, signature: frozenset[type]) -> _Archetype:
+        """Gets a mutable archetype, creating it if it doesn't exist."""
+        archetype = self._archetypes.get(signature)
+        if archetype is None:
+            # New archetype; append it to every cached query it matches
+            archetype = _Archetype(signature)
+            for component_types, signatures in self._query_cache.items():
+                if signature.issuperset(component_types):
+                    signatures.append(signature)
+        elif id(archetype) in self._owned:
+            return archetype
+        else:  # Shared with a forked state, copy it before writing
+            archetype = archetype.copy()
+        self._archetypes[signature] = archetype
+        self._owned.add(id(archetype))
+        return archetype
+
+    def _get_handles(self) -> dict[UUID, int]:
+        """Gets a mutable handles table, copying it if shared."""
+        if id(self._handles) not in self._owned:
+            self._handles = self._handles.copy()
+            self._entity_ids = self._entity_ids.copy()
+            self._owned.update((id(self._handles), id(self._entity_ids)))
+        return self._handles
+
+    def _get_handle(self, entity_id: UUID) -> int:
+        """Gets the entity's handle. Raises KeyError if not found."""
+        handle = self._handles.get(entity_id)
+        if handle is None:
+            raise KeyError(f"{entity_id=} doesn't exist.")
+        return handle
+
+    def _bump_versions(self, component_types: Iterable[type]) -> None:
+        """Gives the component types a new version after they changed."""
+        version = next(_VERSIONS)
+        for component_type in component_types:
+            self._versions[component_type] = version
+
+    def get_version(self, component_type: type) -> int:
+        """
+        Gets the version of a component type, 0 if it never had any entity.
+        Versions are unique across states, so two states with the same
+        version share every entity with the type. Components must be mutated
+        straight after `get_mut_component`, which is what bumps the version.
+        """
+        return self._versions.get(component_type, 0)
+
+    def _drop_results(self, signature: frozenset[type]) -> None:
+        """Drops the cached query results that include the archetype."""
+        for component_types in list(self._query_results):
+            if signature.issuperset(component_types):
+                del self._query_results[component_types]
+
+    def _update_results(
+        self,
+        added: set[frozenset[type]],
+        removed: set[frozenset[type]],
+        removed_ids: set[UUID],
+    ) -> None:
+        """Updates the cached query results after adding & removing rows."""
+        for component_types, result in list(self._query_results.items()):
+            if any(s.issuperset(component_types) for s in added):
+                # New rows go in the middle of the results, rebuild lazily
+                del self._query_results[component_types]
+            elif any(s.issuperset(component_types) for s in removed):
+                # Removed rows can be filtered out while keeping the order
+                self._query_results[component_types] = [
+                    row for row in result if row[0] not in removed_ids
+                ]
+
+    def _insert(
+        self,
+        entity_id: UUID,
+        components: dict[type, Any],
+    ) -> frozenset[type]:
+        """Inserts an entity's components into the tables."""
+        handle = len(self._entities)
+        singleton_types = [t for t in components if t in self._singletons]
+        for component_type in singleton_types:
+            if self._singletons[component_type] is not None:
+                raise ValueError(f"singleton {component_type=} already exists")
+        for component_type in singleton_types:
+            self._singletons[component_type] = handle
+        self._get_handles()[entity_id] = handle
+        self._entity_ids.append(entity_id)
+        self._entities.append(components)
+        signature = frozenset(components)
+        self._get_archetype(signature).append(handle, entity_id, components)
+        self._bump_versions(signature)
+        self._owned.add(id(components))
+        self._owned.update(id(c) for c in components.values())
+        if self._journal is not None:
+            self._journal.entries.append(_InsertedEntity(entity_id))
+            self._journal.fresh.update(id(c) for c in components.values())
+        return signature
+
+    def _remove(self, entity_id: UUID) -> frozenset[type]:
+        """Removes an entity's components from the tables."""
+        handle = self._get_handles().pop(entity_id)
+        components = self._entities[handle]
+        assert components is not None
+        self._entities[handle] = None
+        signature = frozenset(components)
+        archetype = self._get_archetype(signature)
+        if self._journal is not None:
+            row = archetype.rows[handle]
+            self._journal.entries.append(_RemovedEntity(handle, row, components))
+        archetype.remove(handle)
+        self._bump_versions(signature)
+        for component_type in components:
+            if self._singletons.get(component_type) == handle:
+                self._singletons[component_type] = None
+        self._owned.discard(id(components))
+        self._owned.difference_update(id(c) for c in components.values())
+        return signature
 
     def add_entity(self, *components: Any, id: UUID | None = None) -> UUID:
         """Adds a new entity with the given components, returns ID."""
-        if id in self._entities:
+        if id in self._handles:
             raise ValueError(f"entity {id=} already exists")
         new_id = uuid4() if id is None else id
-        self._entities[new_id] = {type(c): c for c in components}
-        self._query_cache = {}
+        if self._pending is not None:
+            self._pending.append((new_id, {type(c): c for c in components}))
+            return new_id
+        self._drop_results(self._insert(new_id, {type(c): c for c in components}))
         return new_id
 
     def delete_entity(self, entity_id: UUID) -> None:
         """Deletes an entity by its ID"""
-        self._entities.pop(entity_id)
-        self._query_cache = {}
+        if self._pending is not None:
+            self._get_handle(entity_id)
+            self._pending.append(entity_id)
+            return
+        self._update_results(set(), {self._remove(entity_id)}, {entity_id})
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """
+        Queues up adds and deletes within the block, applying them on exit.
+        Queued entities aren't visible (or deleted) until the block exits;
+        `set_singleton` isn't queued.
+        """
+        if self._pending is not None:
+            yield  # Already batching; the outer block applies everything
+            return
+        self._pending = []
+        try:
+            yield
+        finally:
+            pending, self._pending = self._pending, None
+
+        # Apply everything, then update the query results only once
+        added: set[frozenset[type]] = set()
+        removed: set[frozenset[type]] = set()
+        removed_ids: set[UUID] = set()
+        for command in pending:
+            if isinstance(command, UUID):
+                removed.add(self._remove(command))
+                removed_ids.add(command)
+            else:
+                added.add(self._insert(*command))
+        self._update_results(added, removed, removed_ids)
+
+    def checkpoint(self) -> int:
+        """
+        Starts journaling changes if not already, and returns a checkpoint
+        to roll back to. Checkpoints must be rolled back in reverse order.
+        """
+        if self._journal is None:
+            self._journal = GameStateJournal()
+        self._journal.checkpoints.append(len(self._journal.entries))
+        self._journal.fresh.clear()
+        return len(self._journal.checkpoints) - 1
+
+    def rollback(self, checkpoint: int) -> None:
+        """
+        Reverts every change made since the checkpoint, dropping it and any
+        later checkpoints. Rolling back the first checkpoint stops journaling.
+        """
+        journal = self._journal
+        if journal is None or checkpoint >= len(journal.checkpoints):
+            raise KeyError(f"{checkpoint=} doesn't exist.")
+        length = journal.checkpoints[checkpoint]
+        del journal.checkpoints[checkpoint:]
+
+        # Undo without journaling the undo itself
+        self._journal = None
+        while len(journal.entries) > length:
+            match journal.entries.pop():
+                case _ReplacedComponent(handle, component):
+                    self._undo_replace(handle, component)
+                case _InsertedEntity(entity_id):
+                    self._undo_insert(entity_id)
+                case _RemovedEntity(handle, row, components):
+                    self._undo_remove(handle, row, components)
+        # Clones made before now may be dropped, so their IDs are stale
+        journal.fresh.clear()
+        if journal.checkpoints:
+            self._journal = journal
+
+    def _undo_replace(self, handle: int, component: Any) -> None:
+        """
+        Swaps a replaced component back in. It may be shared with a state
+        forked meanwhile, so it isn't owned until cloned again.
+        """
+        entity = self._entities[handle]
+        assert entity is not None
+        self._owned.discard(id(entity[type(component)]))
+        self._replace_component(handle, component)
+        self._owned.discard(id(component))
+
+    def _undo_insert(self, entity_id: UUID) -> None:
+        """Removes an inserted entity, leaving its handle unused."""
+        self._drop_results(self._remove(entity_id))
+
+    def _undo_remove(
+        self,
+        handle: int,
+        row: int,
+        components: dict[type, Any],
+    ) -> None:
+        """
+        Puts a removed entity back in its handle and archetype row. As with
+        replaced components, its components aren't owned until cloned again.
+        """
+        entity_id = self._entity_ids[handle]
+        self._get_handles()[entity_id] = handle
+        self._entities[handle] = components
+        signature = frozenset(components)
+        self._get_archetype(signature).insert(row, handle, entity_id, components)
+        self._bump_versions(signature)
+        for component_type in components:
+            if component_type in self._singletons:
+                self._singletons[component_type] = handle
+        self._drop_results(signature)
 
     def get_component[T](self, entity_id: UUID, component_type: type[T]) -> T:
         """Get an entity's component. None if entity or component not found."""
-        if entity_id not in self._entities:
-            raise KeyError(f"{entity_id=} doesn't exist.")
-        if component_type not in self._entities[entity_id]:
+        components = self._entities[self._get_handle(entity_id)]
+        assert components is not None
+        if component_type not in components:
             raise KeyError(f"{component_type=} missing for {entity_id=}.")
-        return self._entities[entity_id][component_type]
+        return components[component_type]
 
     def try_component[T](self, entity_id: UUID, component_type: type[T]) -> T | None:
-        return self._entities.get(entity_id, {}).get(component_type, None)
+        handle = self._handles.get(entity_id)
+        if handle is None:
+            return None
+        components = self._entities[handle]
+        assert components is not None
+        return components.get(component_type, None)
+
+    def get_mut_component[T](self, entity_id: UUID, component_type: type[T]) -> T:
+        """Get an entity's component for mutation, cloning it if shared."""
+        return self._get_mut(self._get_handle(entity_id), component_type)
+
+    def _get_mut[T](self, handle: int, component_type: type[T]) -> T:
+        """Get a component by handle for mutation, cloning it if shared."""
+        components = self._entities[handle]
+        assert components is not None
+        if component_type not in components:
+            entity_id = self._entity_ids[handle]
+            raise KeyError(f"{component_type=} missing for {entity_id=}.")
+        self._bump_versions(components)
+        component = components[component_type]
+        journal = self._journal
+        if id(component) in self._owned and (
+            journal is None or id(component) in journal.fresh
+        ):
+            return component
+
+        # Shared with a forked state or a checkpoint; swap in a clone
+        new_component = ComponentCloner.clone(component)
+        self._replace_component(handle, new_component)
+        if journal is not None:
+            journal.fresh.add(id(new_component))
+        return new_component
+
+    def _replace_component(self, handle: int, component: Any) -> None:
+        """Swaps an entity's component for a new instance of the same type."""
+        entity = self._entities[handle]
+        assert entity is not None
+        if self._journal is not None:
+            replaced = entity[type(component)]
+            self._journal.entries.append(_ReplacedComponent(handle, replaced))
+        if id(entity) not in self._owned:
+            entity = entity.copy()
+            self._entities[handle] = entity
+            self._owned.add(id(entity))
+        entity[type(component)] = component
+        signature = frozenset(entity)
+        archetype = self._get_archetype(signature)
+        archetype.columns[type(component)][archetype.rows[handle]] = component
+        self._bump_versions(signature)
+        self._drop_results(signature)
+        self._owned.add(id(component))
+
+    def _get_singleton_handle(self, component_type: type) -> int | None:
+        """Gets the entity holding the singleton, resolving it on first use."""
+        if component_type in self._singletons:
+            return self._singletons[component_type]
+        handles = [
+            handle
+            for handle, components in enumerate(self._entities)
+            if components is not None and component_type in components
+        ]
+        if len(handles) > 1:
+            raise ValueError(f"{component_type=} has more than one instance.")
+        handle = handles[0] if handles else None
+        self._singletons[component_type] = handle
+        return handle
+
+    def set_singleton(self, component: Any) -> UUID:
+        """
+        Sets the singleton component, replacing any existing one. Applied
+        straight away even while batching, so singletons created lazily by
+        a lookup are seen by the next lookup.
+        """
+        handle = self._get_singleton_handle(type(component))
+        if handle is None:
+            entity_id = uuid4()
+            self._drop_results(self._insert(entity_id, {type(component): component}))
+            return entity_id
+        self._replace_component(handle, component)
+        return self._entity_ids[handle]
+
+    def get_singleton[T](self, component_type: type[T]) -> T:
+        """Get the singleton component. Raises KeyError if not found."""
+        handle = self._get_singleton_handle(component_type)
+        if handle is None:
+            raise KeyError(f"singleton {component_type=} doesn't exist.")
+        return self._entities[handle][component_type]  # type: ignore
+
+    def try_singleton[T](self, component_type: type[T]) -> T | None:
+        """Get the singleton component. None if not found."""
+        handle = self._get_singleton_handle(component_type)
+        if handle is None:
+            return None
+        return self._entities[handle][component_type]  # type: ignore
+
+    def get_mut_singleton[T](self, component_type: type[T]) -> T:
+        """Get the singleton component for mutation, cloning it if shared."""
+        handle = self._get_singleton_handle(component_type)
+        if handle is None:
+            raise KeyError(f"singleton {component_type=} doesn't exist.")
+        return self._get_mut(handle, component_type)
+
+    def _match_signatures(
+        self,
+        component_types: tuple[type, ...],
+    ) -> list[frozenset[type]]:
+        """Gets the archetype signatures that have all the component types."""
+        # If cache miss, match archetypes once. New archetypes are appended
+        # to this cache as they're created, so it never goes stale.
+        if component_types not in self._query_cache:
+            self._query_cache[component_types] = [
+                signature
+                for signature in self._archetypes
+                if signature.issuperset(component_types)
+            ]
+        return self._query_cache[component_types]
 
     @overload
     def query[T](
@@ -63,59 +555,119 @@ class GameState:
         u: type | None = None,
         v: type | None = None,
     ) -> list[tuple[Any, ...]]:
-        """Yields entities and their components by given component types."""
+        """Returns entities and their components by given component types."""
         component_types = tuple(filter(None, (t, u, v)))
+        if (result := self._query_results.get(component_types)) is not None:
+            return result
 
-        # If cache miss, linear search entities with matching component types
-        if component_types not in self._query_cache:
-            entity_ids: list[UUID] = [
-                entity_id
-                for entity_id, components in self._entities.items()
-                if all(ct in components for ct in component_types)
-            ]
-            self._query_cache[component_types] = entity_ids
-
-        # The entity IDs are matched; return their components
-        result: list[tuple[Any, ...]] = []
-        for entity_id in self._query_cache[component_types]:
-            entity = self._entities[entity_id]
-            components: list[Any] = [entity[ct] for ct in component_types]
-            result.append((entity_id, *components))
+        # The archetypes are matched; zip their columns into rows. Each is in
+        # insertion order, so merging them by handle keeps that order
+        tables = []
+        for signature in self._match_signatures(component_types):
+            archetype = self._archetypes[signature]
+            columns = [archetype.columns[ct] for ct in component_types]
+            tables.append((archetype.handles, zip(archetype.entity_ids, *columns)))
+        if len(tables) == 1:
+            result = list(tables[0][1])
+        else:
+            handle_rows = merge(*(zip(*table) for table in tables), key=itemgetter(0))
+            result = [row for _, row in handle_rows]
+        self._query_results[component_types] = result
         return result
 
+    @overload
+    def iter_query[T](
+        self,
+        t: type[T],
+    ) -> Iterator[tuple[UUID, T]]: ...
+
+    @overload
+    def iter_query[T, U](
+        self,
+        t: type[T],
+        u: type[U],
+    ) -> Iterator[tuple[UUID, T, U]]: ...
+
+    @overload
+    def iter_query[T, U, V](
+        self,
+        t: type[T],
+        u: type[U],
+        v: type[V],
+    ) -> Iterator[tuple[UUID, T, U, V]]: ...
+
+    def iter_query(
+        self,
+        t: type,
+        u: type | None = None,
+        v: type | None = None,
+    ) -> Iterator[tuple[Any, ...]]:
+        """
+        Lazily yields entities and their components by given component types.
+        Entities must not be added or deleted while iterating.
+        """
+        component_types = tuple(filter(None, (t, u, v)))
+        for signature in self._match_signatures(component_types):
+            archetype = self._archetypes[signature]
+            columns = [archetype.columns[ct] for ct in component_types]
+            yield from zip(archetype.entity_ids, *columns)
+
+    def query_one_type[T](self, t: type[T]) -> Iterator[tuple[UUID, T]]:
+        """
+        Lazily yields entities and their component of a single type.
+        Entities must not be added or deleted while iterating.
+        """
+        for signature in self._match_signatures((t,)):
+            archetype = self._archetypes[signature]
+            yield from zip(archetype.entity_ids, archetype.columns[t])
+
+    def _iter_entities(self) -> Iterator[tuple[UUID, dict[type, Any]]]:
+        """Yields every entity and its components in insertion order."""
+        for entity_id, components in zip(self._entity_ids, self._entities):
+            if components is not None:
+                yield entity_id, components
+
     def dump(self) -> dict[UUID, dict[type, Any]]:
-        """Returns a deep copy of the entities table."""
-        return deepcopy(self._entities)
+        """Returns a copy of the entities table."""
+        clone = ComponentCloner.clone
+        return {
+            entity_id: {t: clone(c) for t, c in components.items()}
+            for entity_id, components in self._iter_entities()
+        }
 
     @staticmethod
     def load(entities: dict[UUID, dict[type, Any]]) -> "GameState":
-        """Loads game state from entities table and id counter."""
+        """Loads game state from a copy of the entities table."""
         gs = GameState()
-        gs._entities = deepcopy(entities)
+        clone = ComponentCloner.clone
+        for entity_id, components in entities.items():
+            gs._insert(entity_id, {t: clone(c) for t, c in components.items()})
         return gs
 
-    def selective_copy(
-        self,
-        *component_types: type[Any],
-        copy_method: Callable[[Any], Any],
-    ) -> "GameState":
-        """Copies the selected components using specified copy method."""
+    def copy(self) -> "GameState":
+        """Returns an independent copy of this game state."""
+        gs = GameState()
+        clone = ComponentCloner.clone
+        for entity_id, components in self._iter_entities():
+            gs._insert(entity_id, {t: clone(c) for t, c in components.items()})
+        return gs
 
-        # Shallow copy everything by default
+    def fork(self) -> "GameState":
+        """
+        Returns a copy-on-write copy of this game state. Both states share
+        component instances until either one asks to mutate a component.
+        """
         new_gs = GameState()
+        new_gs._handles = self._handles
+        new_gs._entity_ids = self._entity_ids
         new_gs._entities = self._entities.copy()
-        new_gs._query_cache = self._query_cache.copy()
-
-        # Copies each entity dict and its component instances
-        for entity_id in new_gs._entities:
-            new_entity = new_gs._entities[entity_id].copy()
-            new_gs._entities[entity_id] = new_entity
-
-            # Copy its components instances using specified method
-            for component_type in new_entity:
-                if component_type not in component_types:
-                    continue
-                new_component = copy_method(new_entity[component_type])
-                new_entity[component_type] = new_component
+        new_gs._archetypes = self._archetypes.copy()
+        new_gs._query_cache = {k: v.copy() for k, v in self._query_cache.items()}
+        new_gs._query_results = self._query_results.copy()
+        new_gs._singletons = self._singletons.copy()
+        new_gs._versions = self._versions.copy()
 
+        # Everything is now shared, so neither state owns anything
+        self._owned = set()
+        new_gs._owned = set()
         return new_gs
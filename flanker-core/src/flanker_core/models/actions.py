@@ -62,3 +62,16 @@ Action = MoveAction | PivotAction | FireAction | AssaultAction
 ActionResult = (
     MoveActionResult | PivotActionResult | FireActionResult | AssaultActionResult
 )
+
+
+@dataclass(frozen=True)
+class ActionPreview:
+    """
+    Validated action, with its reactive fire precomputed so it can be
+    performed without validating again. Only valid for the game state it
+    was previewed from, and any unmutated copy of it.
+    """
+
+    action: Action
+    interrupt_candidates: list[tuple[Vec2, list[UUID]]]  # Empty if not a move
+    firer_ids: list[UUID]  # Units whose fire outcomes decide the action
@@ -1,6 +1,7 @@
 import math
 from dataclasses import dataclass
 from math import isclose, sqrt
+from typing import ClassVar
 
 
 @dataclass(frozen=True)
@@ -65,3 +66,21 @@ class Vec2:
         if not isinstance(other, Vec2):
             return NotImplemented
         return self.is_close(other)
+
+
+@dataclass(frozen=True)
+class Vec2Key:
+    """
+    Hashable key of a position, snapped to a grid of `QUANTUM`. Unlike `Vec2`,
+    whose equality has a tolerance but whose hash is exact, positions that
+    differ only by float noise share a key. Use this to key position caches.
+    """
+
+    QUANTUM: ClassVar[float] = 1e-9
+
+    x: int
+    y: int
+
+    @staticmethod
+    def from_vec2(vec: Vec2) -> "Vec2Key":
+        return Vec2Key(round(vec.x / Vec2Key.QUANTUM), round(vec.y / Vec2Key.QUANTUM))
@@ -0,0 +1,80 @@
+import math
+from typing import Iterable, Iterator
+
+import numpy as np
+from flanker_core.models.vec2 import Vec2
+from numpy.typing import NDArray
+
+
+class Vec2Array:
+    """
+    Batch of 2D vectors backed by a NumPy `(N, 2)` float64 array.
+    Operations work on the whole batch at once and return new arrays.
+    """
+
+    __slots__ = ("array",)
+
+    def __init__(self, array: NDArray[np.float64]) -> None:
+        self.array = array
+
+    @staticmethod
+    def from_vec2s(vectors: Iterable[Vec2]) -> "Vec2Array":
+        """Creates an array from `Vec2` vectors."""
+        array = np.array([(v.x, v.y) for v in vectors], dtype=np.float64)
+        return Vec2Array(array.reshape(-1, 2))
+
+    def to_vec2s(self) -> list[Vec2]:
+        """Converts back to a list of `Vec2` vectors."""
+        return [Vec2(x, y) for x, y in self.array.tolist()]
+
+    def __len__(self) -> int:
+        return self.array.shape[0]
+
+    def __getitem__(self, index: int) -> Vec2:
+        x, y = self.array[index].tolist()
+        return Vec2(x, y)
+
+    def __iter__(self) -> Iterator[Vec2]:
+        return iter(self.to_vec2s())
+
+    def closed(self) -> "Vec2Array":
+        """Returns a closed loop where the first vector repeats at the end."""
+        return Vec2Array(np.concatenate((self.array, self.array[:1])))
+
+    def translated(self, offset: Vec2) -> "Vec2Array":
+        """Returns a new array translated by `offset`."""
+        return Vec2Array(self.array + (offset.x, offset.y))
+
+    def rotated(self, angle: float) -> "Vec2Array":
+        """Returns a new array rotated by `angle` radians."""
+        cos_a = math.cos(angle)
+        sin_a = math.sin(angle)
+        x = self.array[:, 0]
+        y = self.array[:, 1]
+        return Vec2Array(
+            np.column_stack((x * cos_a - y * sin_a, x * sin_a + y * cos_a))
+        )
+
+    def lengths(self) -> NDArray[np.float64]:
+        """Returns the length (norm) of each vector."""
+        return np.sqrt(self.array[:, 0] ** 2 + self.array[:, 1] ** 2)
+
+    def normalized(self) -> "Vec2Array":
+        """Returns a new array of normalized vectors, zero stays zero."""
+        lengths = self.lengths()[:, None]
+        safe_lengths = np.where(lengths > 0, lengths, 1)
+        return Vec2Array(np.where(lengths > 0, self.array / safe_lengths, 0))
+
+    def distances(self, point: Vec2) -> NDArray[np.float64]:
+        """Returns the distance of each vector to `point`."""
+        return self.translated(Vec2(-point.x, -point.y)).lengths()
+
+    def angles(self, center: Vec2) -> NDArray[np.float64]:
+        """Returns the angle of each vector around `center` in [0, 2π)."""
+        theta = np.arctan2(self.array[:, 1] - center.y, self.array[:, 0] - center.x)
+        return np.where(theta < 0, theta + 2 * math.pi, theta)
+
+    def sorted_by_angle(self, center: Vec2) -> "Vec2Array":
+        """Returns a new array sorted by angle around `center`."""
+        order = np.argsort(self.angles(center), kind="stable")
+        return Vec2Array(self.array[order])
@@ -3,6 +3,7 @@ from typing import overload
 from flanker_core.gamestate import GameState
 from flanker_core.models.actions import (
     Action,
+    ActionPreview,
     ActionResult,
     AssaultAction,
     AssaultActionResult,
@@ -65,3 +66,59 @@ class ActionSystem:
                 return FireSystem.fire(gs, action.unit_id, action.target_id)
             case AssaultAction():
                 return AssaultSystem.assault(gs, action.unit_id, action.target_id)
+
+    @staticmethod
+    def preview(
+        gs: GameState,
+        action: Action,
+    ) -> ActionPreview | InvalidAction:
+        """
+        Validates an action and precomputes its reactive fire, without
+        mutating the game state.
+        """
+
+        match action:
+            case MoveAction():
+                preview = MoveSystem.preview_move(gs, action.unit_id, action.to)
+            case PivotAction():
+                preview = MoveSystem.preview_pivot(gs, action.unit_id, action.to)
+            case AssaultAction():
+                preview = AssaultSystem.preview_assault(
+                    gs, action.unit_id, action.target_id
+                )
+            case FireAction():
+                if reason := FireSystem.preview_fire(
+                    gs, action.unit_id, action.target_id
+                ):
+                    return reason
+                return ActionPreview(action, [], [action.unit_id])
+
+        if isinstance(preview, InvalidAction):
+            return preview
+        firer_ids = list(
+            dict.fromkeys(uid for _, spotter_ids in preview for uid in spotter_ids)
+        )
+        return ActionPreview(action, preview, firer_ids)
+
+    @staticmethod
+    def apply_preview(
+        gs: GameState,
+        preview: ActionPreview,
+    ) -> ActionResult | InvalidAction:
+        """Performs a previewed action, skipping its validation and LOS."""
+
+        action = preview.action
+        interrupts = preview.interrupt_candidates
+        match action:
+            case MoveAction():
+                return MoveSystem.move(gs, action.unit_id, action.to, interrupts)
+            case PivotAction():
+                return MoveSystem.pivot(gs, action.unit_id, action.to, interrupts)
+            case FireAction():
+                return FireSystem.fire(
+                    gs, action.unit_id, action.target_id, previewed=True
+                )
+            case AssaultAction():
+                return AssaultSystem.assault(
+                    gs, action.unit_id, action.target_id, interrupts
+                )
@@ -5,6 +5,7 @@ from flanker_core.gamestate import GameState
 from flanker_core.models.actions import AssaultActionResult
 from flanker_core.models.components import AssaultControls, CombatUnit, Transform
 from flanker_core.models.outcomes import AssaultOutcomes, InvalidAction
+from flanker_core.models.vec2 import Vec2
 from flanker_core.systems.command_system import CommandSystem
 from flanker_core.systems.fire_system import FireSystem
 from flanker_core.systems.initiative_system import InitiativeSystem
@@ -62,21 +63,43 @@ class AssaultSystem:
             return AssaultOutcomes.FAIL
 
     @staticmethod
-    def assault(
+    def preview_assault(
         gs: GameState,
         attacker_id: UUID,
         target_id: UUID,
-    ) -> AssaultActionResult | InvalidAction:
-        """Mutator method performs assault action with reactive fire."""
-        # Check assault action valid
+    ) -> list[tuple[Vec2, list[UUID]]] | InvalidAction:
+        """
+        Validates an assault action without performing it, and returns
+        the move interrupt points and attacker IDs of its approach.
+        """
         if invalid_reason := AssaultSystem._validate_assault_action(
             gs, attacker_id, target_id
         ):
             return invalid_reason
+        target_position = gs.get_component(target_id, Transform).position
+        return MoveSystem.preview_move(gs, attacker_id, target_position)
+
+    @staticmethod
+    def assault(
+        gs: GameState,
+        attacker_id: UUID,
+        target_id: UUID,
+        interrupt_candidates: list[tuple[Vec2, list[UUID]]] | None = None,
+    ) -> AssaultActionResult | InvalidAction:
+        """
+        Mutator method performs assault action with reactive fire. Takes
+        the interrupt candidates of the approach if previewed from this state.
+        """
+        # Check assault action valid
+        if interrupt_candidates is None:
+            preview = AssaultSystem.preview_assault(gs, attacker_id, target_id)
+            if isinstance(preview, InvalidAction):
+                return preview
+            interrupt_candidates = preview
 
         # Moves the unit to target position (allow reactive fire)
         target_position = gs.get_component(target_id, Transform).position
-        result = MoveSystem.move(gs, attacker_id, target_position)
+        result = MoveSystem.move(gs, attacker_id, target_position, interrupt_candidates)
         if isinstance(result, InvalidAction):
             return result
         if result.reactive_fire_outcome != None:
@@ -2,6 +2,7 @@ from uuid import UUID
 
 from flanker_core.gamestate import GameState
 from flanker_core.models.components import CombatUnit, FireControls
+from flanker_core.systems.fire_effect_system import FireEffectSystem
 from flanker_core.systems.objective_system import ObjectiveSystem
 
 
@@ -14,14 +15,11 @@ class CommandSystem:
 
         unit = gs.get_component(unit_id, CombatUnit)
 
-        # Reset fire controls if firing at this unit
-        for _, fire_controls in gs.query(FireControls):
-            if fire_controls.firing_at == None:
-                continue
-            firing_id, _ = fire_controls.firing_at
-            if firing_id != unit_id:
-                continue
-            fire_controls.firing_at = None
+        # Reset fire controls if firing at this unit, or fired by this unit
+        for firer_id in FireEffectSystem.get_firer_ids(gs, unit_id):
+            FireEffectSystem.set_firing_at(gs, firer_id, None)
+        if gs.try_component(unit_id, FireControls) != None:
+            FireEffectSystem.set_firing_at(gs, unit_id, None)
 
         # Finds the next chain of command to reassign current command
         current_command = unit.command_id
@@ -29,6 +27,7 @@ class CommandSystem:
         for id, child_unit in gs.query(CombatUnit):
             if child_unit.command_id != unit_id:
                 continue
+            child_unit = gs.get_mut_component(id, CombatUnit)
             # Records first subordinate unit as the command
             if next_command == None:
                 next_command = id
@@ -0,0 +1,76 @@
+from dataclasses import dataclass
+from typing import Iterable
+from uuid import UUID
+
+from flanker_core.gamestate import GameState
+from flanker_core.models.components import FireControls
+from flanker_core.models.outcomes import FireEffect
+
+
+@dataclass
+class _FireEffectIndex:
+    """Singleton reverse index of `FireControls.firing_at` by target."""
+
+    effects_by_target: dict[UUID, dict[UUID, FireEffect]]
+
+
+class FireEffectSystem:
+    """
+    Static system class for the fire effects units put on their targets.
+    All writes to `FireControls.firing_at` must go through this system so
+    the reverse index stays in sync.
+    """
+
+    @staticmethod
+    def _get_index(gs: GameState) -> _FireEffectIndex:
+        """Gets the index, rebuilding it from fire controls if missing."""
+        if index := gs.try_singleton(_FireEffectIndex):
+            return index
+
+        # Not built yet for this state (e.g. just loaded), so rebuild it
+        effects_by_target: dict[UUID, dict[UUID, FireEffect]] = {}
+        for firer_id, fire_controls in gs.query(FireControls):
+            if fire_controls.firing_at == None:
+                continue
+            target_id, fire_effect = fire_controls.firing_at
+            effects_by_target.setdefault(target_id, {})[firer_id] = fire_effect
+        gs.set_singleton(index := _FireEffectIndex(effects_by_target))
+        return index
+
+    @staticmethod
+    def get_fire_effects(gs: GameState, target_id: UUID) -> Iterable[FireEffect]:
+        """Gets the fire effects currently put on the target."""
+        index = FireEffectSystem._get_index(gs)
+        return index.effects_by_target.get(target_id, {}).values()
+
+    @staticmethod
+    def get_firer_ids(gs: GameState, target_id: UUID) -> list[UUID]:
+        """Gets the units currently firing at the target."""
+        index = FireEffectSystem._get_index(gs)
+        return list(index.effects_by_target.get(target_id, {}))
+
+    @staticmethod
+    def set_firing_at(
+        gs: GameState,
+        firer_id: UUID,
+        firing_at: tuple[UUID, FireEffect] | None,
+    ) -> None:
+        """Mutates the firer's fire effect target, `None` to reset."""
+        fire_controls = gs.get_component(firer_id, FireControls)
+        if fire_controls.firing_at == firing_at:
+            return
+
+        # Build the index from the current state before changing it
+        FireEffectSystem._get_index(gs)
+        index = gs.get_mut_singleton(_FireEffectIndex)
+        if fire_controls.firing_at != None:
+            target_id, _ = fire_controls.firing_at
+            firers = index.effects_by_target[target_id]
+            del firers[firer_id]
+            if not firers:
+                del index.effects_by_target[target_id]
+        if firing_at != None:
+            target_id, fire_effect = firing_at
+            index.effects_by_target.setdefault(target_id, {})[firer_id] = fire_effect
+
+        gs.get_mut_component(firer_id, FireControls).firing_at = firing_at
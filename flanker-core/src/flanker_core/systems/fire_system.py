@@ -7,6 +7,7 @@ from flanker_core.models.actions import FireActionResult
 from flanker_core.models.components import CombatUnit, FireControls, Transform
 from flanker_core.models.outcomes import FireEffect, FireOutcomes, InvalidAction
 from flanker_core.systems.command_system import CommandSystem
+from flanker_core.systems.fire_effect_system import FireEffectSystem
 from flanker_core.systems.initiative_system import InitiativeSystem
 from flanker_core.systems.los_system import LosSystem
 from flanker_core.systems.objective_system import ObjectiveSystem
@@ -36,14 +37,7 @@ class FireSystem:
             return unit.status_override
 
         # Record each fire effects of each firer
-        fire_effects: set[FireEffect] = set()
-        for _, fire_controls in gs.query(FireControls):
-            if fire_controls.firing_at == None:
-                continue
-            fire_at_id, fire_effect = fire_controls.firing_at
-            if fire_at_id != unit_id:
-                continue
-            fire_effects.add(fire_effect)
+        fire_effects = set(FireEffectSystem.get_fire_effects(gs, unit_id))
 
         # Apply each fire effect; SUPPRESSING surpass PINNING
         if FireEffect.SUPPRESSING in fire_effects:
@@ -125,33 +119,52 @@ class FireSystem:
             case FireOutcomes.PIN:
                 # If firing at the same suppressed target, don't reset the effect
                 if fire_controls.firing_at != (target_id, FireEffect.SUPPRESSING):
-                    fire_controls.firing_at = (target_id, FireEffect.PINNING)
+                    FireEffectSystem.set_firing_at(
+                        gs, attacker_id, (target_id, FireEffect.PINNING)
+                    )
             case FireOutcomes.SUPPRESS:
                 target_status = FireSystem.get_status(gs, target_id)
                 if target_status != CombatUnit.Status.SUPPRESSED:
-                    fire_controls.firing_at = (target_id, FireEffect.SUPPRESSING)
+                    FireEffectSystem.set_firing_at(
+                        gs, attacker_id, (target_id, FireEffect.SUPPRESSING)
+                    )
                     # Reset fire effect because SUPPRESSED unit can't fire.
                     if target_fire_controls != None:
-                        target_fire_controls.firing_at = None
+                        FireEffectSystem.set_firing_at(gs, target_id, None)
                 else:  # Kills the unit if it is already suppressed
                     CommandSystem.kill_unit(gs, target_id)
             case FireOutcomes.KILL:
                 CommandSystem.kill_unit(gs, target_id)
 
     @staticmethod
-    def fire(
+    def preview_fire(
         gs: GameState,
         attacker_id: UUID,
         target_id: UUID,
-    ) -> FireActionResult | InvalidAction:
-        """Performs a complete fire action from attacker to target unit."""
-
-        # Validate fire actors
+    ) -> InvalidAction | None:
+        """Returns a reason if fire action invalid, `None` otherwise."""
         if reason := FireSystem.validate_fire_actors(gs, attacker_id, target_id):
             return reason
         if not InitiativeSystem.has_initiative(gs, attacker_id):
             return InvalidAction.NO_INITIATIVE
 
+    @staticmethod
+    def fire(
+        gs: GameState,
+        attacker_id: UUID,
+        target_id: UUID,
+        previewed: bool = False,
+    ) -> FireActionResult | InvalidAction:
+        """
+        Performs a complete fire action from attacker to target unit.
+        Skips validation if previewed from this state.
+        """
+
+        # Validate fire actors
+        if not previewed:
+            if reason := FireSystem.preview_fire(gs, attacker_id, target_id):
+                return reason
+
         # Reset stall count after validity checks
         attacker_unit = gs.get_component(attacker_id, CombatUnit)
         ObjectiveSystem.reset_stall(gs, attacker_unit.faction)
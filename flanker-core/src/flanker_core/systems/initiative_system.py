@@ -10,18 +10,18 @@ class InitiativeSystem:
     @staticmethod
     def flip_initiative(gs: GameState) -> None:
         """Mutates the current initiative to the other faction."""
-        for _, initiative in gs.query(InitiativeState):
-            match initiative.faction:
-                case InitiativeState.Faction.RED:
-                    initiative.faction = InitiativeState.Faction.BLUE
-                case InitiativeState.Faction.BLUE:
-                    initiative.faction = InitiativeState.Faction.RED
+        initiative = gs.get_mut_singleton(InitiativeState)
+        match initiative.faction:
+            case InitiativeState.Faction.RED:
+                initiative.faction = InitiativeState.Faction.BLUE
+            case InitiativeState.Faction.BLUE:
+                initiative.faction = InitiativeState.Faction.RED
 
     @staticmethod
     def set_initiative(gs: GameState, faction: InitiativeState.Faction) -> None:
         """Mutates the given faction to have the initiative."""
-        for _, faction_manager in gs.query(InitiativeState):
-            faction_manager.faction = faction
+        if gs.get_singleton(InitiativeState).faction != faction:
+            gs.get_mut_singleton(InitiativeState).faction = faction
 
     @staticmethod
     def has_initiative(gs: GameState, unit_id: UUID) -> bool:
@@ -32,6 +32,4 @@ class InitiativeSystem:
     @staticmethod
     def get_initiative(gs: GameState) -> InitiativeState.Faction:
         """Get the faction that has the current initiative."""
-        for _, faction in gs.query(InitiativeState):
-            return faction.faction
-        raise Exception("InitiativeState component not found")
+        return gs.get_singleton(InitiativeState).faction
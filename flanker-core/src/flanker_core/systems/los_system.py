@@ -1,41 +1,79 @@
 import math
+from bisect import insort
+from collections import Counter
 from dataclasses import dataclass
-from itertools import pairwise
-from typing import Callable, Iterable
+from typing import Callable, Iterable, Literal
 from uuid import UUID
 
+import numpy as np
 from flanker_core.gamestate import GameState
 from flanker_core.models.components import TerrainFeature, Transform
-from flanker_core.models.vec2 import Vec2
+from flanker_core.models.vec2 import Vec2, Vec2Key
+from flanker_core.models.vec2_array import Vec2Array
 from flanker_core.systems.terrain_system import TerrainSystem
-from flanker_core.utils.intersect_getter import IntersectGetter
-from flanker_core.utils.linear_transform import LinearTransform
+from flanker_core.utils.edge_grid import EdgeGrid
+from flanker_core.utils.intersect_getter import IntersectGetter, _njit_intersect_edge
+from flanker_core.utils.lru_cache import CacheStats, LruCache
+from flanker_core.utils.prepared_polygon import PreparedPolygon
+from numba import njit  # type: ignore
+from numpy.typing import NDArray
 
 FOV_DEGREE = 90
 
 
-@dataclass
-class _TerrainIntersection:
-    """Represents intersection between line and terrain feature."""
-
-    point: Vec2
-    terrain: TerrainFeature
-    terrain_id: UUID
-
-
 @dataclass
 class _Terrain:
     """Represents a prepared terrain ready for LOS."""
 
     terrain_id: UUID
     terrain_feature: TerrainFeature
-    vertices: list[Vec2]
+    vertices: Vec2Array
 
 
-@dataclass
-class _LosCacheComponent:
-    los_polygon_by_point: dict[Vec2, list[Vec2]]
-    fov_polygon_by_point: dict[tuple[Vec2, float], list[Vec2]]
+type _BBox = tuple[float, float, float, float]
+
+
+@dataclass(frozen=True)
+class _LosEntry:
+    """
+    A cached LOS polygon, the bounding box of it and the spotter, which
+    holds every ray up to its point, and the arcs of rays (start angle &
+    length) whose point is their only hit or their fallback. Past the box,
+    terrain can only change these rays, as others already end on their
+    second hit. Never mutated.
+    """
+
+    polygon: list[Vec2]
+    bbox: _BBox
+    open_arcs: NDArray[np.float64]
+
+
+# LOS depends only on terrain, so polygons are cached process-wide by the
+# terrain key, shared by every game state, fork and agent on the same map.
+# Cached polygons are shared, and must never be mutated.
+_LOS_POLYGON_CACHE = LruCache[tuple[int, Vec2Key, str], _LosEntry](4096)
+_FOV_POLYGON_CACHE = LruCache[tuple[int, Vec2Key, float], PreparedPolygon](4096)
+
+# How many past terrain edits cached polygons can be carried over from
+_MAX_TERRAIN_EDITS = 16
+
+
+@dataclass(frozen=True)
+class _LosTerrainHistory:
+    """
+    An opaque terrain layout, as the flag, bounding box and digest of each
+    terrain, and the past edits that led to it as their previous terrain key
+    and the bounding boxes they changed. Never mutated.
+    """
+
+    key: int
+    terrains: dict[UUID, tuple[int, _BBox, int]]
+    edits: tuple[tuple[int, tuple[_BBox, ...]], ...]  # Oldest first
+
+
+# Terrain histories by terrain key, memoized process-wide so that lookups
+# never write to the game state
+_TERRAIN_HISTORY = LruCache[int, _LosTerrainHistory](64)
 
 
 class LosSystemOverrides:
@@ -68,6 +106,21 @@ class LosSystemOverrides:
 class LosSystem:
     """Static system class for checking Line-of-Sight (LOS) against terrain."""
 
+    @staticmethod
+    def get_cache_stats() -> dict[str, CacheStats]:
+        """Gets the usage counters of the shared LOS and FOV polygon caches."""
+        return {
+            "los_polygon": _LOS_POLYGON_CACHE.get_stats(),
+            "fov_polygon": _FOV_POLYGON_CACHE.get_stats(),
+        }
+
+    @staticmethod
+    def clear_cache() -> None:
+        """Drops every cached LOS and FOV polygon, and the terrain history."""
+        _LOS_POLYGON_CACHE.clear()
+        _FOV_POLYGON_CACHE.clear()
+        _TERRAIN_HISTORY.clear()
+
     @staticmethod
     def in_fov(
         spotter_transform: Transform,
@@ -118,20 +171,9 @@ class LosSystem:
         passed_one_terrain = False
         for intersect in intersects:
             # Doesn't count spotter's terrain
-            terrain_id = intersect.terrain_id
-            terrain = gs.get_component(terrain_id, TerrainFeature)
-            terrain_transform = gs.get_component(terrain_id, Transform)
-            vertices = LinearTransform.apply(
-                vec_list=terrain.vertices,
-                transform=terrain_transform,
-            )
-            if terrain.is_closed_loop:
-                vertices.append(vertices[0])
-                if IntersectGetter.is_inside(
-                    point=spotter_pos,
-                    polygon=vertices,
-                ):
-                    continue
+            polygon = TerrainSystem.get_geometry(gs, intersect.terrain_id).polygon
+            if polygon and polygon.contains(spotter_pos):
+                continue
 
             if not passed_one_terrain:
                 passed_one_terrain = True
@@ -151,64 +193,126 @@ class LosSystem:
         Returns an eariliest point position, if exists, along `line` that
         has a valid LOS to the entity `spotter_id`. This considers FOV.
         """
+        return LosSystem.get_los_from_line_many(gs, [spotter_id], line)[0]
+
+    @staticmethod
+    def get_los_from_line_many(
+        gs: GameState,
+        spotter_ids: list[UUID],
+        line: tuple[Vec2, Vec2],
+    ) -> list[Vec2 | None]:
+        """
+        Same as `get_los_from_line` for each of the spotters, testing the
+        line against all their FOV polygons in one batch.
+        """
 
         # Use the override if exists
         for _, override in gs.query(LosSystemOverrides.GetLosFromLine):
-            return override.method(gs, spotter_id, line)
+            return [override.method(gs, id, line) for id in spotter_ids]
 
-        interrupt_pos: Vec2 | None = None
-
-        spotter_transform = gs.get_component(spotter_id, Transform)
+        fov_polygons = [
+            LosSystem._get_fov_polygon(gs, gs.get_component(id, Transform))
+            for id in spotter_ids
+        ]
+        if not fov_polygons:
+            return []
+        vertices = np.concatenate([p.vertices.array for p in fov_polygons])
+        offsets = np.cumsum([0] + [len(p.vertices) for p in fov_polygons])
+        start = np.array([line[0].x, line[0].y], dtype=np.float64)
+        line_vector = np.array([line[1].x, line[1].y], dtype=np.float64) - start
+        is_inside, entries = LosSystem._njit_get_entries(
+            start, line_vector, vertices, offsets
+        )
 
-        # If already exists in cache, no need to recalculate
-        if ent := gs.query(_LosCacheComponent):
-            _, cache = ent[0]
-        else:
-            gs.add_entity(cache := _LosCacheComponent({}, {}))
+        interrupts: list[Vec2 | None] = []
+        for inside, t in zip(is_inside.tolist(), entries.tolist()):
+            # If the first point is inside, ignore any intersections and
+            # return the first point right away.
+            if inside:
+                interrupts.append(line[0])
+            elif math.isnan(t):
+                interrupts.append(None)
+            else:
+                # Add a tiny offset to prevent coordinate from sitting
+                # precisely on LOS polygon edge.
+                # This reduces floating point sensitivity.
+                earliest_point = Vec2(*(start + t * line_vector).tolist())
+                offset = (line[1] - line[0]) * 1e-12
+                interrupts.append(earliest_point + offset)
+        return interrupts
 
-        cache_key: tuple[Vec2, float] = (
-            spotter_transform.position,
+    @staticmethod
+    def _get_fov_polygon(
+        gs: GameState,
+        spotter_transform: Transform,
+    ) -> PreparedPolygon:
+        """
+        Gets the FOV polygon of a spotter, from cache if exists. After a
+        terrain edit, it is cut again from the LOS polygon, which is only
+        recomputed if the edit could change it.
+        """
+        cache_key = (
+            TerrainSystem.get_terrain_key(gs, TerrainFeature.Flag.OPAQUE),
+            Vec2Key.from_vec2(spotter_transform.position),
             spotter_transform.degrees,
         )
-        if cache_key in cache.fov_polygon_by_point:
-            fov_polygon = cache.fov_polygon_by_point[cache_key]
-        else:
+        if (fov_polygon := _FOV_POLYGON_CACHE.get(cache_key)) is None:
             los_polygon = LosSystem.get_los_polygon(
                 gs=gs,
                 spotter_pos=spotter_transform.position,
             )
-            fov_polygon = LosSystem.apply_fov_to_polygon(
-                polyline=los_polygon,
-                center_point=spotter_transform.position,
-                heading_degree=spotter_transform.degrees,
+            fov_polygon = PreparedPolygon(
+                LosSystem.apply_fov_to_polygon(
+                    polyline=los_polygon,
+                    center_point=spotter_transform.position,
+                    heading_degree=spotter_transform.degrees,
+                )
             )
-            cache.fov_polygon_by_point[cache_key] = fov_polygon
-
-        # If the first point is inside, ignore any intersections and
-        # return the first point right away.
-        if IntersectGetter.is_inside(
-            point=line[0],
-            polygon=fov_polygon,
-        ):
-            interrupt_pos = line[0]
+            _FOV_POLYGON_CACHE.set(cache_key, fov_polygon)
+        return fov_polygon
 
-        # The first point is outside, thus only care about intersection
-        elif intersects := IntersectGetter.get_intersects(
-            line=(line[0], line[1]),
-            polyline=fov_polygon,
-        ):
-            earliest_point = min(
-                intersects,
-                key=lambda point: (line[0] - point).length(),
-            )
-            # Add a tiny offset to prevent coordinate from sitting
-            # precisely on LOS polygon edge.
-            # This reduces floating point sensitivity.
-            line_direction = line[1] - line[0]
-            offset = line_direction * 1e-12
-            interrupt_pos = earliest_point + offset
+    @staticmethod
+    @njit  # type: ignore
+    def _njit_get_entries(
+        start: NDArray[np.float64],
+        line_vector: NDArray[np.float64],
+        vertices: NDArray[np.float64],
+        offsets: NDArray[np.int64],
+    ) -> tuple[NDArray[np.bool_], NDArray[np.float64]]:
+        """
+        Private batched entry finder for `get_los_from_line_many`. Polygon
+        `i` is the closed loop `vertices[offsets[i]:offsets[i + 1]]`. Returns
+        whether the line starts inside each polygon, else the line parameter
+        `t` where it first hits it, or NaN if it never does.
+        """
+        n_polygons = offsets.shape[0] - 1
+        is_inside = np.zeros(n_polygons, dtype=np.bool_)
+        entries = np.full(n_polygons, np.nan)
+        x, y = start[0], start[1]
+        for i in range(n_polygons):
+            # Same crossing number test as `PreparedPolygon.contains`
+            inside = False
+            for e in range(offsets[i], offsets[i + 1] - 1):
+                start_y = vertices[e, 1]
+                end_y = vertices[e + 1, 1]
+                if (start_y > y) != (end_y > y):
+                    dy = end_y - start_y
+                    inverse_slope = (vertices[e + 1, 0] - vertices[e, 0]) / dy
+                    if x < vertices[e, 0] + (y - start_y) * inverse_slope:
+                        inside = not inside
+            if inside:
+                is_inside[i] = True
+                continue
 
-        return interrupt_pos
+            # The first point is outside, thus only care about intersection
+            for e in range(offsets[i], offsets[i + 1] - 1):
+                t = _njit_intersect_edge(
+                    x, y, line_vector[0], line_vector[1], vertices[e], vertices[e + 1]
+                )
+                # A missed edge is NaN, which never compares less
+                if np.isnan(entries[i]) or t < entries[i]:
+                    entries[i] = t
+        return is_inside, entries
 
     @staticmethod
     def apply_fov_to_polygon(
@@ -219,78 +323,167 @@ class LosSystem:
         radius: float = 1000,
     ) -> list[Vec2]:
         """Applies FOV cone to LOS polygon to create a smaller LOS cone."""
+        return LosSystem.apply_fov_to_polygon_many(
+            polyline, center_point, [heading_degree], fov_degree, radius
+        )[0]
 
-        # Create some rays that defines this FOV cone
-        heading_rad = math.radians(heading_degree)
-        forward_direction: Vec2 = Vec2(1, 0).rotated(heading_rad)
-        forward_ray = forward_direction * radius
-        half_angle_rad = math.radians(fov_degree / 2)
-        left_ray: Vec2 = center_point + forward_ray.rotated(half_angle_rad)
-        right_ray: Vec2 = center_point + forward_ray.rotated(-half_angle_rad)
-
-        # Choose the two first intersection points of this FOV cone
-        left_point = min(
-            IntersectGetter.get_intersects(
-                line=(center_point, left_ray), polyline=polyline
-            ),
-            key=lambda point: (center_point - point).length(),
+    @staticmethod
+    def apply_fov_to_polygon_many(
+        polyline: list[Vec2],
+        center_point: Vec2,
+        heading_degrees: list[float],
+        fov_degree: int = FOV_DEGREE,
+        radius: float = 1000,
+    ) -> list[list[Vec2]]:
+        """
+        Applies FOV cones of many headings to the same LOS polygon at once,
+        e.g. to evaluate the pivots of a spotter.
+        """
+        vertices = Vec2Array.from_vec2s(polyline).translated(
+            Vec2(-center_point.x, -center_point.y)
         )
-        right_point = min(
-            IntersectGetter.get_intersects(
-                line=(center_point, right_ray), polyline=polyline
-            ),
-            key=lambda point: (center_point - point).length(),
+        points, offsets = LosSystem._njit_clip_fov(
+            vertices.array,
+            np.radians(np.array(heading_degrees, dtype=np.float64)),
+            math.radians(fov_degree / 2),
+            radius,
         )
+        points += (center_point.x, center_point.y)
+        polygons: list[list[Vec2]] = []
+        for i in range(len(heading_degrees)):
+            polygon = Vec2Array(points[offsets[i] : offsets[i + 1]])
+            polygons.append(polygon.to_vec2s())
+        return polygons
 
-        # Filter LOS polygon of any points outside of FOV
-        threshold_rad: float = math.cos(half_angle_rad)
-        new_los: list[Vec2] = []
-        for vertex in polyline:
-            direction = vertex - center_point
-
-            if direction.length() < 1e-9:
-                # Keep the center point
-                new_los.append(vertex)
-                continue
-
-            # Using dot formula to filter the angle
-            a: Vec2 = forward_direction
-            b: Vec2 = direction.normalized()
-            if a.dot(b) >= threshold_rad:
-                new_los.append(vertex)
-
-        # Add left points and right points back to the list
-        # to represent the cut FOV edges.
-        new_los.append(left_point)
-        new_los.append(right_point)
-        new_los.append(center_point - forward_direction * 1e-9)
-        new_los = LosSystem._sort_verts_by_angle(center_point, new_los)
-        new_los.append(new_los[0])  # Loop back to a closed polyline
-        return new_los
+    @staticmethod
+    @njit  # type: ignore
+    def _njit_clip_fov(
+        vertices: NDArray[np.float64],
+        headings: NDArray[np.float64],
+        half_angle: float,
+        radius: float,
+    ) -> tuple[NDArray[np.float64], NDArray[np.int64]]:
+        """
+        Private FOV clipper for `apply_fov_to_polygon_many`. Vertices are a
+        closed loop sorted by angle around the origin, the center point.
+        Keeps vertices within the cone in their order, between where the cone
+        edges first hit the polygon. Returns the closed loop polygons, one
+        after another, and their offsets.
+        """
+        n = vertices.shape[0] - 1
+        lengths = np.sqrt(vertices[:n, 0] ** 2 + vertices[:n, 1] ** 2)
+        threshold = math.cos(half_angle)
+        points = np.empty((headings.shape[0] * (n + 5), 2), dtype=np.float64)
+        offsets = np.zeros(headings.shape[0] + 1, dtype=np.int64)
+        keep = np.empty(n, dtype=np.bool_)
+        count = 0
+
+        for h in range(headings.shape[0]):
+            forward_x = math.cos(headings[h])
+            forward_y = math.sin(headings[h])
+
+            # Filter LOS polygon of any points outside of FOV, using dot
+            # formula to filter the angle, but always keep the center point
+            n_runs = 0
+            for i in range(n):
+                dot = vertices[i, 0] * forward_x + vertices[i, 1] * forward_y
+                keep[i] = lengths[i] < 1e-9 or dot / lengths[i] >= threshold
+                if i > 0 and keep[i] and not keep[i - 1]:
+                    n_runs += 1
+            if n > 0 and keep[0] and not keep[n - 1]:
+                n_runs += 1
+
+            # Start just behind the center point, then the right cone edge
+            points[count, 0] = -forward_x * 1e-9
+            points[count, 1] = -forward_y * 1e-9
+            count += 1
+            for side in (-1.0, 1.0):
+                # Choose the first intersection point of the cone edge
+                ray_x = (
+                    forward_x * math.cos(half_angle)
+                    - side * forward_y * math.sin(half_angle)
+                ) * radius
+                ray_y = (
+                    side * forward_x * math.sin(half_angle)
+                    + forward_y * math.cos(half_angle)
+                ) * radius
+                nearest = 1.0
+                for i in range(n):
+                    t = _njit_intersect_edge(
+                        0.0, 0.0, ray_x, ray_y, vertices[i], vertices[i + 1]
+                    )
+                    if t < nearest:  # NaN never compares
+                        nearest = t
+
+                if side > 0:  # Left cone edge comes after the kept vertices
+                    points[count, 0] = ray_x * nearest
+                    points[count, 1] = ray_y * nearest
+                    count += 1
+                    break
+
+                right_x, right_y = ray_x * nearest, ray_y * nearest
+                points[count, 0] = right_x
+                points[count, 1] = right_y
+                count += 1
+
+                # A star-shaped polygon keeps one run of vertices, already
+                # in order, else fall back to ordering them by angle
+                if n_runs == 1:
+                    start = 0
+                    while not (keep[start] and not keep[start - 1]):
+                        start += 1
+                    for k in range(n):
+                        i = (start + k) % n
+                        if not keep[i]:
+                            break
+                        points[count] = vertices[i]
+                        count += 1
+                else:
+                    kept = np.flatnonzero(keep)
+                    angles = np.empty(kept.shape[0], dtype=np.float64)
+                    for k in range(kept.shape[0]):
+                        x, y = vertices[kept[k], 0], vertices[kept[k], 1]
+                        angles[k] = math.atan2(
+                            forward_x * y - forward_y * x,
+                            forward_x * x + forward_y * y,
+                        )
+                    for k in np.argsort(angles, kind="mergesort"):
+                        points[count] = vertices[kept[k]]
+                        count += 1
+
+            points[count] = points[offsets[h]]  # Close the loop
+            count += 1
+            offsets[h + 1] = count
+
+        return points[:count].copy(), offsets
 
     @staticmethod
     def get_los_polygon(
         gs: GameState,
         spotter_pos: Vec2,
         radius: float = 1000,
-        jitter_size: float = 1e-6,  # Smaller than this will break t-u bezier checks
+        method: Literal["raycast", "sweep"] = "raycast",
     ) -> list[Vec2]:
         """
         Returns a polygon representing the LOS from a spotter position.
-        Does not consider the FOV of the spotter.
+        Does not consider the FOV of the spotter. The `raycast` method casts
+        rays at every vertex, while `sweep` rotates a ray around the spotter.
         """
 
         # Use the override if exists
         for _, override in gs.query(LosSystemOverrides.GetLosPolygon):
             return override.method(gs, spotter_pos)
 
-        # If already exists in cache, no need to recalculate
-        if ent := gs.query(_LosCacheComponent):
-            _, cache = ent[0]
-        else:
-            gs.add_entity(cache := _LosCacheComponent({}, {}))
-        if spotter_pos in cache.los_polygon_by_point:
-            return cache.los_polygon_by_point[spotter_pos]
+        # If already exists in cache, or survived the terrain edits since
+        # it was cached, no need to recalculate
+        history = LosSystem._get_terrain_history(gs)
+        cache_key = (history.key, Vec2Key.from_vec2(spotter_pos), method)
+        if (cached := _LOS_POLYGON_CACHE.get(cache_key)) is not None:
+            return cached.polygon
+        if (
+            cached := LosSystem._carry_over(history, cache_key, spotter_pos)
+        ) is not None:
+            return cached.polygon
 
         terrains = list(
             LosSystem._get_terrains(
@@ -299,51 +492,314 @@ class LosSystem:
                 mask=TerrainFeature.Flag.OPAQUE,
             )
         )
-        verts = LosSystem._get_terrain_vertices(terrains, spotter_pos)
+        grid = TerrainSystem.get_edge_grid(gs, TerrainFeature.Flag.OPAQUE)
+        terrain_ids = {t.terrain_id for t in terrains}
+        enabled = np.array([id in terrain_ids for id in grid.keys], dtype=np.bool_)
+        verts = LosSystem._get_terrain_vertices(terrains, grid, enabled, spotter_pos)
+
+        # Finds the LOS point just before and just after each vertex
+        if method == "sweep":
+            points, second_hits = LosSystem._sweep_los_points(
+                terrains, verts, spotter_pos, radius
+            )
+        else:
+            points, second_hits = LosSystem._cast_los_points(
+                grid, enabled, verts, spotter_pos, radius
+            )
+
         los_polygon: list[Vec2] = []
-        for vert in verts:
-            direction = (vert - spotter_pos).normalized()
-            ray = direction * radius
-            # Instead of casting one ray, casts two rays slightly to the left and right.
-            # This prevents boundary sensitivity when casting rays at the vertices.
-            jitter = direction.rotated(1.5708) * jitter_size
-            left_point = spotter_pos - jitter
-            right_point = spotter_pos + jitter
-            for point in [left_point, right_point]:
-                intersects = sorted(
-                    LosSystem._get_terrain_intersects(
-                        line=(point, point + ray),
-                        terrains=terrains,
-                    ),
-                    key=lambda i: (i.point - spotter_pos).length(),
-                )
-                # Choose which point from the intersects to append
-                if intersects:
-                    # Selects the second point to allow see-into terrain
-                    if len(intersects) > 1:
-                        new_point = intersects[1].point
-                    else:
-                        new_point = intersects[0].point
-                else:  # No intersects, use fallback point using the ray
-                    new_point = spotter_pos + ray
-
-                # If the new point is close enough to the target vertex,
-                # assume that the point is aimed there and lands close enough
-                if (new_point - vert).length() < 1e-3:
-                    new_point = vert
-                # If points are colocated, don't append
-                if los_polygon and los_polygon[-1] == new_point:
-                    continue
-                # If points are colinear, replace instead of append
-                if LosSystem._is_colinear(los_polygon, new_point):
-                    los_polygon[-1] = new_point
-                    continue
-                los_polygon.append(new_point)
+        for i, new_point in enumerate(points):
+            vert = verts[i // 2]
+            # If the new point is close enough to the target vertex,
+            # assume that the point is aimed there and lands close enough
+            if (new_point - vert).length() < 1e-3:
+                new_point = vert
+            # If points are colocated, don't append
+            if los_polygon and los_polygon[-1] == new_point:
+                continue
+            # If points are colinear, replace instead of append
+            if LosSystem._is_colinear(los_polygon, new_point):
+                los_polygon[-1] = new_point
+                continue
+            los_polygon.append(new_point)
 
         los_polygon.append(los_polygon[0])
-        cache.los_polygon_by_point[spotter_pos] = los_polygon
+        _LOS_POLYGON_CACHE.set(
+            cache_key,
+            _LosEntry(
+                polygon=los_polygon,
+                bbox=LosSystem._get_bbox([spotter_pos, *los_polygon]),
+                open_arcs=LosSystem._get_open_arcs(verts, second_hits, spotter_pos),
+            ),
+        )
         return los_polygon
 
+    @staticmethod
+    def _get_terrain_history(gs: GameState) -> _LosTerrainHistory:
+        """
+        Gets the history of the opaque terrain layout. A layout not seen yet
+        records its edit from the layout LOS was last looked up on.
+        """
+        key = TerrainSystem.get_terrain_key(gs, TerrainFeature.Flag.OPAQUE)
+        if (history := _TERRAIN_HISTORY.get(key)) is not None:
+            return history
+        previous = _TERRAIN_HISTORY.newest()  # A miss doesn't mark its use
+
+        terrains = {
+            id: (terrain.flag, geometry.bbox, geometry.digest)
+            for id, terrain, geometry in TerrainSystem.get_geometries(
+                gs, TerrainFeature.Flag.OPAQUE
+            )
+        }
+        edits: tuple[tuple[int, tuple[_BBox, ...]], ...] = ()
+        if previous is not None:
+            # Regions of terrains added, removed, or changed, before and after
+            regions: list[_BBox] = []
+            for id in previous.terrains.keys() | terrains.keys():
+                before = previous.terrains.get(id)
+                after = terrains.get(id)
+                if before != after:
+                    regions += [entry[1] for entry in (before, after) if entry]
+            edits = previous.edits + ((previous.key, tuple(regions)),)
+            edits = edits[-_MAX_TERRAIN_EDITS:]
+        history = _LosTerrainHistory(key, terrains, edits)
+        _TERRAIN_HISTORY.set(key, history)
+        return history
+
+    @staticmethod
+    def _carry_over(
+        history: _LosTerrainHistory,
+        cache_key: tuple[int, Vec2Key, str],
+        spotter_pos: Vec2,
+    ) -> _LosEntry | None:
+        """
+        Finds a polygon cached before the recent terrain edits, that none of
+        the edited regions can change, and caches it under the current key.
+        """
+        regions: list[_BBox] = []
+        for previous_key, edit_regions in reversed(history.edits):
+            regions += edit_regions
+            previous = _LOS_POLYGON_CACHE.peek(
+                (previous_key, cache_key[1], cache_key[2])
+            )
+            if previous is None:
+                continue
+            if not all(
+                LosSystem._is_past_polygon(previous, region, spotter_pos)
+                for region in regions
+            ):
+                return None
+            _LOS_POLYGON_CACHE.set(cache_key, previous)
+            return previous
+        return None
+
+    @staticmethod
+    def _is_past_polygon(entry: _LosEntry, region: _BBox, spotter_pos: Vec2) -> bool:
+        """
+        Whether terrain edited in the region can't change the polygon: the
+        region is past every ray's point, and only rays that already end on
+        their second hit pass through it.
+        """
+        min_x, min_y, max_x, max_y = entry.bbox
+        if (
+            region[0] <= max_x
+            and min_x <= region[2]
+            and region[1] <= max_y
+            and min_y <= region[3]
+        ):
+            return False
+
+        # The region is outside the box, so it can't hold the spotter, and
+        # spans less than a half turn around it
+        xs = np.array([region[0], region[2], region[2], region[0]]) - spotter_pos.x
+        ys = np.array([region[1], region[1], region[3], region[3]]) - spotter_pos.y
+        angles = np.arctan2(ys, xs)
+        offsets = (angles - angles[0] + math.pi) % (2 * math.pi) - math.pi
+        start = angles[0] + offsets.min()
+        length = offsets.max() - offsets.min()
+        arc_starts, arc_lengths = entry.open_arcs.T
+        return not np.any(
+            ((arc_starts - start) % (2 * math.pi) <= length)
+            | ((start - arc_starts) % (2 * math.pi) <= arc_lengths)
+        )
+
+    @staticmethod
+    def _get_open_arcs(
+        verts: list[Vec2],
+        second_hits: list[bool],
+        spotter_pos: Vec2,
+    ) -> NDArray[np.float64]:
+        """
+        Gets the arcs between vertices whose rays don't all end on their
+        second hit, from the points just after and just before the vertices.
+        """
+        if not verts:  # No terrain, every ray falls back
+            return np.array([[0.0, 2 * math.pi]])
+        angles = Vec2Array.from_vec2s(verts).angles(spotter_pos)
+        lengths = (np.roll(angles, -1) - angles) % (2 * math.pi)
+        if len(verts) == 1:
+            lengths[:] = 2 * math.pi
+        hits = np.array(second_hits, dtype=np.bool_)
+        is_open = ~(hits[1::2] & np.roll(hits[0::2], -1))
+        return np.stack((angles[is_open], lengths[is_open]), axis=1)
+
+    @staticmethod
+    def _get_bbox(polygon: list[Vec2]) -> _BBox:
+        xs = [point.x for point in polygon]
+        ys = [point.y for point in polygon]
+        return (min(xs), min(ys), max(xs), max(ys))
+
+    @staticmethod
+    def _cast_los_points(
+        grid: EdgeGrid[UUID],
+        enabled: NDArray[np.bool_],
+        verts: list[Vec2],
+        spotter_pos: Vec2,
+        radius: float,
+    ) -> tuple[list[Vec2], list[bool]]:
+        """
+        Casts a ray at each vertex for the LOS points before and after it,
+        and whether each point is the second hit of its ray.
+        """
+
+        # Casts one ray exactly through each vertex. Each hit edge knows which
+        # side of the ray it extends to, so the points just before (right) and
+        # just after (left) the vertex are resolved without jittering the ray.
+        # All rays are intersected against all terrains in one batch.
+        lines = np.empty((len(verts), 2, 2), dtype=np.float64)
+        t_max = np.zeros(len(verts), dtype=np.float64)
+        for i, vert in enumerate(verts):
+            lines[i] = ((spotter_pos.x, spotter_pos.y), (vert.x, vert.y))
+            if (length := (vert - spotter_pos).length()) > 0:
+                t_max[i] = radius / length
+        hits, sides = grid.get_side_hits(lines, t_max, enabled)
+
+        points: list[Vec2] = []
+        second_hits: list[bool] = []
+        for i, vert in enumerate(verts):
+            if vert == spotter_pos:  # No direction to cast to
+                points += [spotter_pos, spotter_pos]
+                second_hits += [False, False]
+                continue
+            ray = vert - spotter_pos
+            start, end = hits.offsets[i], hits.offsets[i + 1]
+            for side in (1, 2):
+                t = hits.t[start:end][sides[start:end] & side != 0]
+                # Selects the second point to allow see-into terrain
+                if len(t) > 0:
+                    points.append(spotter_pos + ray * float(t[min(1, len(t) - 1)]))
+                else:  # No intersects, use fallback point using the ray
+                    points.append(spotter_pos + ray * float(t_max[i]))
+                second_hits.append(len(t) > 1)
+        return points, second_hits
+
+    @staticmethod
+    def _sweep_los_points(
+        terrains: list[_Terrain],
+        verts: list[Vec2],
+        spotter_pos: Vec2,
+        radius: float,
+    ) -> tuple[list[Vec2], list[bool]]:
+        """
+        Rotates a ray around the spotter for the LOS points before and after
+        each vertex, and whether each point is the second hit of its ray.
+        Edges crossing the ray are kept ordered by distance: at each vertex,
+        started edges are inserted by binary search, and the order is only
+        re-sorted if edges of overlapping terrains crossed.
+        """
+        if not verts:
+            return [], []
+
+        # Orient edges counter-clockwise around the spotter, dropping
+        # edges in line with the spotter as rays can't hit them
+        starts = np.concatenate([t.vertices.array[:-1] for t in terrains])
+        ends = np.concatenate([t.vertices.array[1:] for t in terrains])
+        center = np.array([spotter_pos.x, spotter_pos.y])
+        cross = LosSystem._cross(starts - center, ends - center)
+        is_clockwise = (cross < 0)[:, None]
+        starts, ends = (
+            np.where(is_clockwise, ends, starts)[np.abs(cross) > 1e-12],
+            np.where(is_clockwise, starts, ends)[np.abs(cross) > 1e-12],
+        )
+        start_angles = Vec2Array(starts).angles(spotter_pos)
+        end_angles = Vec2Array(ends).angles(spotter_pos)
+        # Edges crossing the zero angle end after a full turn
+        unwrapped_end_angles = np.where(
+            end_angles < start_angles, end_angles + 2 * math.pi, end_angles
+        )
+        edge_vectors = ends - starts
+        numerators = LosSystem._cross(starts - center, edge_vectors).tolist()
+        vectors_x, vectors_y = edge_vectors.T.tolist()
+
+        def by_distance(angle: float) -> Callable[[int], float]:
+            """Key of an edge by distance along the ray at `angle` to it."""
+            cos, sin = math.cos(angle), math.sin(angle)
+            return lambda edge: numerators[edge] / (
+                cos * vectors_y[edge] - sin * vectors_x[edge]
+            )
+
+        def get_point(active: list[int], angle: float) -> tuple[Vec2, bool]:
+            """Selects the second nearest hit to allow see-into terrain."""
+            direction = Vec2(math.cos(angle), math.sin(angle))
+            get_distance = by_distance(angle)
+            distances = [get_distance(edge) for edge in active[:2]]
+            distances = [d for d in distances if d <= radius]
+            if not distances:  # No hits, use fallback point using the ray
+                return spotter_pos + direction * radius, False
+            return spotter_pos + direction * distances[-1], len(distances) == 2
+
+        starting: dict[float, list[int]] = {}
+        ending: dict[float, list[int]] = {}
+        for i, (start_angle, end_angle) in enumerate(
+            zip(start_angles.tolist(), end_angles.tolist())
+        ):
+            starting.setdefault(start_angle, []).append(i)
+            ending.setdefault(end_angle, []).append(i)
+
+        # Group vertices at the same angle, they share the same rays
+        vert_angles = Vec2Array.from_vec2s(verts).angles(spotter_pos).tolist()
+        vert_counts = Counter(vert_angles)
+        angles = sorted(vert_counts)
+
+        # Edges crossing the ray just before the first vertex
+        angle = (angles[-1] - 2 * math.pi + angles[0]) / 2
+        active = [
+            i
+            for i, (start_angle, end_angle) in enumerate(
+                zip(start_angles.tolist(), unwrapped_end_angles.tolist())
+            )
+            if start_angle < angle < end_angle
+            or start_angle < angle + 2 * math.pi < end_angle
+        ]
+        active.sort(key=by_distance(angle))
+
+        points: list[Vec2] = []
+        second_hits: list[bool] = []
+        next_angles = angles[1:] + [angles[0] + 2 * math.pi]
+        for angle, next_angle in zip(angles, next_angles):
+            before, before_hit = get_point(active, angle)
+            if ended := ending.get(angle):
+                active = [edge for edge in active if edge not in ended]
+            # Ordered just after the vertex, until the next one
+            key = by_distance((angle + next_angle) / 2)
+            distances = [key(edge) for edge in active]
+            if any(a > b for a, b in zip(distances, distances[1:])):
+                active.sort(key=key)
+            for edge in starting.get(angle, []):
+                insort(active, edge, key=key)
+            after, after_hit = get_point(active, angle)
+            points += [before, after] * vert_counts[angle]
+            second_hits += [before_hit, after_hit] * vert_counts[angle]
+        return points, second_hits
+
+    @staticmethod
+    def _cross(
+        a: NDArray[np.float64],
+        b: NDArray[np.float64],
+    ) -> NDArray[np.float64]:
+        """Element-wise 2D cross product of vector arrays."""
+        return a[..., 0] * b[..., 1] - a[..., 1] * b[..., 0]
+
     @staticmethod
     def _sort_verts_by_angle(
         spotter_pos: Vec2,
@@ -351,17 +807,9 @@ class LosSystem:
     ) -> list[Vec2]:
         """Get all terrain vertices sorted by angle."""
 
-        def angle_from_spotter(v: Vec2) -> float:
-            # Vector from spotter_pos to vertex
-            rel = v - spotter_pos
-            # Compute angle relative to +x axis (0 radians)
-            theta = math.atan2(rel.y, rel.x)
-            # Normalize to [0, 2π)
-            if theta < 0:
-                theta += 2 * math.pi
-            return theta
-
-        return sorted(verts, key=angle_from_spotter)
+        if not verts:
+            return []
+        return Vec2Array.from_vec2s(verts).sorted_by_angle(spotter_pos).to_vec2s()
 
     @staticmethod
     def _is_colinear(previous_points: list[Vec2], new_point: Vec2) -> bool:
@@ -378,36 +826,6 @@ class LosSystem:
 
         return False
 
-    @staticmethod
-    def _sort_intersects_by_distance(
-        intersects: list[_TerrainIntersection],
-        spotter_pos: Vec2,
-    ) -> list[_TerrainIntersection]:
-        """Sorts a list of intersection by distance from spotter."""
-
-        def distance_from_spotter(v: _TerrainIntersection) -> float:
-            return (v.point - spotter_pos).length()
-
-        return sorted(intersects, key=distance_from_spotter)
-
-    @staticmethod
-    def _get_terrain_intersects(
-        line: tuple[Vec2, Vec2],
-        terrains: list[_Terrain],
-    ) -> Iterable[_TerrainIntersection]:
-        """Yields unsorted intersections between the line segment and terrain."""
-        for terrain in terrains:
-            points = IntersectGetter.get_intersects(
-                line=line,
-                polyline=terrain.vertices,
-            )
-            for point in points:
-                yield _TerrainIntersection(
-                    point,
-                    terrain.terrain_feature,
-                    terrain.terrain_id,
-                )
-
     @staticmethod
     def _get_terrains(
         gs: GameState,
@@ -415,38 +833,44 @@ class LosSystem:
         mask: int = -1,
     ) -> Iterable[_Terrain]:
         """Yields only relevant terrains and its transformed vertices."""
-        for id, terrain, transform in gs.query(TerrainFeature, Transform):
-            if terrain.flag & mask:
-                vertices = LinearTransform.apply(terrain.vertices, transform)
-                if terrain.is_closed_loop:
-                    vertices.append(vertices[0])
-                    # Ignore the terrain entity if the spotter is inside it,
-                    # this allows spotter to see-out of a terrain
-                    if (
-                        IntersectGetter.is_inside(spotter_pos, vertices)
-                        # This rule doesn't apply to boundary terrain
-                        and (terrain.flag & TerrainFeature.Flag.BOUNDARY) == 0
-                    ):
-                        continue
-                yield _Terrain(id, terrain, vertices)
+        for id, terrain, geometry in TerrainSystem.get_geometries(gs, mask):
+            # Ignore the terrain entity if the spotter is inside it,
+            # this allows spotter to see-out of a terrain
+            if (
+                geometry.polygon
+                and geometry.polygon.contains(spotter_pos)
+                # This rule doesn't apply to boundary terrain
+                and (terrain.flag & TerrainFeature.Flag.BOUNDARY) == 0
+            ):
+                continue
+            yield _Terrain(id, terrain, geometry.vertices)
 
     @staticmethod
     def _get_terrain_vertices(
         terrains: list[_Terrain],
+        grid: EdgeGrid[UUID],
+        enabled: NDArray[np.bool_],
         spotter_pos: Vec2,
     ) -> list[Vec2]:
         """Get a list of sorted vertices from terrains, including intersects."""
-        verts: list[Vec2] = [vert for t in terrains for vert in t.vertices]
-
-        # TODO: this has a very bad time complexity. alternatives?
-        for terrain in terrains:
-            for other_terrain in terrains:
-                for line in pairwise(terrain.vertices):
-                    intersects = IntersectGetter.get_intersects(
-                        line=line,
-                        polyline=other_terrain.vertices,
-                    )
-                    verts += intersects
+        verts: list[Vec2] = [v for t in terrains for v in t.vertices.to_vec2s()]
+
+        # Intersect every terrain edge against every terrain in one batch
+        edges = np.empty((0, 2, 2), dtype=np.float64)
+        if terrains:
+            edges = np.concatenate(
+                [
+                    np.stack((t.vertices.array[:-1], t.vertices.array[1:]), axis=1)
+                    for t in terrains
+                ]
+            )
+        # Welds the intersects, as exact rays must pass exactly through
+        # the terrain vertices these land on
+        hits = grid.get_intersects_many(edges, enabled)
+        for i in range(len(edges)):
+            if points := hits.get_points(i):
+                welded = TerrainSystem.weld(Vec2Array.from_vec2s(points).array)
+                verts += Vec2Array(welded).to_vec2s()
 
         verts = LosSystem._sort_verts_by_angle(spotter_pos, verts)
         return verts
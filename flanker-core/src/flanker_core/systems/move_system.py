@@ -13,6 +13,7 @@ from flanker_core.models.components import (
 )
 from flanker_core.models.outcomes import FireOutcomes, InvalidAction
 from flanker_core.models.vec2 import Vec2
+from flanker_core.systems.fire_effect_system import FireEffectSystem
 from flanker_core.systems.fire_system import FireSystem
 from flanker_core.systems.initiative_system import InitiativeSystem
 from flanker_core.systems.los_system import LosSystem
@@ -64,55 +65,97 @@ class MoveSystem:
         spotter_candidates = list(
             FireSystem.get_spotter_candidates(gs, unit_id),
         )
-        interrupt_candidates: list[tuple[Vec2, list[UUID]]] = []
-
         transform = gs.get_component(unit_id, Transform)
 
-        for spotter_id in spotter_candidates:
-            interrupt_pos = LosSystem.get_los_from_line(
-                gs=gs,
-                spotter_id=spotter_id,
-                line=(transform.position, to),
-            )
-
-            # Move interrupt found, add this as a candidate
-            if interrupt_pos is not None:
-                # If this position already exists, add a the spotter
-                for existing_pos, spotters in interrupt_candidates:
-                    if existing_pos.is_close(
-                        interrupt_pos, abs_tol=_MOVE_INTERRUPT_ATOL
-                    ):
-                        spotters.append(spotter_id)
-                        break
-                else:  # Otherwise add a new candidate entry
-                    interrupt_candidates.append((interrupt_pos, [spotter_id]))
-
-        # Sort the intersection candidates based on distance from starting pos
-        interrupt_candidates = sorted(
-            interrupt_candidates,
-            key=lambda intersect: (intersect[0] - transform.position).length(),
+        # Find every spotter's interrupt in one batch, sorted by distance
+        # from the starting pos
+        interrupts = sorted(
+            (
+                (interrupt_pos, spotter_id)
+                for spotter_id, interrupt_pos in zip(
+                    spotter_candidates,
+                    LosSystem.get_los_from_line_many(
+                        gs=gs,
+                        spotter_ids=spotter_candidates,
+                        line=(transform.position, to),
+                    ),
+                )
+                if interrupt_pos is not None
+            ),
+            key=lambda interrupt: (interrupt[0] - transform.position).length(),
         )
 
+        # Merge interrupts close to the earliest of the previous candidate
+        interrupt_candidates: list[tuple[Vec2, list[UUID]]] = []
+        for interrupt_pos, spotter_id in interrupts:
+            if interrupt_candidates and interrupt_candidates[-1][0].is_close(
+                interrupt_pos, abs_tol=_MOVE_INTERRUPT_ATOL
+            ):
+                interrupt_candidates[-1][1].append(spotter_id)
+            else:
+                interrupt_candidates.append((interrupt_pos, [spotter_id]))
+
+        # Spotters of a candidate fire in the order they were found
+        for _, spotters in interrupt_candidates:
+            spotters.sort(key=spotter_candidates.index)
+
         return interrupt_candidates
 
+    @staticmethod
+    def preview_move(
+        gs: GameState,
+        unit_id: UUID,
+        to: Vec2,
+    ) -> list[tuple[Vec2, list[UUID]]] | InvalidAction:
+        """
+        Validates a move action without performing it, and returns its
+        move interrupt points and attacker IDs.
+        """
+        if (reason := MoveSystem._validate_move(gs, unit_id, to)) != True:
+            return reason
+        return MoveSystem.get_interrupt_candidates(gs, unit_id, to)
+
+    @staticmethod
+    def preview_pivot(
+        gs: GameState,
+        unit_id: UUID,
+        to: Vec2,
+    ) -> list[tuple[Vec2, list[UUID]]] | InvalidAction:
+        """
+        Validates a pivot action without performing it, and returns its
+        move interrupt points and attacker IDs.
+        """
+        move_to = MoveSystem._get_pivot_move_to(gs, unit_id, to)
+        return MoveSystem.preview_move(gs, unit_id, move_to)
+
+    @staticmethod
+    def _get_pivot_move_to(gs: GameState, unit_id: UUID, to: Vec2) -> Vec2:
+        """Returns the tiny step forward that a pivot moves towards."""
+        transform = gs.get_component(unit_id, Transform)
+        move_vector = (to - transform.position).normalized() * 1e-12
+        return transform.position + move_vector
+
     @staticmethod
     def _atomic_move(
         gs: GameState,
         unit_id: UUID,
         to: Vec2,
+        interrupt_candidates: list[tuple[Vec2, list[UUID]]] | None = None,
     ) -> MoveActionResult | InvalidAction:
         """
         Atomic move operation for a unit. Orients and moves unit
         in that direction with reactive fire. Doesn't flip initiative.
+        If the interrupt candidates are previewed, skips validation.
         """
-        if (reason := MoveSystem._validate_move(gs, unit_id, to)) != True:
-            return reason
+        if interrupt_candidates is None:
+            preview = MoveSystem.preview_move(gs, unit_id, to)
+            if isinstance(preview, InvalidAction):
+                return preview
+            interrupt_candidates = preview
 
-        transform = gs.get_component(unit_id, Transform)
+        transform = gs.get_mut_component(unit_id, Transform)
         move_direction = (to - transform.position).normalized()
 
-        interrupt_candidates = MoveSystem.get_interrupt_candidates(gs, unit_id, to)
-
         # Count stall if no possibility of reactive fires
         unit = gs.get_component(unit_id, CombatUnit)
         if len(interrupt_candidates) == 0:
@@ -122,8 +165,8 @@ class MoveSystem:
 
         # Reset fire effect if exist
         fire_controls = gs.try_component(unit_id, FireControls)
-        if fire_controls != None:
-            fire_controls.firing_at = None
+        if fire_controls != None and fire_controls.firing_at != None:
+            FireEffectSystem.set_firing_at(gs, unit_id, None)
 
         # Set orientation towards move direction
         angle_rad = math.atan2(move_direction.y, move_direction.x)
@@ -182,10 +225,14 @@ class MoveSystem:
         gs: GameState,
         unit_id: UUID,
         to: Vec2,
+        interrupt_candidates: list[tuple[Vec2, list[UUID]]] | None = None,
     ) -> MoveActionResult | InvalidAction:
-        """Performs a complete move action with reactive fire."""
+        """
+        Performs a complete move action with reactive fire. Takes the
+        interrupt candidates if previewed from this state.
+        """
 
-        result = MoveSystem._atomic_move(gs, unit_id, to)
+        result = MoveSystem._atomic_move(gs, unit_id, to, interrupt_candidates)
         if not isinstance(result, MoveActionResult):
             return result
         if result.reactive_fire_outcome in (
@@ -201,17 +248,20 @@ class MoveSystem:
         gs: GameState,
         unit_id: UUID,
         to: Vec2,
+        interrupt_candidates: list[tuple[Vec2, list[UUID]]] | None = None,
     ) -> PivotActionResult | InvalidAction:
-        """Performs a complete pivot action with reactive fire."""
+        """
+        Performs a complete pivot action with reactive fire. Takes the
+        interrupt candidates if previewed from this state.
+        """
 
-        transform = gs.get_component(unit_id, Transform)
+        transform = gs.get_mut_component(unit_id, Transform)
         initial_position = transform.position
 
         # Cheeky implementation by having it move tiny step forward;
         # the singular move handles pivoting AND reactive fire
-        move_vector = (to - transform.position).normalized() * 1e-12
-        move_to = initial_position + move_vector
-        result = MoveSystem._atomic_move(gs, unit_id, move_to)
+        move_to = MoveSystem._get_pivot_move_to(gs, unit_id, to)
+        result = MoveSystem._atomic_move(gs, unit_id, move_to, interrupt_candidates)
 
         if isinstance(result, InvalidAction):
             return result
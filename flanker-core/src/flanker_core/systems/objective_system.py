@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from uuid import UUID
 
 from flanker_core.gamestate import GameState
@@ -9,8 +10,42 @@ from flanker_core.models.components import (
 )
 
 
+@dataclass(frozen=True)
+class _WinnerCache:
+    """Singleton of the winning faction, `None` if no winner yet."""
+
+    winning_faction: InitiativeState.Faction | None
+
+
 class ObjectiveSystem:
-    """Static system class for scenario objectives"""
+    """
+    Static system class for scenario objectives. The winner is cached by the
+    counters the first time they run, and only worked out again when a
+    counter crosses its threshold, so all writes to the objective counters
+    must go through this system. Reading the winner never writes.
+    """
+
+    @staticmethod
+    def _find_winning_faction(
+        gs: GameState,
+    ) -> InitiativeState.Faction | None:
+        """Checks every objective for the winning faction."""
+        for _, objective in gs.query_one_type(EliminationWinCondition):
+            if objective.units_eliminated_counter >= objective.units_to_eliminate:
+                return objective.winning_faction
+        for _, counter in gs.query_one_type(StallLoseCondition):
+            if counter.stall_count > counter.stall_limit:
+                return counter.winning_faction
+
+    @staticmethod
+    def _update_winner(gs: GameState, crossed: bool) -> None:
+        """
+        Works out the winner again once a counter crosses its threshold, or
+        caches it if this state has none yet (e.g. just loaded).
+        """
+        if crossed or gs.try_singleton(_WinnerCache) is None:
+            winning_faction = ObjectiveSystem._find_winning_faction(gs)
+            gs.set_singleton(_WinnerCache(winning_faction))
 
     @staticmethod
     def count_kill(
@@ -19,22 +54,25 @@ class ObjectiveSystem:
     ) -> None:
         """Count a killed unit towards Elimination Objective."""
         unit = gs.get_component(unit_destroyed_id, CombatUnit)
-        for _, objective in gs.query(EliminationWinCondition):
+        crossed = False
+        for entity_id, objective in gs.query(EliminationWinCondition):
             if objective.target_faction != unit.faction:
                 continue
+            objective = gs.get_mut_component(entity_id, EliminationWinCondition)
             objective.units_eliminated_counter += 1
+            if objective.units_eliminated_counter == objective.units_to_eliminate:
+                crossed = True
+        ObjectiveSystem._update_winner(gs, crossed)
 
     @staticmethod
     def get_winning_faction(
         gs: GameState,
     ) -> InitiativeState.Faction | None:
         """Get the winning faction, `None` if no winner yet."""
-        for _, objective in gs.query(EliminationWinCondition):
-            if objective.units_eliminated_counter >= objective.units_to_eliminate:
-                return objective.winning_faction
-        for _, counter in gs.query(StallLoseCondition):
-            if counter.stall_count > counter.stall_limit:
-                return counter.winning_faction
+        if cache := gs.try_singleton(_WinnerCache):
+            return cache.winning_faction
+        # No counter has run on this state yet, so work it out
+        return ObjectiveSystem._find_winning_faction(gs)
 
     @staticmethod
     def count_stall(
@@ -42,9 +80,14 @@ class ObjectiveSystem:
         faction: InitiativeState.Faction,
     ) -> None:
         """Count up the number of stalling moves for the given faction."""
-        for _, counter in gs.query(StallLoseCondition):
+        crossed = False
+        for entity_id, counter in gs.query(StallLoseCondition):
             if counter.counting_faction == faction:
+                counter = gs.get_mut_component(entity_id, StallLoseCondition)
                 counter.stall_count += 1
+                if counter.stall_count == counter.stall_limit + 1:
+                    crossed = True
+        ObjectiveSystem._update_winner(gs, crossed)
 
     @staticmethod
     def reset_stall(
@@ -52,6 +95,10 @@ class ObjectiveSystem:
         faction: InitiativeState.Faction,
     ) -> None:
         """Resets the number of stalling moves for the given faction."""
-        for _, counter in gs.query(StallLoseCondition):
-            if counter.counting_faction == faction:
+        crossed = False
+        for entity_id, counter in gs.query(StallLoseCondition):
+            if counter.counting_faction == faction and counter.stall_count != 0:
+                counter = gs.get_mut_component(entity_id, StallLoseCondition)
+                crossed |= counter.stall_count > counter.stall_limit
                 counter.stall_count = 0
+        ObjectiveSystem._update_winner(gs, crossed)
@@ -1,12 +1,21 @@
 from dataclasses import dataclass
-from typing import Iterable
+from typing import Any, Iterable
 from uuid import UUID
 
+import numpy as np
 from flanker_core.gamestate import GameState
 from flanker_core.models.components import TerrainFeature, Transform
 from flanker_core.models.vec2 import Vec2
-from flanker_core.utils.intersect_getter import IntersectGetter
+from flanker_core.models.vec2_array import Vec2Array
+from flanker_core.utils.edge_grid import EdgeGrid
 from flanker_core.utils.linear_transform import LinearTransform
+from flanker_core.utils.lru_cache import LruCache
+from flanker_core.utils.prepared_polygon import PreparedPolygon
+from numpy.typing import NDArray
+
+# World-space vertices are rounded to this many decimals, welding vertices
+# shared by neighbouring terrains that the transform left an ulp apart
+_WELD_DECIMALS = 9
 
 
 @dataclass
@@ -17,9 +26,167 @@ class Intersection:
     terrain_id: UUID
 
 
+@dataclass(frozen=True)
+class TerrainGeometry:
+    """
+    World-space geometry of a terrain feature. Vertices of a closed loop
+    terrain repeat the first vertex at the end. Must not be mutated.
+    """
+
+    vertices: Vec2Array
+    bbox: tuple[float, float, float, float]  # min x, min y, max x, max y
+    edge_starts: NDArray[np.float64]
+    edge_ends: NDArray[np.float64]
+    polygon: PreparedPolygon | None  # Only for closed loop terrains
+    digest: int  # Hash of the vertices, equal for equal geometries
+
+
+@dataclass(frozen=True)
+class _TerrainLayout:
+    """Every terrain of a game state at one terrain version."""
+
+    # Terrain & its geometry by terrain ID, in query order
+    terrains: dict[UUID, tuple[TerrainFeature, TerrainGeometry]]
+
+
+# Memos shared by every game state, so forks & copies on the same map share
+# them too. Nothing in them is mutated once stored. Geometries are keyed on
+# the terrain & transform contents they're computed from
+_GEOMETRY_CACHE = LruCache[tuple[Any, ...], TerrainGeometry](4096)
+
+# The rest are keyed on the terrain version (& flag mask). Versions are unique
+# across game states, so a hit is always for the same terrain layout
+_LAYOUT_CACHE = LruCache[int, _TerrainLayout](256)
+_TERRAIN_KEY_CACHE = LruCache[tuple[int, int], int](1024)
+_EDGE_GRID_CACHE = LruCache[tuple[int, int], EdgeGrid[UUID]](64)
+
+
 class TerrainSystem:
     """ECS system for finding line and terrain feature intersections."""
 
+    @staticmethod
+    def get_geometry(gs: GameState, terrain_id: UUID) -> TerrainGeometry:
+        """Gets the cached world-space geometry of a terrain entity."""
+        entry = TerrainSystem._get_layout(gs).terrains.get(terrain_id)
+        if entry is None:
+            raise KeyError(f"terrain {terrain_id=} doesn't exist.")
+        return entry[1]
+
+    @staticmethod
+    def weld(array: NDArray[np.float64]) -> NDArray[np.float64]:
+        """
+        Rounds world-space coordinates the way terrain vertices are, so that
+        points constructed on terrain vertices land exactly on them.
+        """
+        return np.round(array, _WELD_DECIMALS)
+
+    @staticmethod
+    def invalidate_geometry(gs: GameState, terrain_id: UUID) -> None:
+        """
+        Marks a terrain as changed, for terrains mutated in place rather than
+        straight after `get_mut_component`. Deleted terrains need nothing.
+        """
+        if gs.try_component(terrain_id, TerrainFeature) is not None:
+            gs.get_mut_component(terrain_id, TerrainFeature)
+
+    @staticmethod
+    def _get_layout(gs: GameState) -> _TerrainLayout:
+        """Gets the terrains and their geometry at the current terrain version."""
+        version = gs.get_version(TerrainFeature)
+        if (layout := _LAYOUT_CACHE.get(version)) is None:
+            layout = _TerrainLayout(
+                {
+                    id: (terrain, TerrainSystem._get_geometry(terrain, transform))
+                    for id, terrain, transform in gs.query(TerrainFeature, Transform)
+                }
+            )
+            _LAYOUT_CACHE.set(version, layout)
+        return layout
+
+    @staticmethod
+    def _get_geometry(terrain: TerrainFeature, transform: Transform) -> TerrainGeometry:
+        """Gets the geometry of a terrain, computing it if not seen yet."""
+        key = (
+            transform.position,
+            transform.degrees,
+            terrain.is_closed_loop,
+            tuple(terrain.vertices),
+        )
+        if (geometry := _GEOMETRY_CACHE.get(key)) is not None:
+            return geometry
+
+        vertices = LinearTransform.apply_array(
+            Vec2Array.from_vec2s(terrain.vertices),
+            transform,
+        )
+        vertices = Vec2Array(TerrainSystem.weld(vertices.array))
+        if terrain.is_closed_loop:
+            vertices = vertices.closed()
+        array = vertices.array
+        min_x, min_y = array.min(axis=0).tolist() if len(array) else (0.0, 0.0)
+        max_x, max_y = array.max(axis=0).tolist() if len(array) else (0.0, 0.0)
+        geometry = TerrainGeometry(
+            vertices=vertices,
+            bbox=(min_x, min_y, max_x, max_y),
+            edge_starts=array[:-1],
+            edge_ends=array[1:],
+            polygon=(
+                PreparedPolygon(vertices)
+                if terrain.is_closed_loop and len(vertices) > 3
+                else None
+            ),
+            digest=hash(array.tobytes()),
+        )
+        _GEOMETRY_CACHE.set(key, geometry)
+        return geometry
+
+    @staticmethod
+    def get_geometries(
+        gs: GameState,
+        mask: int = -1,
+    ) -> Iterable[tuple[UUID, TerrainFeature, TerrainGeometry]]:
+        """Yields the terrains matching the flag mask and their geometry."""
+        for id, (terrain, geometry) in TerrainSystem._get_layout(gs).terrains.items():
+            if terrain.flag & mask:
+                yield id, terrain, geometry
+
+    @staticmethod
+    def get_terrain_key(gs: GameState, mask: int = -1) -> int:
+        """
+        Hashes the flags and geometries of terrains matching the flag mask.
+        Game states with the same terrain layout share the key, so results
+        derived from terrain alone can be cached across them.
+        """
+        cache_key = (gs.get_version(TerrainFeature), mask)
+        if (key := _TERRAIN_KEY_CACHE.get(cache_key)) is None:
+            key = hash(
+                tuple(
+                    sorted(
+                        (terrain.flag, geometry.digest)
+                        for _, terrain, geometry in TerrainSystem.get_geometries(
+                            gs, mask
+                        )
+                    )
+                )
+            )
+            _TERRAIN_KEY_CACHE.set(cache_key, key)
+        return key
+
+    @staticmethod
+    def get_edge_grid(gs: GameState, mask: int = -1) -> EdgeGrid[UUID]:
+        """
+        Gets the spatial index over edges of terrains matching the flag mask,
+        keyed by terrain ID. Shared by every state on the same terrain version,
+        so it must not be changed.
+        """
+        cache_key = (gs.get_version(TerrainFeature), mask)
+        if (grid := _EDGE_GRID_CACHE.get(cache_key)) is None:
+            grid = EdgeGrid[UUID]()
+            for id, _, geometry in TerrainSystem.get_geometries(gs, mask):
+                grid.set_polyline(id, geometry.vertices)
+            _EDGE_GRID_CACHE.set(cache_key, grid)
+        return grid
+
     @staticmethod
     def get_intersect(
         gs: GameState, start: Vec2, end: Vec2, mask: int = -1
@@ -29,23 +196,20 @@ class TerrainSystem:
         The intersections are arbitrary and is not sorted.
         """
 
+        grid = TerrainSystem.get_edge_grid(gs, mask)
+        hits = grid.get_intersects_many(
+            np.array([[[start.x, start.y], [end.x, end.y]]], dtype=np.float64),
+        )
+        _, hit_terrains = hits.get(0)
+        terrain_ids = grid.keys
         all_intersections: list[Intersection] = []
-        for id, terrain, transform in gs.query(TerrainFeature, Transform):
-            if (terrain.flag & mask) == 0:
-                continue
-            vertices = LinearTransform.apply(terrain.vertices, transform)
-            if terrain.is_closed_loop:
-                vertices.append(vertices[0])
-            intersections = IntersectGetter.get_intersects(
-                line=(start, end),
-                polyline=vertices,
-            )
-            for _ in intersections:
-                all_intersections.append(
-                    Intersection(
-                        terrain=terrain,
-                        terrain_id=id,
-                    )
+        for index in hit_terrains.tolist():
+            id = terrain_ids[index]
+            all_intersections.append(
+                Intersection(
+                    terrain=gs.get_component(id, TerrainFeature),
+                    terrain_id=id,
                 )
+            )
 
         return all_intersections
@@ -0,0 +1,102 @@
+from copy import deepcopy
+from dataclasses import fields, is_dataclass
+from enum import Enum
+from types import FunctionType, MethodType, NoneType
+from typing import Any, Callable
+from uuid import UUID
+
+
+def _share(value: Any) -> Any:
+    return value
+
+
+def _clone_list(value: list[Any]) -> list[Any]:
+    clone = ComponentCloner.clone
+    return [clone(v) for v in value]
+
+
+def _clone_dict(value: dict[Any, Any]) -> dict[Any, Any]:
+    clone = ComponentCloner.clone
+    return {k: clone(v) for k, v in value.items()}
+
+
+def _clone_set(value: set[Any]) -> set[Any]:
+    clone = ComponentCloner.clone
+    return {clone(v) for v in value}
+
+
+class ComponentCloner:
+    """
+    Clones components structurally. Immutable values (scalars, enums, UUIDs,
+    tuples, frozen dataclasses such as `Vec2`) are shared, and only mutable
+    containers and dataclasses are cloned. Components that need different
+    handling, e.g. caches, can register their own clone method.
+    """
+
+    # Clone method by exact type; filled lazily for types not listed here
+    _methods: dict[type, Callable[[Any], Any]] = {
+        NoneType: _share,
+        bool: _share,
+        int: _share,
+        float: _share,
+        complex: _share,
+        str: _share,
+        bytes: _share,
+        tuple: _share,
+        frozenset: _share,
+        UUID: _share,
+        FunctionType: _share,
+        MethodType: _share,
+        list: _clone_list,
+        dict: _clone_dict,
+        set: _clone_set,
+    }
+
+    @staticmethod
+    def register[T](component_type: type[T], method: Callable[[T], T]) -> None:
+        """Registers a clone method used for the given component type."""
+        ComponentCloner._methods[component_type] = method
+
+    @staticmethod
+    def register_shared(component_type: type) -> None:
+        """Registers a component type that is shared instead of cloned."""
+        ComponentCloner._methods[component_type] = _share
+
+    @staticmethod
+    def clone[T](value: T) -> T:
+        """Returns a clone of the value that shares its immutable parts."""
+        method = ComponentCloner._methods.get(type(value))
+        if method is None:
+            method = ComponentCloner._get_method(type(value))
+        return method(value)
+
+    @staticmethod
+    def _get_method(value_type: type) -> Callable[[Any], Any]:
+        """Builds and registers the clone method for an unseen type."""
+        method: Callable[[Any], Any]
+        if issubclass(value_type, (Enum, tuple, frozenset)):
+            method = _share
+        elif is_dataclass(value_type):
+            if value_type.__dataclass_params__.frozen:  # type: ignore
+                method = _share
+            else:
+                method = ComponentCloner._get_dataclass_method(value_type)
+        else:  # Unknown type, fall back to a deep copy
+            method = deepcopy
+        ComponentCloner._methods[value_type] = method
+        return method
+
+    @staticmethod
+    def _get_dataclass_method(value_type: type) -> Callable[[Any], Any]:
+        """Builds a clone method that clones a dataclass field by field."""
+        names = tuple(f.name for f in fields(value_type))
+        new = object.__new__
+        clone = ComponentCloner.clone
+
+        def clone_dataclass(value: Any) -> Any:
+            new_value = new(value_type)
+            for name in names:
+                object.__setattr__(new_value, name, clone(getattr(value, name)))
+            return new_value
+
+        return clone_dataclass
@@ -0,0 +1,571 @@
+import math
+from typing import Hashable
+
+import numpy as np
+from flanker_core.models.vec2_array import Vec2Array
+from flanker_core.utils.intersect_getter import (
+    LineHits,
+    _njit_intersect_edge,
+    _njit_sort_line_hits,
+)
+from flanker_core.utils.robust_predicates import orient2d
+from numba import njit  # type: ignore
+from numpy.typing import NDArray
+
+# Upper bound of cells along each axis, keeps the index small on sparse maps
+_MAX_CELLS_PER_AXIS = 256
+
+
+class EdgeGrid[K: Hashable]:
+    """
+    Uniform grid spatial index of polyline edges for segment queries.
+    Polylines are keyed and can be set or removed one at a time, which only
+    re-bins the edges of that polyline. The flat index is rebuilt lazily on
+    the next query. Hit polyline indices follow the order of `keys`.
+    """
+
+    def __init__(self, cell_size: float | None = None) -> None:
+        self._cell_size = cell_size
+        self._polylines: dict[K, NDArray[np.float64]] = {}
+        # Per polyline (cell, edge) pairs, edge is local to the polyline
+        self._bins: dict[K, tuple[NDArray[np.int64], NDArray[np.int64]]] = {}
+        self._bounds: tuple[float, float, float, float] | None = None
+        self._shape = (0, 0)
+        self._index: tuple[NDArray[np.float64], ...] | None = None
+
+    def __len__(self) -> int:
+        return len(self._polylines)
+
+    @property
+    def keys(self) -> list[K]:
+        """Keys of the polylines, in the order used by hit indices."""
+        return list(self._polylines)
+
+    def get_polyline(self, key: K) -> Vec2Array:
+        """Gets the vertices of a polyline."""
+        return Vec2Array(self._polylines[key])
+
+    def set_polyline(self, key: K, polyline: Vec2Array) -> None:
+        """Adds or replaces a polyline, re-binning only its edges."""
+        self._polylines[key] = polyline.array
+        self._index = None
+        if self._bounds is None or not self._contains(polyline.array):
+            self._bounds = None  # Grid no longer fits, re-bin everything
+            self._bins.clear()
+            return
+        self._bins[key] = self._bin(polyline.array)
+
+    def remove_polyline(self, key: K) -> None:
+        """Removes a polyline if it exists."""
+        if self._polylines.pop(key, None) is not None:
+            self._bins.pop(key, None)
+            self._index = None
+
+    def get_intersects_many(
+        self,
+        lines: NDArray[np.float64],
+        enabled: NDArray[np.bool_] | None = None,
+    ) -> LineHits:
+        """
+        Intersects a `(L, 2, 2)` batch of line segments against the indexed
+        polylines, visiting only the edges in cells each line crosses.
+        Polylines whose `enabled` flag is false are ignored. Results match
+        `IntersectGetter.get_intersects_many` on the same polylines.
+        """
+        lines = np.ascontiguousarray(lines, dtype=np.float64).reshape(-1, 2, 2)
+        if enabled is None:
+            enabled = np.ones(len(self._polylines), dtype=np.bool_)
+        edge_starts, edge_ends, edge_polyline, cell_offsets, cell_edges = (
+            self._get_index()
+        )
+        assert self._bounds is not None
+        t, polyline, offsets = EdgeGrid._njit_get_intersects_many(
+            lines,
+            edge_starts,
+            edge_ends,
+            edge_polyline,
+            cell_offsets,
+            cell_edges,
+            enabled,
+            self._bounds[0],
+            self._bounds[1],
+            self._get_cell_size(),
+            self._shape[0],
+            self._shape[1],
+        )
+        return LineHits(lines, t, polyline, offsets)
+
+    def get_side_hits(
+        self,
+        lines: NDArray[np.float64],
+        t_max: NDArray[np.float64],
+        enabled: NDArray[np.bool_] | None = None,
+    ) -> tuple[LineHits, NDArray[np.int8]]:
+        """
+        Casts a `(L, 2, 2)` batch of rays, each from its first point through
+        its second, up to `t_max` times that length. Finds every edge
+        touching a ray using exact predicates, including edges that only
+        touch it at a vertex. Returns the hits sorted by `t`, and which
+        side of the ray each hit edge extends to: 1 for right, 2 for left,
+        3 for both. Edges lying along a ray are not hits.
+        """
+        lines = np.ascontiguousarray(lines, dtype=np.float64).reshape(-1, 2, 2)
+        if enabled is None:
+            enabled = np.ones(len(self._polylines), dtype=np.bool_)
+        edge_starts, edge_ends, edge_polyline, cell_offsets, cell_edges = (
+            self._get_index()
+        )
+        assert self._bounds is not None
+        t, polyline, sides, offsets = EdgeGrid._njit_get_side_hits(
+            lines,
+            np.ascontiguousarray(t_max, dtype=np.float64),
+            edge_starts,
+            edge_ends,
+            edge_polyline,
+            cell_offsets,
+            cell_edges,
+            enabled,
+            self._bounds[0],
+            self._bounds[1],
+            self._get_cell_size(),
+            self._shape[0],
+            self._shape[1],
+        )
+        return LineHits(lines, t, polyline, offsets), sides
+
+    def _get_cell_size(self) -> float:
+        """Gets the cell size, fixed once the grid bounds are set."""
+        assert self._cell_size is not None
+        return self._cell_size
+
+    def _contains(self, array: NDArray[np.float64]) -> bool:
+        """Returns whether the vertices lie within the grid bounds."""
+        assert self._bounds is not None
+        if len(array) == 0:
+            return True
+        min_x, min_y, max_x, max_y = self._bounds
+        return bool(
+            array[:, 0].min() >= min_x
+            and array[:, 1].min() >= min_y
+            and array[:, 0].max() <= max_x
+            and array[:, 1].max() <= max_y
+        )
+
+    def _bin(self, array: NDArray[np.float64]) -> tuple[NDArray[np.int64], ...]:
+        """Bins the edges of a polyline into the cells of its bounding box."""
+        assert self._bounds is not None
+        if len(array) < 2:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+        return EdgeGrid._njit_bin_edges(
+            array[:-1],
+            array[1:],
+            self._bounds[0],
+            self._bounds[1],
+            self._get_cell_size(),
+            self._shape[0],
+            self._shape[1],
+        )
+
+    def _fit_bounds(self) -> None:
+        """Sizes the grid over all polylines and re-bins every edge."""
+        arrays = [a for a in self._polylines.values() if len(a) >= 2]
+        if not arrays:
+            self._bounds = (0.0, 0.0, 1.0, 1.0)
+            self._cell_size = self._cell_size or 1.0
+            self._shape = (1, 1)
+            return
+
+        vertices = np.concatenate(arrays)
+        min_x, min_y = vertices.min(axis=0).tolist()
+        max_x, max_y = vertices.max(axis=0).tolist()
+        extent = max(max_x - min_x, max_y - min_y, 1e-9)
+        if self._cell_size is None:
+            # Aim for cells about the size of an average edge
+            lengths = np.concatenate(
+                [Vec2Array(np.diff(a, axis=0)).lengths() for a in arrays]
+            )
+            self._cell_size = max(
+                float(lengths.mean()),
+                extent / _MAX_CELLS_PER_AXIS,
+            )
+        nx = min(
+            math.floor((max_x - min_x) / self._cell_size) + 1,
+            _MAX_CELLS_PER_AXIS,
+        )
+        ny = min(
+            math.floor((max_y - min_y) / self._cell_size) + 1,
+            _MAX_CELLS_PER_AXIS,
+        )
+        self._cell_size = max(
+            self._cell_size,
+            (max_x - min_x) / nx * (1 + 1e-9),
+            (max_y - min_y) / ny * (1 + 1e-9),
+        )
+        self._bounds = (min_x, min_y, max_x, max_y)
+        self._shape = (nx, ny)
+        self._bins = {key: self._bin(a) for key, a in self._polylines.items()}
+
+    def _get_index(self) -> tuple[NDArray[np.float64], ...]:
+        """Gets the flat index, rebuilding it from the per polyline bins."""
+        if self._index is not None:
+            return self._index
+        if self._bounds is None:
+            self._fit_bounds()
+
+        # Number the edges of every polyline consecutively
+        edge_starts: list[NDArray[np.float64]] = [np.empty((0, 2))]
+        edge_ends: list[NDArray[np.float64]] = [np.empty((0, 2))]
+        edge_polyline: list[NDArray[np.int64]] = [np.empty(0, dtype=np.int64)]
+        cells: list[NDArray[np.int64]] = [np.empty(0, dtype=np.int64)]
+        edges: list[NDArray[np.int64]] = [np.empty(0, dtype=np.int64)]
+        edge_count = 0
+        for i, (key, array) in enumerate(self._polylines.items()):
+            n_edges = max(len(array) - 1, 0)
+            edge_starts.append(array[:n_edges])
+            edge_ends.append(array[1 : n_edges + 1])
+            edge_polyline.append(np.full(n_edges, i, dtype=np.int64))
+            polyline_cells, polyline_edges = self._bins[key]
+            cells.append(polyline_cells)
+            edges.append(polyline_edges + edge_count)
+            edge_count += n_edges
+
+        # Group the binned edges by cell into offsets and a flat edge list
+        all_cells = np.concatenate(cells)
+        order = np.argsort(all_cells, kind="stable")
+        cell_offsets = np.zeros(self._shape[0] * self._shape[1] + 1, dtype=np.int64)
+        np.cumsum(
+            np.bincount(all_cells, minlength=len(cell_offsets) - 1),
+            out=cell_offsets[1:],
+        )
+        self._index = (
+            np.concatenate(edge_starts),
+            np.concatenate(edge_ends),
+            np.concatenate(edge_polyline),
+            cell_offsets,
+            np.concatenate(edges)[order],
+        )
+        return self._index
+
+    @staticmethod
+    @njit  # type: ignore
+    def _njit_bin_edges(
+        edge_starts: NDArray[np.float64],
+        edge_ends: NDArray[np.float64],
+        origin_x: float,
+        origin_y: float,
+        cell_size: float,
+        nx: int,
+        ny: int,
+    ) -> tuple[NDArray[np.int64], NDArray[np.int64]]:
+        """
+        Private binning for `EdgeGrid`. Bins each edge into every cell its
+        bounding box overlaps. Returns the (cell, edge) pairs.
+        """
+        n_edges = edge_starts.shape[0]
+        ranges = np.empty((n_edges, 4), dtype=np.int64)
+        total = 0
+        for e in range(n_edges):
+            x0 = min(edge_starts[e, 0], edge_ends[e, 0])
+            x1 = max(edge_starts[e, 0], edge_ends[e, 0])
+            y0 = min(edge_starts[e, 1], edge_ends[e, 1])
+            y1 = max(edge_starts[e, 1], edge_ends[e, 1])
+            ranges[e, 0] = max(int(math.floor((x0 - origin_x) / cell_size)), 0)
+            ranges[e, 1] = min(int(math.floor((x1 - origin_x) / cell_size)), nx - 1)
+            ranges[e, 2] = max(int(math.floor((y0 - origin_y) / cell_size)), 0)
+            ranges[e, 3] = min(int(math.floor((y1 - origin_y) / cell_size)), ny - 1)
+            total += (ranges[e, 1] - ranges[e, 0] + 1) * (
+                ranges[e, 3] - ranges[e, 2] + 1
+            )
+
+        cells = np.empty(total, dtype=np.int64)
+        edges = np.empty(total, dtype=np.int64)
+        k = 0
+        for e in range(n_edges):
+            for cy in range(ranges[e, 2], ranges[e, 3] + 1):
+                for cx in range(ranges[e, 0], ranges[e, 1] + 1):
+                    cells[k] = cy * nx + cx
+                    edges[k] = e
+                    k += 1
+        return cells, edges
+
+    @staticmethod
+    @njit  # type: ignore
+    def _njit_get_intersects_many(
+        lines: NDArray[np.float64],
+        edge_starts: NDArray[np.float64],
+        edge_ends: NDArray[np.float64],
+        edge_polyline: NDArray[np.int64],
+        cell_offsets: NDArray[np.int64],
+        cell_edges: NDArray[np.int64],
+        enabled: NDArray[np.bool_],
+        origin_x: float,
+        origin_y: float,
+        cell_size: float,
+        nx: int,
+        ny: int,
+    ) -> tuple[NDArray[np.float64], NDArray[np.int64], NDArray[np.int64]]:
+        """
+        Private optimized intersect getter for `get_intersects_many`.
+        Tests each candidate edge of a line once. Returns the same arrays
+        as `IntersectGetter._njit_get_intersects_many`.
+        """
+        n_lines = lines.shape[0]
+        hit_t = np.empty(max(16, 2 * n_lines), dtype=np.float64)
+        hit_polyline = np.empty(hit_t.shape[0], dtype=np.int64)
+        line_offsets = np.zeros(n_lines + 1, dtype=np.int64)
+        visited = np.full(edge_starts.shape[0], -1, dtype=np.int64)
+        candidates = np.empty(64, dtype=np.int64)
+        n_hits = 0
+
+        for i in range(n_lines):
+            start_x, start_y = lines[i, 0, 0], lines[i, 0, 1]
+            vector_x = lines[i, 1, 0] - start_x
+            vector_y = lines[i, 1, 1] - start_y
+            line_start = n_hits
+            candidates, n_candidates = _njit_get_candidates(
+                start_x,
+                start_y,
+                lines[i, 1, 0],
+                lines[i, 1, 1],
+                i,
+                visited,
+                candidates,
+                cell_offsets,
+                cell_edges,
+                origin_x,
+                origin_y,
+                cell_size,
+                nx,
+                ny,
+            )
+            for k in range(n_candidates):
+                e = candidates[k]
+                if not enabled[edge_polyline[e]]:
+                    continue
+                t = _njit_intersect_edge(
+                    start_x,
+                    start_y,
+                    vector_x,
+                    vector_y,
+                    edge_starts[e],
+                    edge_ends[e],
+                )
+                if np.isnan(t):
+                    continue
+                if n_hits == hit_t.shape[0]:  # Grow the buffers
+                    hit_t = np.concatenate((hit_t, np.empty_like(hit_t)))
+                    hit_polyline = np.concatenate(
+                        (hit_polyline, np.empty_like(hit_polyline))
+                    )
+                hit_t[n_hits] = t
+                hit_polyline[n_hits] = edge_polyline[e]
+                n_hits += 1
+
+            n_hits = _njit_sort_line_hits(hit_t, hit_polyline, line_start, n_hits)
+            line_offsets[i + 1] = n_hits
+
+        return hit_t[:n_hits].copy(), hit_polyline[:n_hits].copy(), line_offsets
+
+    @staticmethod
+    @njit  # type: ignore
+    def _njit_get_side_hits(
+        lines: NDArray[np.float64],
+        t_max: NDArray[np.float64],
+        edge_starts: NDArray[np.float64],
+        edge_ends: NDArray[np.float64],
+        edge_polyline: NDArray[np.int64],
+        cell_offsets: NDArray[np.int64],
+        cell_edges: NDArray[np.int64],
+        enabled: NDArray[np.bool_],
+        origin_x: float,
+        origin_y: float,
+        cell_size: float,
+        nx: int,
+        ny: int,
+    ) -> tuple[
+        NDArray[np.float64],
+        NDArray[np.int64],
+        NDArray[np.int8],
+        NDArray[np.int64],
+    ]:
+        """
+        Private exact ray caster for `get_side_hits`. Uses exact orientation
+        tests to find the edges touching each ray and which sides they extend
+        to, so a ray through a vertex is resolved without jitter. Returns the
+        hit `t`, hit polyline, hit sides, and per-line hit offsets.
+        """
+        n_lines = lines.shape[0]
+        hit_t = np.empty(max(16, 2 * n_lines), dtype=np.float64)
+        hit_polyline = np.empty(hit_t.shape[0], dtype=np.int64)
+        hit_side = np.empty(hit_t.shape[0], dtype=np.int8)
+        line_offsets = np.zeros(n_lines + 1, dtype=np.int64)
+        visited = np.full(edge_starts.shape[0], -1, dtype=np.int64)
+        candidates = np.empty(64, dtype=np.int64)
+        n_hits = 0
+
+        for i in range(n_lines):
+            start_x, start_y = lines[i, 0, 0], lines[i, 0, 1]
+            through_x, through_y = lines[i, 1, 0], lines[i, 1, 1]
+            vector_x = through_x - start_x
+            vector_y = through_y - start_y
+            line_start = n_hits
+            candidates, n_candidates = _njit_get_candidates(
+                start_x,
+                start_y,
+                start_x + vector_x * t_max[i],
+                start_y + vector_y * t_max[i],
+                i,
+                visited,
+                candidates,
+                cell_offsets,
+                cell_edges,
+                origin_x,
+                origin_y,
+                cell_size,
+                nx,
+                ny,
+            )
+            for k in range(n_candidates):
+                e = candidates[k]
+                if not enabled[edge_polyline[e]]:
+                    continue
+                # Which side of the ray each edge vertex lies on, exactly
+                side_start = orient2d(
+                    start_x,
+                    start_y,
+                    through_x,
+                    through_y,
+                    edge_starts[e, 0],
+                    edge_starts[e, 1],
+                )
+                side_end = orient2d(
+                    start_x,
+                    start_y,
+                    through_x,
+                    through_y,
+                    edge_ends[e, 0],
+                    edge_ends[e, 1],
+                )
+                if (side_start > 0 and side_end > 0) or (
+                    side_start < 0 and side_end < 0
+                ):
+                    continue  # Edge lies on one side
+                if side_start == 0 and side_end == 0:
+                    continue  # Edge lies along the ray, it can't block it
+
+                # Where along the ray, a vertex on the ray is taken as is
+                if side_start == 0 or side_end == 0:
+                    point = edge_starts[e] if side_start == 0 else edge_ends[e]
+                    t = (
+                        (point[0] - start_x) * vector_x
+                        + (point[1] - start_y) * vector_y
+                    ) / (vector_x * vector_x + vector_y * vector_y)
+                else:
+                    edge_x = edge_ends[e, 0] - edge_starts[e, 0]
+                    edge_y = edge_ends[e, 1] - edge_starts[e, 1]
+                    q1_p1_x = edge_starts[e, 0] - start_x
+                    q1_p1_y = edge_starts[e, 1] - start_y
+                    t = (q1_p1_x * edge_y - q1_p1_y * edge_x) / (
+                        vector_x * edge_y - vector_y * edge_x
+                    )
+                if t < 0 or t > t_max[i]:
+                    continue
+
+                if n_hits == hit_t.shape[0]:  # Grow the buffers
+                    hit_t = np.concatenate((hit_t, np.empty_like(hit_t)))
+                    hit_polyline = np.concatenate(
+                        (hit_polyline, np.empty_like(hit_polyline))
+                    )
+                    hit_side = np.concatenate((hit_side, np.empty_like(hit_side)))
+                hit_t[n_hits] = t
+                hit_polyline[n_hits] = edge_polyline[e]
+                # Right side is 1, left side is 2, crossing is both
+                hit_side[n_hits] = (1 if min(side_start, side_end) < 0 else 0) + (
+                    2 if max(side_start, side_end) > 0 else 0
+                )
+                n_hits += 1
+
+            # Sort by t, every edge counts as its own hit
+            order = np.argsort(hit_t[line_start:n_hits], kind="mergesort")
+            hit_t[line_start:n_hits] = hit_t[line_start:n_hits][order]
+            hit_polyline[line_start:n_hits] = hit_polyline[line_start:n_hits][order]
+            hit_side[line_start:n_hits] = hit_side[line_start:n_hits][order]
+            line_offsets[i + 1] = n_hits
+
+        return (
+            hit_t[:n_hits].copy(),
+            hit_polyline[:n_hits].copy(),
+            hit_side[:n_hits].copy(),
+            line_offsets,
+        )
+
+
+@njit  # type: ignore
+def _njit_get_candidates(
+    start_x: float,
+    start_y: float,
+    end_x: float,
+    end_y: float,
+    stamp: int,
+    visited: NDArray[np.int64],
+    candidates: NDArray[np.int64],
+    cell_offsets: NDArray[np.int64],
+    cell_edges: NDArray[np.int64],
+    origin_x: float,
+    origin_y: float,
+    cell_size: float,
+    nx: int,
+    ny: int,
+) -> tuple[NDArray[np.int64], int]:
+    """
+    Collects the edges in cells a line segment crosses, once each, marking
+    them `visited` with `stamp`. Walks the cells along the major axis of the
+    line, taking the span of the other axis within each slab (padded so no
+    cell is missed). Returns the (possibly grown) buffer and the count.
+    """
+    n_candidates = 0
+    padding = cell_size * 1e-6
+    vector_x = end_x - start_x
+    vector_y = end_y - start_y
+
+    # Work in grid coordinates, swapping axes so x is the major axis
+    swap = abs(vector_y) > abs(vector_x)
+    a0 = (start_y - origin_y) if swap else (start_x - origin_x)
+    b0 = (start_x - origin_x) if swap else (start_y - origin_y)
+    da = vector_y if swap else vector_x
+    db = vector_x if swap else vector_y
+    n_major = ny if swap else nx
+    n_minor = nx if swap else ny
+    lo = min(a0, a0 + da)
+    hi = max(a0, a0 + da)
+    first = max(int(math.floor((lo - padding) / cell_size)), 0)
+    last = min(int(math.floor((hi + padding) / cell_size)), n_major - 1)
+
+    for major in range(first, last + 1):
+        # Span of the minor axis while the line is within this slab
+        slab_lo = max(lo, major * cell_size)
+        slab_hi = min(hi, (major + 1) * cell_size)
+        if da != 0:
+            b_lo = b0 + (slab_lo - a0) / da * db
+            b_hi = b0 + (slab_hi - a0) / da * db
+        else:
+            b_lo = b0
+            b_hi = b0 + db
+        minor_lo = min(b_lo, b_hi) - padding
+        minor_hi = max(b_lo, b_hi) + padding
+        minor_first = max(int(math.floor(minor_lo / cell_size)), 0)
+        minor_last = min(int(math.floor(minor_hi / cell_size)), n_minor - 1)
+
+        for minor in range(minor_first, minor_last + 1):
+            cell = major * nx + minor if swap else minor * nx + major
+            for k in range(cell_offsets[cell], cell_offsets[cell + 1]):
+                e = cell_edges[k]
+                if visited[e] == stamp:
+                    continue
+                visited[e] = stamp
+                if n_candidates == candidates.shape[0]:  # Grow the buffer
+                    candidates = np.concatenate((candidates, np.empty_like(candidates)))
+                candidates[n_candidates] = e
+                n_candidates += 1
+    return candidates, n_candidates
@@ -1,62 +1,274 @@
+from dataclasses import dataclass
+from typing import Iterable
+
 import numpy as np
 from flanker_core.models.vec2 import Vec2
+from flanker_core.models.vec2_array import Vec2Array
+from flanker_core.utils.prepared_polygon import PreparedPolygon
 from numba import njit  # type: ignore
 from numpy.typing import NDArray
 
 
+@njit  # type: ignore
+def _njit_intersect_edge(
+    start_x: float,
+    start_y: float,
+    vector_x: float,
+    vector_y: float,
+    edge_start: NDArray[np.float64],
+    edge_end: NDArray[np.float64],
+) -> float:
+    """
+    Intersects the line `start + t * vector` with one edge, using the same
+    t-u parametric test as `_njit_get_intersect`. Returns `t`, or NaN if
+    the edge is parallel or missed. Shared by the batched kernels.
+    """
+    edge_x = edge_end[0] - edge_start[0]
+    edge_y = edge_end[1] - edge_start[1]
+    denominator = vector_x * edge_y - vector_y * edge_x
+    if abs(denominator) < 1e-9:  # Parallel edge
+        return np.nan
+    q1_p1_x = edge_start[0] - start_x
+    q1_p1_y = edge_start[1] - start_y
+    t = (q1_p1_x * edge_y - q1_p1_y * edge_x) / denominator
+    u = (q1_p1_x * vector_y - q1_p1_y * vector_x) / denominator
+    if t < 0 or t > 1 or u < 0 or u > 1:
+        return np.nan
+    return t
+
+
+@njit  # type: ignore
+def _njit_sort_line_hits(
+    hit_t: NDArray[np.float64],
+    hit_polyline: NDArray[np.int64],
+    line_start: int,
+    n_hits: int,
+) -> int:
+    """
+    Sorts the hits of one line in `[line_start, n_hits)` by t then polyline,
+    in place, and drops repeated hits of a polyline at the same t. Shared by
+    the batched intersection kernels. Returns the new end of the hits.
+    """
+    if n_hits - line_start < 2:
+        return n_hits
+    by_polyline = np.argsort(hit_polyline[line_start:n_hits], kind="mergesort")
+    sorted_t = hit_t[line_start:n_hits][by_polyline]
+    order = np.argsort(sorted_t, kind="mergesort")
+    sorted_t = sorted_t[order]
+    sorted_polyline = hit_polyline[line_start:n_hits][by_polyline][order]
+
+    n_hits = line_start
+    for k in range(order.shape[0]):
+        is_duplicate = False
+        j = n_hits - 1
+        while j >= line_start and hit_t[j] == sorted_t[k]:
+            if hit_polyline[j] == sorted_polyline[k]:
+                is_duplicate = True
+                break
+            j -= 1
+        if not is_duplicate:
+            hit_t[n_hits] = sorted_t[k]
+            hit_polyline[n_hits] = sorted_polyline[k]
+            n_hits += 1
+    return n_hits
+
+
+@dataclass(frozen=True)
+class PackedPolylines:
+    """
+    Polylines packed into flat edge arrays for batched intersection.
+    Edges of polyline `i` are `edge_starts[offsets[i]:offsets[i + 1]]`.
+    """
+
+    edge_starts: NDArray[np.float64]  # (E, 2)
+    edge_ends: NDArray[np.float64]  # (E, 2)
+    offsets: NDArray[np.int64]  # (P + 1,)
+    bboxes: NDArray[np.float64]  # (P, 4) of min x, min y, max x, max y
+
+
+@dataclass(frozen=True)
+class LineHits:
+    """
+    Intersections of a batch of lines against packed polylines. Hits of
+    line `i` are `offsets[i]:offsets[i + 1]`, sorted by the line parameter
+    `t`, where the hit point is `start + t * (end - start)`.
+    """
+
+    lines: NDArray[np.float64]  # (L, 2, 2)
+    t: NDArray[np.float64]  # (H,)
+    polyline: NDArray[np.int64]  # (H,) index of the polyline hit
+    offsets: NDArray[np.int64]  # (L + 1,)
+
+    def get(self, line: int) -> tuple[NDArray[np.float64], NDArray[np.int64]]:
+        """Returns the sorted `t` values and polyline indices of a line."""
+        start, end = self.offsets[line], self.offsets[line + 1]
+        return self.t[start:end], self.polyline[start:end]
+
+    def get_points(self, line: int) -> list[Vec2]:
+        """Returns the sorted intersection points of a line."""
+        t, _ = self.get(line)
+        line_start = self.lines[line, 0]
+        points = line_start + t[:, None] * (self.lines[line, 1] - line_start)
+        return [Vec2(x, y) for x, y in points.tolist()]
+
+
 class IntersectGetter:
     """Utility to compute line segment intersections."""
 
     @staticmethod
     def is_inside(
         point: Vec2,
-        polygon: list[Vec2],
+        polygon: list[Vec2] | Vec2Array,
     ) -> bool:
         """
         Checks whether a point is inside a polygon.
         Polygon must be closed loop that `polygon[-1] == polygon[0]`.
+        Prepare the polygon with `PreparedPolygon` to test many points.
         """
-        if len(polygon) <= 2:
-            raise ValueError("`is_inside` need at least three vertices.")
-        if polygon[-1] != polygon[0]:
-            raise ValueError("Polygon is not closed loop.")
-
-        # Create a line in arbitrary (right-ward) direction to count intersections
-        # Direction doesn't matter. All results are the same.
-        line_cast_to = Vec2(max(v.x for v in polygon) + 1, point.y)
-        # Prevent this line from casting directly at a vertex
-        line_cast_to = line_cast_to.rotated(1e-2) * 2  # Make the line longer
-        # Cast and count
-        intersect_points = IntersectGetter.get_intersects(
-            line=(point, line_cast_to),
-            polyline=polygon,
-        )
-        return len(intersect_points) % 2 != 0
+        return PreparedPolygon(polygon).contains(point)
 
     @staticmethod
     def get_intersects(
         line: tuple[Vec2, Vec2],
-        polyline: list[Vec2],
+        polyline: list[Vec2] | Vec2Array,
     ) -> set[Vec2]:
         """
         Returns intersection points between a line and a polyline.
         For a closed loop, the vertices must repeat `polyline[-1] == polyline[0]`.
-        The intersections are not sorted.
+        The intersections are not sorted. A `Vec2Array` is used without copy.
         """
 
         if len(polyline) < 2:
             return set()
 
         # Convert to np arrays and let the compiled function compute
+        if isinstance(polyline, Vec2Array):
+            polyline_array = polyline.array
+        else:
+            polyline_array = np.array([[v.x, v.y] for v in polyline], np.float64)
         intersections = IntersectGetter._njit_get_intersect(
             line_start=np.array([line[0].x, line[0].y], dtype=np.float64),
             line_end=np.array([line[1].x, line[1].y], dtype=np.float64),
-            polyline=np.array([[v.x, v.y] for v in polyline], dtype=np.float64),
+            polyline=polyline_array,
         )
         # Convert to Vec2
-        points = [Vec2(float(x), float(y)) for x, y in intersections]
+        points = [Vec2(x, y) for x, y in intersections.tolist()]
         return set(points)
 
+    @staticmethod
+    def pack_polylines(
+        polylines: Iterable[list[Vec2] | Vec2Array],
+    ) -> PackedPolylines:
+        """Packs polylines into flat edge arrays for `get_intersects_many`."""
+        arrays: list[NDArray[np.float64]] = []
+        for polyline in polylines:
+            if not isinstance(polyline, Vec2Array):
+                polyline = Vec2Array.from_vec2s(polyline)
+            arrays.append(polyline.array)
+
+        offsets = np.zeros(len(arrays) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([max(len(array) - 1, 0) for array in arrays])
+        bboxes = np.empty((len(arrays), 4), dtype=np.float64)
+        for i, array in enumerate(arrays):
+            if len(array) < 2:  # No edges, bounding box rejects every line
+                bboxes[i] = (np.inf, np.inf, -np.inf, -np.inf)
+                continue
+            bboxes[i, :2] = array.min(axis=0)
+            bboxes[i, 2:] = array.max(axis=0)
+
+        empty = np.empty((0, 2), dtype=np.float64)
+        return PackedPolylines(
+            edge_starts=np.concatenate([empty] + [a[:-1] for a in arrays if len(a)]),
+            edge_ends=np.concatenate([empty] + [a[1:] for a in arrays if len(a)]),
+            offsets=offsets,
+            bboxes=bboxes,
+        )
+
+    @staticmethod
+    def get_intersects_many(
+        lines: NDArray[np.float64],
+        polylines: PackedPolylines,
+    ) -> LineHits:
+        """
+        Intersects a `(L, 2, 2)` batch of line segments against packed
+        polylines in one compiled call. Duplicate hits of a line on the
+        same polyline (such as at a shared vertex) are reported once.
+        """
+        lines = np.ascontiguousarray(lines, dtype=np.float64).reshape(-1, 2, 2)
+        t, polyline, offsets = IntersectGetter._njit_get_intersects_many(
+            lines,
+            polylines.edge_starts,
+            polylines.edge_ends,
+            polylines.offsets,
+            polylines.bboxes,
+        )
+        return LineHits(lines, t, polyline, offsets)
+
+    @staticmethod
+    @njit  # type: ignore
+    def _njit_get_intersects_many(
+        lines: NDArray[np.float64],
+        edge_starts: NDArray[np.float64],
+        edge_ends: NDArray[np.float64],
+        polyline_offsets: NDArray[np.int64],
+        bboxes: NDArray[np.float64],
+    ) -> tuple[NDArray[np.float64], NDArray[np.int64], NDArray[np.int64]]:
+        """
+        Private optimized intersect getter for `get_intersects_many`.
+        Uses the same t-u parametric test as `_njit_get_intersect`, one
+        line and edge at a time, skipping polylines by bounding box.
+        Returns the hit `t`, hit polyline, and per-line hit offsets.
+        """
+        n_lines = lines.shape[0]
+        n_polylines = polyline_offsets.shape[0] - 1
+        hit_t = np.empty(max(16, 2 * n_lines), dtype=np.float64)
+        hit_polyline = np.empty(hit_t.shape[0], dtype=np.int64)
+        line_offsets = np.zeros(n_lines + 1, dtype=np.int64)
+        n_hits = 0
+
+        for i in range(n_lines):
+            start_x, start_y = lines[i, 0, 0], lines[i, 0, 1]
+            vector_x = lines[i, 1, 0] - start_x
+            vector_y = lines[i, 1, 1] - start_y
+            min_x = min(start_x, lines[i, 1, 0])
+            max_x = max(start_x, lines[i, 1, 0])
+            min_y = min(start_y, lines[i, 1, 1])
+            max_y = max(start_y, lines[i, 1, 1])
+            line_start = n_hits
+
+            for p in range(n_polylines):
+                if (
+                    max_x < bboxes[p, 0]
+                    or min_x > bboxes[p, 2]
+                    or max_y < bboxes[p, 1]
+                    or min_y > bboxes[p, 3]
+                ):
+                    continue
+                for e in range(polyline_offsets[p], polyline_offsets[p + 1]):
+                    t = _njit_intersect_edge(
+                        start_x,
+                        start_y,
+                        vector_x,
+                        vector_y,
+                        edge_starts[e],
+                        edge_ends[e],
+                    )
+                    if np.isnan(t):
+                        continue
+                    if n_hits == hit_t.shape[0]:  # Grow the buffers
+                        hit_t = np.concatenate((hit_t, np.empty_like(hit_t)))
+                        hit_polyline = np.concatenate(
+                            (hit_polyline, np.empty_like(hit_polyline))
+                        )
+                    hit_t[n_hits] = t
+                    hit_polyline[n_hits] = p
+                    n_hits += 1
+
+            n_hits = _njit_sort_line_hits(hit_t, hit_polyline, line_start, n_hits)
+            line_offsets[i + 1] = n_hits
+
+        return hit_t[:n_hits].copy(), hit_polyline[:n_hits].copy(), line_offsets
+
     @staticmethod
     @njit  # type: ignore
     def _njit_get_intersect(
@@ -3,6 +3,7 @@ from typing import List
 
 from flanker_core.models.components import Transform
 from flanker_core.models.vec2 import Vec2
+from flanker_core.models.vec2_array import Vec2Array
 
 
 class LinearTransform:
@@ -30,3 +31,9 @@ class LinearTransform:
         rotated = LinearTransform.rotate(vec_list, transform.degrees)
         translated = LinearTransform.translate(rotated, transform.position)
         return translated
+
+    @staticmethod
+    def apply_array(vertices: Vec2Array, transform: Transform) -> Vec2Array:
+        """Returns a new `Vec2Array` translated and rotated by `Transform`."""
+        rotated = vertices.rotated(math.radians(transform.degrees))
+        return rotated.translated(transform.position)
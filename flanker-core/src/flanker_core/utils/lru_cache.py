@@ -0,0 +1,77 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Hashable
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Snapshot of the usage counters of a cache."""
+
+    hits: int
+    misses: int
+    size: int
+    max_size: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class LruCache[K: Hashable, V]:
+    """
+    Size-bounded mapping that evicts the least recently used entry, and
+    counts its hits and misses. Safe to share between threads. Values are
+    shared with every caller, so they must not be mutated.
+    """
+
+    def __init__(self, max_size: int) -> None:
+        if max_size <= 0:
+            raise ValueError("Cache size must be positive.")
+        self.max_size = max_size
+        self._entries: OrderedDict[K, V] = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: K) -> V | None:
+        """Gets the value of a key, marking it as recently used."""
+        with self._lock:
+            if (value := self._entries.get(key)) is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def peek(self, key: K) -> V | None:
+        """Gets the value of a key, without counting or marking its use."""
+        with self._lock:
+            return self._entries.get(key)
+
+    def newest(self) -> V | None:
+        """Gets the most recently used value, without counting its use."""
+        with self._lock:
+            return next(reversed(self._entries.values()), None)
+
+    def set(self, key: K, value: V) -> None:
+        """Sets the value of a key, evicting the least recently used if full."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drops all entries and resets the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def get_stats(self) -> CacheStats:
+        return CacheStats(self._hits, self._misses, len(self), self.max_size)
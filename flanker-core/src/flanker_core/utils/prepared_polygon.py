@@ -0,0 +1,81 @@
+import numpy as np
+from flanker_core.models.vec2 import Vec2
+from flanker_core.models.vec2_array import Vec2Array
+from numba import njit  # type: ignore
+from numpy.typing import NDArray
+
+
+class PreparedPolygon:
+    """
+    Closed polygon validated once, with precomputed edge tables for fast
+    point-in-polygon tests. Polygon must be closed loop that
+    `polygon[-1] == polygon[0]`.
+    """
+
+    __slots__ = ("vertices", "bbox", "_edges")
+
+    def __init__(self, polygon: list[Vec2] | Vec2Array) -> None:
+        if len(polygon) <= 2:
+            raise ValueError("Polygon need at least three vertices.")
+        if polygon[-1] != polygon[0]:
+            raise ValueError("Polygon is not closed loop.")
+        if not isinstance(polygon, Vec2Array):
+            polygon = Vec2Array.from_vec2s(polygon)
+        self.vertices = polygon
+
+        array = polygon.array
+        min_x, min_y = array.min(axis=0).tolist()
+        max_x, max_y = array.max(axis=0).tolist()
+        self.bbox = (min_x, min_y, max_x, max_y)
+
+        # Edge table of start x, start y, end y, and inverse slope dx/dy.
+        # Horizontal edges never straddle a point, so their slope is unused.
+        starts, ends = array[:-1], array[1:]
+        dy = ends[:, 1] - starts[:, 1]
+        inverse_slope = np.divide(
+            ends[:, 0] - starts[:, 0],
+            dy,
+            out=np.zeros_like(dy),
+            where=dy != 0,
+        )
+        self._edges = np.column_stack((starts, ends[:, 1], inverse_slope))
+
+    def contains(self, point: Vec2) -> bool:
+        """Checks whether a point is inside the polygon."""
+        min_x, min_y, max_x, max_y = self.bbox
+        if not (min_x <= point.x <= max_x and min_y <= point.y <= max_y):
+            return False
+        array = np.array([[point.x, point.y]], dtype=np.float64)
+        return bool(PreparedPolygon._njit_contains_many(array, self._edges)[0])
+
+    def contains_many(self, points: Vec2Array | list[Vec2]) -> NDArray[np.bool_]:
+        """Checks a batch of points, returns a boolean mask of those inside."""
+        if not isinstance(points, Vec2Array):
+            points = Vec2Array.from_vec2s(points)
+        return PreparedPolygon._njit_contains_many(points.array, self._edges)
+
+    @staticmethod
+    @njit  # type: ignore
+    def _njit_contains_many(
+        points: NDArray[np.float64],
+        edges: NDArray[np.float64],
+    ) -> NDArray[np.bool_]:
+        """
+        Private crossing number test for `contains_many`. Casts a ray
+        right-ward from each point and counts the edges it crosses. Edges
+        are half-open in y, so a ray through a vertex counts it once.
+        """
+        mask = np.zeros(points.shape[0], dtype=np.bool_)
+        for i in range(points.shape[0]):
+            x = points[i, 0]
+            y = points[i, 1]
+            inside = False
+            for e in range(edges.shape[0]):
+                start_y = edges[e, 1]
+                end_y = edges[e, 2]
+                if (start_y > y) != (end_y > y):
+                    crossing_x = edges[e, 0] + (y - start_y) * edges[e, 3]
+                    if x < crossing_x:
+                        inside = not inside
+            mask[i] = inside
+        return mask
@@ -236,3 +236,27 @@ def test_status_supppressed(fixture: Fixture) -> None:
     assert (
         fire_result == InvalidAction.INACTIVE_UNIT
     ), "SUPPRESSED unit can't do fire action"
+
+
+def test_fire_status_after_copy(fixture: Fixture) -> None:
+    fixture.fire_controls.override = FireOutcomes.SUPPRESS
+    _ = ActionSystem.perform(
+        gs=fixture.gs,
+        action=FireAction(
+            unit_id=fixture.attacker_id,
+            target_id=fixture.target_id,
+        ),
+    )
+
+    # Copies, forks and loaded states must all agree on the status
+    fork_gs = fixture.gs.fork()
+    for gs in (fixture.gs.copy(), GameState.load(fixture.gs.dump()), fork_gs):
+        target_status = FireSystem.get_status(gs, fixture.target_id)
+        assert target_status == CombatUnit.Status.SUPPRESSED
+
+    # Killing the firer in the fork leaves the original untouched
+    CommandSystem.kill_unit(fork_gs, fixture.attacker_id)
+    target_status = FireSystem.get_status(fork_gs, fixture.target_id)
+    assert target_status == CombatUnit.Status.ACTIVE
+    target_status = FireSystem.get_status(fixture.gs, fixture.target_id)
+    assert target_status == CombatUnit.Status.SUPPRESSED
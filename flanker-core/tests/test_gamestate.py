@@ -0,0 +1,323 @@
+from dataclasses import dataclass
+from uuid import UUID
+
+import pytest
+from flanker_core.gamestate import GameState
+from flanker_core.models.components import (
+    CombatUnit,
+    FireControls,
+    InitiativeState,
+    TerrainFeature,
+    Transform,
+)
+from flanker_core.models.outcomes import FireEffect
+from flanker_core.models.vec2 import Vec2
+
+
+@dataclass
+class Fixture:
+    gs: GameState
+    unit_id: UUID
+    armed_unit_id: UUID
+    marker_id: UUID
+
+
+@pytest.fixture
+def fixture() -> Fixture:
+    gs = GameState()
+    unit_id = gs.add_entity(
+        CombatUnit(faction=InitiativeState.Faction.BLUE),
+        Transform(position=Vec2(0, 0)),
+    )
+    armed_unit_id = gs.add_entity(
+        CombatUnit(faction=InitiativeState.Faction.RED),
+        Transform(position=Vec2(10, 0)),
+        FireControls(),
+    )
+    marker_id = gs.add_entity(
+        Transform(position=Vec2(5, 5)),
+    )
+    return Fixture(
+        gs=gs,
+        unit_id=unit_id,
+        armed_unit_id=armed_unit_id,
+        marker_id=marker_id,
+    )
+
+
+def test_query_across_archetypes(fixture: Fixture) -> None:
+    # Shares the archetype of the first entity, but is added last
+    new_id = fixture.gs.add_entity(
+        CombatUnit(faction=InitiativeState.Faction.BLUE),
+        Transform(position=Vec2(1, 1)),
+    )
+    ids = [entity_id for entity_id, _ in fixture.gs.query(Transform)]
+    assert ids == [
+        fixture.unit_id,
+        fixture.armed_unit_id,
+        fixture.marker_id,
+        new_id,
+    ], "Expects every entity with a Transform, in insertion order"
+
+    rows = fixture.gs.query(CombatUnit, FireControls)
+    assert len(rows) == 1, "Expects only the entity with both components"
+    entity_id, unit, fire_controls = rows[0]
+    assert entity_id == fixture.armed_unit_id
+    assert unit is fixture.gs.get_component(entity_id, CombatUnit)
+    assert fire_controls is fixture.gs.get_component(entity_id, FireControls)
+
+
+def test_query_stays_current_on_add(fixture: Fixture) -> None:
+    assert len(fixture.gs.query(CombatUnit, Transform)) == 2
+
+    # A new archetype must show up in the already-cached query
+    new_id = fixture.gs.add_entity(
+        CombatUnit(faction=InitiativeState.Faction.BLUE),
+        Transform(position=Vec2(1, 1)),
+        InitiativeState(),
+    )
+    ids = [entity_id for entity_id, _, _ in fixture.gs.query(CombatUnit, Transform)]
+    assert ids == [
+        fixture.unit_id,
+        fixture.armed_unit_id,
+        new_id,
+    ], "Expects cached query to include the new entity, in insertion order"
+
+
+def test_query_stays_current_on_delete(fixture: Fixture) -> None:
+    assert len(fixture.gs.query(Transform)) == 3
+
+    fixture.gs.delete_entity(fixture.unit_id)
+    ids = [entity_id for entity_id, _ in fixture.gs.query(Transform)]
+    assert fixture.unit_id not in ids, "Expects deleted entity to be gone"
+    assert len(ids) == 2
+    assert fixture.gs.try_component(fixture.unit_id, Transform) == None
+
+    # Remaining rows in the same archetype must still line up
+    fixture.gs.delete_entity(fixture.marker_id)
+    for entity_id, transform in fixture.gs.query(Transform):
+        assert transform is fixture.gs.get_component(entity_id, Transform)
+
+
+def test_load_rebuilds_queries(fixture: Fixture) -> None:
+    gs = GameState.load(fixture.gs.dump())
+    rows = gs.query(CombatUnit, FireControls)
+    assert [entity_id for entity_id, _, _ in rows] == [fixture.armed_unit_id]
+    with pytest.raises(KeyError):
+        gs.get_component(fixture.marker_id, CombatUnit)
+
+
+def test_fork_copies_on_write(fixture: Fixture) -> None:
+    new_gs = fixture.gs.fork()
+    transform = fixture.gs.get_component(fixture.unit_id, Transform)
+    assert new_gs.get_component(fixture.unit_id, Transform) is transform
+
+    # Mutating the fork clones the component and leaves the original alone
+    new_transform = new_gs.get_mut_component(fixture.unit_id, Transform)
+    new_transform.position = Vec2(1, 1)
+    assert new_transform is not transform
+    assert transform.position == Vec2(0, 0)
+    assert new_gs.get_mut_component(fixture.unit_id, Transform) is new_transform
+    rows = new_gs.query(Transform)
+    assert (fixture.unit_id, new_transform) in rows, "Expects query to see clone"
+    assert (fixture.unit_id, transform) in fixture.gs.query(Transform)
+
+    # The original state must also clone, since the fork still shares it
+    unit = fixture.gs.get_component(fixture.armed_unit_id, CombatUnit)
+    old_unit = fixture.gs.get_mut_component(fixture.armed_unit_id, CombatUnit)
+    assert old_unit is not unit
+    assert new_gs.get_component(fixture.armed_unit_id, CombatUnit) is unit
+
+
+def test_fork_add_and_delete(fixture: Fixture) -> None:
+    new_gs = fixture.gs.fork()
+    new_gs.delete_entity(fixture.marker_id)
+    new_id = new_gs.add_entity(Transform(position=Vec2(2, 2)))
+
+    ids = [entity_id for entity_id, _ in fixture.gs.query(Transform)]
+    assert fixture.marker_id in ids, "Expects original to keep the entity"
+    assert new_id not in ids, "Expects original not to see the new entity"
+    new_ids = [entity_id for entity_id, _ in new_gs.query(Transform)]
+    assert fixture.marker_id not in new_ids
+    assert new_id in new_ids
+
+
+def test_copy_clones_mutable_parts(fixture: Fixture) -> None:
+    terrain_id = fixture.gs.add_entity(
+        TerrainFeature(vertices=[Vec2(0, 0), Vec2(1, 0), Vec2(1, 1)]),
+    )
+    fire_controls = fixture.gs.get_component(fixture.armed_unit_id, FireControls)
+    fire_controls.firing_at = (fixture.unit_id, FireEffect.PINNING)
+    new_gs = fixture.gs.copy()
+
+    # Components and their mutable containers are cloned
+    terrain = fixture.gs.get_component(terrain_id, TerrainFeature)
+    new_terrain = new_gs.get_component(terrain_id, TerrainFeature)
+    assert new_terrain is not terrain
+    assert new_terrain == terrain
+    assert new_terrain.vertices is not terrain.vertices
+
+    # Immutable values are shared rather than copied
+    assert new_terrain.vertices[0] is terrain.vertices[0]
+    new_fire_controls = new_gs.get_component(fixture.armed_unit_id, FireControls)
+    assert new_fire_controls is not fire_controls
+    assert new_fire_controls.firing_at is fire_controls.firing_at
+
+
+def test_singleton(fixture: Fixture) -> None:
+    assert fixture.gs.try_singleton(InitiativeState) == None
+    with pytest.raises(KeyError):
+        fixture.gs.get_singleton(InitiativeState)
+
+    # Setting again replaces the instance on the same entity
+    entity_id = fixture.gs.set_singleton(InitiativeState())
+    initiative = InitiativeState(faction=InitiativeState.Faction.RED)
+    assert fixture.gs.set_singleton(initiative) == entity_id
+    assert fixture.gs.get_singleton(InitiativeState) is initiative
+    assert [c for _, c in fixture.gs.query(InitiativeState)] == [initiative]
+
+    # Only one instance may exist
+    with pytest.raises(ValueError):
+        fixture.gs.add_entity(InitiativeState())
+    fixture.gs.delete_entity(entity_id)
+    assert fixture.gs.try_singleton(InitiativeState) == None
+
+
+def test_singleton_validates_loaded_state(fixture: Fixture) -> None:
+    fixture.gs.add_entity(InitiativeState())
+    fixture.gs.add_entity(InitiativeState())
+    with pytest.raises(ValueError):
+        fixture.gs.get_singleton(InitiativeState)
+
+
+def test_query_results_are_stable(fixture: Fixture) -> None:
+    rows = fixture.gs.query(Transform)
+    assert fixture.gs.query(Transform) is rows, "Expects the cached result"
+
+    # Mutating a shared component replaces the rows, not the old result
+    new_gs = fixture.gs.fork()
+    transform = new_gs.get_mut_component(fixture.unit_id, Transform)
+    assert new_gs.query(Transform) is not rows
+    assert (fixture.unit_id, transform) in new_gs.query(Transform)
+    assert fixture.gs.query(Transform) is rows
+
+    fixture.gs.delete_entity(fixture.marker_id)
+    assert len(rows) == 3, "Expects old results to stay untouched"
+    assert len(fixture.gs.query(Transform)) == 2
+
+
+def test_iter_query(fixture: Fixture) -> None:
+    assert list(fixture.gs.iter_query(CombatUnit, Transform)) == (
+        fixture.gs.query(CombatUnit, Transform)
+    )
+    assert list(fixture.gs.query_one_type(FireControls)) == (
+        fixture.gs.query(FireControls)
+    )
+
+
+def test_fork_handles_diverge(fixture: Fixture) -> None:
+    new_gs = fixture.gs.fork()
+    parent_id = fixture.gs.add_entity(Transform(position=Vec2(1, 0)))
+    fork_id = new_gs.add_entity(Transform(position=Vec2(0, 1)))
+
+    # Both states hand out the same next handle to different entities
+    assert fixture.gs.try_component(fork_id, Transform) == None
+    assert new_gs.try_component(parent_id, Transform) == None
+    assert fixture.gs.get_component(parent_id, Transform).position == Vec2(1, 0)
+    assert new_gs.get_component(fork_id, Transform).position == Vec2(0, 1)
+    assert list(fixture.gs.dump())[-1] == parent_id
+    assert list(new_gs.dump())[-1] == fork_id
+
+
+def test_batch_defers_changes(fixture: Fixture) -> None:
+    rows = fixture.gs.query(Transform)
+    with fixture.gs.batch():
+        new_id = fixture.gs.add_entity(Transform(position=Vec2(3, 3)))
+        fixture.gs.delete_entity(fixture.marker_id)
+        # Nothing is applied until the block exits
+        assert fixture.gs.query(Transform) is rows
+        assert fixture.gs.try_component(new_id, Transform) == None
+        assert fixture.gs.try_component(fixture.marker_id, Transform) != None
+
+    ids = [entity_id for entity_id, _ in fixture.gs.query(Transform)]
+    assert ids == [fixture.unit_id, fixture.armed_unit_id, new_id]
+
+
+def test_batch_sets_singletons(fixture: Fixture) -> None:
+    with fixture.gs.batch():
+        # Lazily created singletons are seen by the next lookup
+        initiative = InitiativeState()
+        entity_id = fixture.gs.set_singleton(initiative)
+        assert fixture.gs.try_singleton(InitiativeState) is initiative
+        assert fixture.gs.set_singleton(InitiativeState()) == entity_id
+        fixture.gs.delete_entity(fixture.marker_id)
+        assert fixture.gs.try_component(fixture.marker_id, Transform) != None
+    assert fixture.gs.try_component(fixture.marker_id, Transform) == None
+    assert len(fixture.gs.query(InitiativeState)) == 1
+
+
+def test_delete_patches_results(fixture: Fixture) -> None:
+    rows = fixture.gs.query(CombatUnit)
+    fixture.gs.delete_entity(fixture.unit_id)
+    assert fixture.gs.query(CombatUnit) == [
+        row for row in rows if row[0] != fixture.unit_id
+    ]
+    assert len(rows) == 2, "Expects old results to stay untouched"
+
+
+def test_rollback_reverts_changes(fixture: Fixture) -> None:
+    transform = fixture.gs.get_component(fixture.unit_id, Transform)
+    rows = list(fixture.gs.query(Transform))
+
+    checkpoint = fixture.gs.checkpoint()
+    fixture.gs.get_mut_component(fixture.unit_id, Transform).position = Vec2(1, 1)
+    fixture.gs.delete_entity(fixture.unit_id)
+    new_id = fixture.gs.add_entity(Transform(position=Vec2(2, 2)))
+    fixture.gs.delete_entity(fixture.marker_id)
+    assert transform.position == Vec2(0, 0), "Expects original to be untouched"
+
+    fixture.gs.rollback(checkpoint)
+    assert fixture.gs.query(Transform) == rows, "Expects rows back in order"
+    assert fixture.gs.get_component(fixture.unit_id, Transform) is transform
+    assert fixture.gs.try_component(new_id, Transform) == None
+    with pytest.raises(KeyError):
+        fixture.gs.rollback(checkpoint)
+
+    # Entities added after a rollback still go last
+    readded_id = fixture.gs.add_entity(Transform(position=Vec2(2, 2)))
+    assert fixture.gs.query(Transform)[-1][0] == readded_id
+
+
+def test_rollback_nested_checkpoints(fixture: Fixture) -> None:
+    outer = fixture.gs.checkpoint()
+    fixture.gs.get_mut_component(fixture.unit_id, Transform).position = Vec2(1, 1)
+    inner = fixture.gs.checkpoint()
+    fixture.gs.get_mut_component(fixture.unit_id, Transform).position = Vec2(2, 2)
+    new_gs = fixture.gs.fork()
+
+    fixture.gs.rollback(inner)
+    transform = fixture.gs.get_component(fixture.unit_id, Transform)
+    assert transform.position == Vec2(1, 1), "Expects only inner changes reverted"
+    new_transform = new_gs.get_component(fixture.unit_id, Transform)
+    assert new_transform.position == Vec2(2, 2), "Expects fork to be untouched"
+
+    fixture.gs.rollback(outer)
+    transform = fixture.gs.get_component(fixture.unit_id, Transform)
+    assert transform.position == Vec2(0, 0)
+    assert new_transform.position == Vec2(2, 2)
+
+
+def test_component_versions(fixture: Fixture) -> None:
+    version = fixture.gs.get_version(Transform)
+    assert fixture.gs.get_version(TerrainFeature) == 0
+    fixture.gs.get_component(fixture.unit_id, Transform)
+    assert fixture.gs.get_version(Transform) == version
+
+    # Forks share versions until either one changes the type
+    new_gs = fixture.gs.fork()
+    assert new_gs.get_version(Transform) == version
+    new_gs.get_mut_component(fixture.unit_id, CombatUnit)
+    fixture.gs.delete_entity(fixture.marker_id)
+    assert new_gs.get_version(Transform) != version
+    versions = (version, new_gs.get_version(Transform))
+    assert fixture.gs.get_version(Transform) not in versions
@@ -1,10 +1,15 @@
 from dataclasses import dataclass
 
+import numpy as np
 import pytest
 from flanker_core.models.components import Transform
 from flanker_core.models.vec2 import Vec2
-from flanker_core.utils.intersect_getter import IntersectGetter
+from flanker_core.models.vec2_array import Vec2Array
+from flanker_core.utils.edge_grid import EdgeGrid
+from flanker_core.utils.intersect_getter import IntersectGetter, LineHits
+from flanker_core.utils.prepared_polygon import PreparedPolygon
 from flanker_core.utils.linear_transform import LinearTransform
+from flanker_core.utils.robust_predicates import orient2d, segments_intersect
 
 
 @dataclass
@@ -40,3 +45,102 @@ def fixture() -> Fixture:
 def test_is_inside_false(fixture: Fixture) -> None:
     is_inside = IntersectGetter.is_inside(Vec2(104, 25), fixture.vertices)
     assert is_inside == False, "The point lies outside of the polygon."
+
+
+def test_get_intersects_many(fixture: Fixture) -> None:
+    square = [Vec2(0, 0), Vec2(10, 0), Vec2(10, 10), Vec2(0, 10), Vec2(0, 0)]
+    polylines = [fixture.vertices, [], square]
+    packed = IntersectGetter.pack_polylines(polylines)
+    lines = [
+        (Vec2(100, 50), Vec2(200, 80)),
+        (Vec2(-5, 5), Vec2(200, 5)),
+        (Vec2(0, 0), Vec2(10, 10)),  # Through shared vertices
+        (Vec2(-5, -5), Vec2(-1, -1)),  # No hits
+    ]
+    hits = IntersectGetter.get_intersects_many(
+        np.array([[(a.x, a.y), (b.x, b.y)] for a, b in lines]),
+        packed,
+    )
+    for i, line in enumerate(lines):
+        t, _ = hits.get(i)
+        assert list(t) == sorted(t), "Expects hits sorted along the line"
+        expected = set[Vec2]()
+        for polyline in polylines:
+            expected |= IntersectGetter.get_intersects(line, polyline)
+        assert set(hits.get_points(i)) == expected
+    assert hits.get(2)[1].tolist() == [2, 2], "Expects one hit per polyline vertex"
+
+
+def test_edge_grid(fixture: Fixture) -> None:
+    square = [Vec2(0, 0), Vec2(10, 0), Vec2(10, 10), Vec2(0, 10), Vec2(0, 0)]
+    polylines = [Vec2Array.from_vec2s(fixture.vertices), Vec2Array.from_vec2s(square)]
+    grid = EdgeGrid[str]()
+    grid.set_polyline("river", polylines[0])
+    grid.set_polyline("square", polylines[1])
+    rng = np.random.default_rng(0)
+    lines = np.round(rng.uniform(-20, 160, (500, 2, 2)))
+    lines[0] = ((0, 0), (10, 10))  # Through shared vertices
+
+    def assert_same(hits: LineHits, expected: LineHits) -> None:
+        assert hits.offsets.tolist() == expected.offsets.tolist()
+        assert hits.t.tolist() == expected.t.tolist()
+        assert hits.polyline.tolist() == expected.polyline.tolist()
+
+    packed = IntersectGetter.pack_polylines(polylines)
+    assert_same(
+        grid.get_intersects_many(lines),
+        IntersectGetter.get_intersects_many(lines, packed),
+    )
+
+    # Replacing one polyline re-bins it in place, others can be disabled
+    polylines[1] = polylines[1].translated(Vec2(3, 4))
+    grid.set_polyline("square", polylines[1])
+    packed = IntersectGetter.pack_polylines([Vec2Array.from_vec2s([])] + polylines[1:])
+    assert_same(
+        grid.get_intersects_many(lines, enabled=np.array([False, True])),
+        IntersectGetter.get_intersects_many(lines, packed),
+    )
+
+
+def test_prepared_polygon_contains_many(fixture: Fixture) -> None:
+    polygon = PreparedPolygon(fixture.vertices)
+    points = [Vec2(x + 0.5, y + 0.5) for x in range(90, 160) for y in range(20, 130)]
+    inside = polygon.contains_many(points)
+    assert inside.tolist() == [polygon.contains(p) for p in points]
+    assert inside.any() and not inside.all()
+    assert polygon.contains(Vec2(143, 46)) == True, "The point lies inside."
+    assert polygon.contains(Vec2(104, 25)) == False, "The point lies outside."
+
+
+def test_robust_predicates() -> None:
+    # Points a hair off a line, where the naive determinant rounds wrongly
+    assert orient2d(0.5, 0.5, 12.0, 12.0, 24.0, 24.0) == 0
+    assert orient2d(0.5, 0.5, 12.0, 12.0, 24.0, np.nextafter(24.0, 25)) > 0
+    assert orient2d(0.5, 0.5, 12.0, 12.0, 24.0, np.nextafter(24.0, 23)) < 0
+    assert segments_intersect(0, 0, 10, 10, 10, 10, 20, 0), "Touches at end."
+    assert segments_intersect(0, 0, 10, 0, 5, 0, 20, 0), "Collinear overlap."
+    assert not segments_intersect(0, 0, 10, 0, 11, 0, 20, 0), "Collinear apart."
+    assert not segments_intersect(0, 0, 10, 10, 0, 1, 10, 11), "Parallel."
+
+
+def test_edge_grid_side_hits() -> None:
+    grid = EdgeGrid[str]()
+    square = [Vec2(0, 0), Vec2(10, 0), Vec2(10, 10), Vec2(0, 10), Vec2(0, 0)]
+    grid.set_polyline("square", Vec2Array.from_vec2s(square))
+    lines = np.array(
+        [
+            ((-10, -10), (0, 0)),  # Through a corner, then across the square
+            ((-10, 10), (0, 10)),  # Along an edge, grazes the far corner
+            ((-10, 0), (0, 10)),  # Grazes a corner from outside
+        ],
+        dtype=np.float64,
+    )
+    hits, sides = grid.get_side_hits(lines, np.array([3.0, 3.0, 3.0]))
+
+    def get_side_hits(line: int) -> list[tuple[float, int]]:
+        start, end = hits.offsets[line], hits.offsets[line + 1]
+        return sorted(zip(hits.t[start:end].tolist(), sides[start:end].tolist()))
+
+    assert get_side_hits(0) == [(1, 1), (1, 2), (2, 1), (2, 2)]
+    assert get_side_hits(1) == [(1, 1), (2, 1)]
+    assert get_side_hits(2) == [(1, 1), (1, 1)]
@@ -11,9 +11,11 @@ from flanker_core.models.components import (
     TerrainFeature,
     Transform,
 )
-from flanker_core.models.vec2 import Vec2
+from flanker_core.models.vec2 import Vec2, Vec2Key
 from flanker_core.systems.action_system import ActionSystem
 from flanker_core.systems.los_system import LosSystem
+from flanker_core.systems.terrain_system import TerrainSystem
+from flanker_core.utils.lru_cache import LruCache
 
 
 @dataclass
@@ -87,6 +89,14 @@ def test_no_los(fixture: Fixture) -> None:
     assert has_los == False, "Expects no LOS found"
 
 
+def test_los_while_batching(fixture: Fixture) -> None:
+    start = fixture.spotter_transform.position
+    end = fixture.target_transform.position
+    with fixture.gs.batch():
+        assert LosSystem.has_los(fixture.gs, start, end) == False
+        assert len(list(TerrainSystem.get_intersect(fixture.gs, start, end))) > 0
+
+
 def test_los(fixture: Fixture) -> None:
     ActionSystem.perform(
         fixture.gs,
@@ -141,3 +151,153 @@ def test_los_both_inside_terrain(fixture: Fixture) -> None:
         fixture.target_transform.position,
     )
     assert has_los == True, "Expects LOS as both are in terrain"
+
+
+def test_terrain_geometry_cache(fixture: Fixture) -> None:
+    terrain_id, _ = next(iter(fixture.gs.query(TerrainFeature)))
+    geometry = TerrainSystem.get_geometry(fixture.gs, terrain_id)
+    assert TerrainSystem.get_geometry(fixture.gs, terrain_id) is geometry
+    assert len(geometry.vertices) == 5, "Expects closed loop to repeat first vertex"
+
+    # Forks mutate copies, leaving the original geometry intact
+    fork = fixture.gs.fork()
+    fork.get_mut_component(terrain_id, Transform).position = Vec2(100, 0)
+    assert TerrainSystem.get_geometry(fork, terrain_id).bbox[0] == 100
+    assert TerrainSystem.get_geometry(fixture.gs, terrain_id).bbox[0] == 0
+    # Edge grids aren't shared between forks that differ in terrain
+    grid = TerrainSystem.get_edge_grid(fixture.gs)
+    fork_grid = TerrainSystem.get_edge_grid(fork)
+    assert fork_grid.get_polyline(terrain_id).array[:, 0].min() == 100
+    assert grid.get_polyline(terrain_id).array[:, 0].min() == 0
+    assert TerrainSystem.get_edge_grid(fixture.gs) is grid
+
+    # In-place vertex edits need invalidating
+    key = TerrainSystem.get_terrain_key(fixture.gs)
+    terrain = fixture.gs.get_component(terrain_id, TerrainFeature)
+    terrain.vertices[0] = Vec2(-1, 0)
+    assert TerrainSystem.get_terrain_key(fixture.gs) == key
+    TerrainSystem.invalidate_geometry(fixture.gs, terrain_id)
+    assert TerrainSystem.get_terrain_key(fixture.gs) != key
+    assert TerrainSystem.get_geometry(fixture.gs, terrain_id).bbox[0] == -1
+
+
+def test_los_polygon_cache_key(fixture: Fixture) -> None:
+    # Positions off by float noise share a key, and so share the cache
+    position = fixture.spotter_transform.position
+    noisy = position + Vec2(1e-12, -1e-12)
+    assert hash(Vec2Key.from_vec2(noisy)) == hash(Vec2Key.from_vec2(position))
+    assert Vec2Key.from_vec2(position + Vec2(1e-6, 0)) != Vec2Key.from_vec2(position)
+    polygon = LosSystem.get_los_polygon(fixture.gs, position)
+    assert LosSystem.get_los_polygon(fixture.gs, noisy) is polygon
+
+
+def test_los_polygon_shared_cache(fixture: Fixture) -> None:
+    LosSystem.clear_cache()
+    position = fixture.spotter_transform.position
+    polygon = LosSystem.get_los_polygon(fixture.gs, position)
+
+    # A separate game state with the same terrain shares the polygon
+    gs = GameState()
+    for _, terrain, transform in fixture.gs.query(TerrainFeature, Transform):
+        gs.add_entity(
+            Transform(transform.position),
+            TerrainFeature(terrain.vertices, flag=terrain.flag),
+        )
+    assert LosSystem.get_los_polygon(gs, position) is polygon
+    stats = LosSystem.get_cache_stats()["los_polygon"]
+    assert (stats.hits, stats.misses, stats.size) == (1, 1, 1)
+
+    # Moving the terrain changes the key
+    for id, _ in gs.query(Transform):
+        gs.get_mut_component(id, Transform).position = Vec2(1, 0)
+    assert LosSystem.get_los_polygon(gs, position) != polygon
+    assert LosSystem.get_cache_stats()["los_polygon"].misses == 2
+
+
+def test_lru_cache_eviction() -> None:
+    cache = LruCache[str, int](2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # Now "b" is the least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.get_stats().hit_rate == 0.75
+
+
+def test_los_polygon_survives_unrelated_edits() -> None:
+    LosSystem.clear_cache()
+    gs = GameState()
+    # Opaque map boundary, and a wall hiding the right side from the spotter
+    gs.add_entity(
+        Transform(Vec2(0, 0)),
+        TerrainFeature(
+            [Vec2(0, 0), Vec2(100, 0), Vec2(100, 100), Vec2(0, 100)],
+            flag=TerrainFeature.Flag.OPAQUE | TerrainFeature.Flag.BOUNDARY,
+        ),
+    )
+    wall_id = gs.add_entity(
+        Transform(Vec2(0, 0)),
+        TerrainFeature(
+            [Vec2(20, 0), Vec2(22, 0), Vec2(22, 100), Vec2(20, 100)],
+            flag=TerrainFeature.Flag.OPAQUE,
+        ),
+    )
+    spotter_pos = Vec2(5, 50)
+    # Lookups never write to the game state
+    entity_count = len(gs.dump())
+    polygon = LosSystem.get_los_polygon(gs, spotter_pos)
+    assert len(gs.dump()) == entity_count, "Expects lookups not to add entities"
+
+    # Adding terrain behind the wall can't change what the spotter sees
+    block_id = gs.add_entity(
+        Transform(Vec2(60, 40)),
+        TerrainFeature(
+            [Vec2(0, 0), Vec2(10, 0), Vec2(10, 10), Vec2(0, 10)],
+            flag=TerrainFeature.Flag.OPAQUE,
+        ),
+    )
+    assert LosSystem.get_los_polygon(gs, spotter_pos) is polygon
+    gs.delete_entity(block_id)
+    TerrainSystem.invalidate_geometry(gs, block_id)
+    assert LosSystem.get_los_polygon(gs, spotter_pos) is polygon
+
+    # Moving the wall does, so the polygon is recomputed
+    gs.get_mut_component(wall_id, Transform).position = Vec2(10, 0)
+    moved = LosSystem.get_los_polygon(gs, spotter_pos)
+    assert max(point.x for point in moved) == 32
+    LosSystem.clear_cache()
+    assert LosSystem.get_los_polygon(gs, spotter_pos) == moved
+
+
+def test_los_polygon_recomputed_past_single_hits() -> None:
+    LosSystem.clear_cache()
+    gs = GameState()
+    # A room drawn as an open loop, so each ray hits the walls only once
+    room = [Vec2(-10, -10), Vec2(10, -10), Vec2(10, 10), Vec2(-10, 10)]
+    gs.add_entity(
+        Transform(Vec2(0, 0)),
+        TerrainFeature(
+            [*room, room[0]],
+            is_closed_loop=False,
+            flag=TerrainFeature.Flag.OPAQUE,
+        ),
+    )
+    spotter_pos = Vec2(0, 0)
+    polygon = LosSystem.get_los_polygon(gs, spotter_pos)
+    assert len(polygon) == 5
+
+    # Terrain past the walls is the second hit of rays now, so the spotter
+    # sees into the walls up to it
+    new_gs = gs.fork()
+    new_gs.add_entity(
+        Transform(Vec2(50, 0)),
+        TerrainFeature(
+            [Vec2(-5, -5), Vec2(5, -5), Vec2(5, 5), Vec2(-5, 5)],
+            flag=TerrainFeature.Flag.OPAQUE,
+        ),
+    )
+    new_polygon = LosSystem.get_los_polygon(new_gs, spotter_pos)
+    assert max(point.x for point in new_polygon) == 45
+    LosSystem.clear_cache()
+    assert LosSystem.get_los_polygon(new_gs, spotter_pos) == new_polygon
@@ -1,5 +1,7 @@
 from dataclasses import dataclass
+from typing import Literal
 
+import numpy as np
 import pytest
 from flanker_core.gamestate import GameState
 from flanker_core.models.components import (
@@ -7,7 +9,9 @@ from flanker_core.models.components import (
     Transform,
 )
 from flanker_core.models.vec2 import Vec2
+from flanker_core.models.vec2_array import Vec2Array
 from flanker_core.systems.los_system import LosSystem
+from flanker_core.utils.prepared_polygon import PreparedPolygon
 
 
 @dataclass
@@ -65,8 +69,12 @@ def fixture() -> Fixture:
     )
 
 
-def test_los_polygon_overlapping_terrain(fixture: Fixture) -> None:
-    polygon = LosSystem.get_los_polygon(fixture.gs, Vec2(2.5, -5))
+@pytest.mark.parametrize("method", ["raycast", "sweep"])
+def test_los_polygon_overlapping_terrain(
+    fixture: Fixture,
+    method: Literal["raycast", "sweep"],
+) -> None:
+    polygon = LosSystem.get_los_polygon(fixture.gs, Vec2(2.5, -5), method=method)
     # There could be other vertices to test, but I'd focus on important ones
     must_includes: list[Vec2] = [
         Vec2(2.5, 2.5),  # The intersection between two terrains
@@ -75,3 +83,52 @@ def test_los_polygon_overlapping_terrain(fixture: Fixture) -> None:
     ]
     for point in must_includes:
         assert point in polygon, f"LOS polygon must include {point=}."
+
+
+@pytest.mark.parametrize(
+    "spotter_pos",
+    [Vec2(2.5, -5), Vec2(-20, 7), Vec2(7, 30), Vec2(2.5, 5), Vec2(500, 500)],
+)
+def test_los_polygon_sweep_matches_raycast(
+    fixture: Fixture,
+    spotter_pos: Vec2,
+) -> None:
+    raycast = LosSystem.get_los_polygon(fixture.gs, spotter_pos, method="raycast")
+    sweep = LosSystem.get_los_polygon(fixture.gs, spotter_pos, method="sweep")
+
+    def area(polygon: list[Vec2]) -> float:
+        return sum(a.cross(b) for a, b in zip(polygon, polygon[1:])) / 2
+
+    assert area(sweep) == pytest.approx(area(raycast), rel=1e-6)
+    # Sample points on a grid offset from any vertex or edge
+    samples = Vec2Array(
+        np.mgrid[-30:40:0.7, -30:40:0.7].reshape(2, -1).T + (0.013, 0.029)
+    )
+    assert (
+        PreparedPolygon(sweep).contains_many(samples).tolist()
+        == PreparedPolygon(raycast).contains_many(samples).tolist()
+    )
+
+
+def test_apply_fov_to_polygon_many(fixture: Fixture) -> None:
+    spotter_pos = Vec2(2.5, -5)
+    polygon = LosSystem.get_los_polygon(fixture.gs, spotter_pos)
+    headings = [0.0, 45.0, 90.0, 200.0, -30.0]
+    fov_polygons = LosSystem.apply_fov_to_polygon_many(polygon, spotter_pos, headings)
+    samples = Vec2Array(
+        np.mgrid[-30:40:0.7, -30:40:0.7].reshape(2, -1).T + (0.013, 0.029)
+    )
+    in_los = PreparedPolygon(polygon).contains_many(samples)
+    directions = samples.translated(Vec2(-spotter_pos.x, -spotter_pos.y))
+
+    for heading, fov_polygon in zip(headings, fov_polygons):
+        assert fov_polygon == LosSystem.apply_fov_to_polygon(
+            polygon, spotter_pos, heading
+        )
+        # The FOV polygon is what's in both LOS polygon and the 90 degree cone
+        forward = Vec2(1, 0).rotated(np.radians(heading))
+        in_cone = directions.normalized().array @ (forward.x, forward.y) > np.sqrt(0.5)
+        assert (
+            PreparedPolygon(fov_polygon).contains_many(samples).tolist()
+            == (in_los & in_cone).tolist()
+        )
@@ -3,7 +3,7 @@ from uuid import UUID
 
 import pytest
 from flanker_core.gamestate import GameState
-from flanker_core.models.actions import MoveAction
+from flanker_core.models.actions import ActionPreview, MoveAction
 from flanker_core.models.components import (
     CombatUnit,
     FireControls,
@@ -12,11 +12,13 @@ from flanker_core.models.components import (
     TerrainFeature,
     Transform,
 )
-from flanker_core.models.outcomes import FireOutcomes
+from flanker_core.models.outcomes import FireOutcomes, InvalidAction
 from flanker_core.models.vec2 import Vec2
 from flanker_core.systems.action_system import ActionSystem
 from flanker_core.systems.fire_system import FireSystem
 from flanker_core.systems.initiative_system import InitiativeSystem
+from flanker_core.systems.los_system import LosSystem
+from flanker_core.systems.move_system import MoveSystem
 
 
 @dataclass
@@ -164,3 +166,50 @@ def test_both_suppress(fixture: Fixture) -> None:
     assert (
         InitiativeSystem.has_initiative(fixture.gs, fixture.unit_shoot_1) == True
     ), "KILL reactive fire lose initiative for moving unit."
+
+
+def test_interrupt_candidates_batch(fixture: Fixture) -> None:
+    line = (Vec2(0, -10), Vec2(20, -10))
+    spotters = [fixture.unit_shoot_1, fixture.unit_shoot_2, fixture.unit_move]
+    interrupts = LosSystem.get_los_from_line_many(fixture.gs, spotters, line)
+    for spotter_id, interrupt_pos in zip(spotters, interrupts):
+        assert interrupt_pos == LosSystem.get_los_from_line(
+            fixture.gs, spotter_id, line
+        ), "Batched LOS from line expects to match a single query"
+
+    candidates = MoveSystem.get_interrupt_candidates(
+        fixture.gs, fixture.unit_move, Vec2(20, -10)
+    )
+    assert len(candidates) == 1, "Stacked shooters expect a single interrupt"
+    position, spotter_ids = candidates[0]
+    assert position.is_close(Vec2(7.5, -10)), "Interrupt expects at Vec2(7.5, -10)"
+    assert spotter_ids == [
+        fixture.unit_shoot_1,
+        fixture.unit_shoot_2,
+    ], "Spotters of an interrupt expect to keep their order"
+
+
+def test_preview(fixture: Fixture) -> None:
+    fixture.fire_controls_1.override = FireOutcomes.MISS
+    fixture.fire_controls_2.override = FireOutcomes.PIN
+    action = MoveAction(fixture.unit_move, Vec2(20, -10))
+    preview = ActionSystem.preview(fixture.gs, action)
+    assert isinstance(preview, ActionPreview), "Move action expects to be valid"
+    assert preview.firer_ids == [
+        fixture.unit_shoot_1,
+        fixture.unit_shoot_2,
+    ], "Both shooters expect to decide the move"
+    transform = fixture.gs.get_component(fixture.unit_move, Transform)
+    assert transform.position == Vec2(0, -10), "Preview mustn't move the unit"
+
+    ActionSystem.apply_preview(fixture.gs, preview)
+    assert transform.position == Vec2(
+        7.5, -10
+    ), "Move action expects to be interrupted at Vec2(7.5, -10)"
+    unit_status = FireSystem.get_status(fixture.gs, fixture.unit_move)
+    assert unit_status == CombatUnit.Status.PINNED, "Target expects to be pinned"
+
+    action = MoveAction(fixture.unit_shoot_1, Vec2(20, 20))
+    assert (
+        ActionSystem.preview(fixture.gs, action) == InvalidAction.NO_INITIATIVE
+    ), "Preview expects to validate the action"
@@ -91,3 +91,34 @@ def test_kill_two(fixture: Fixture) -> None:
     assert (
         winner == InitiativeState.Faction.BLUE
     ), "Expects attacker faction as winner as objective is met"
+
+
+def test_cached_winner(fixture: Fixture) -> None:
+    entity_count = len(fixture.gs.dump())
+    assert ObjectiveSystem.get_winning_faction(fixture.gs) == None
+    assert (
+        len(fixture.gs.dump()) == entity_count
+    ), "Expects reading the winner not to write to the state"
+    for target_id in (fixture.target_id_1, fixture.target_id_2):
+        new_gs = fixture.gs.fork()
+        ActionSystem.perform(
+            gs=fixture.gs,
+            action=FireAction(unit_id=fixture.attacker_id, target_id=target_id),
+        )
+    winner = ObjectiveSystem.get_winning_faction(fixture.gs)
+    assert (
+        winner == InitiativeState.Faction.BLUE
+    ), "Expects the cached winner to update once objective is met"
+    assert (
+        ObjectiveSystem.get_winning_faction(new_gs) == None
+    ), "Expects the forked state to keep its own winner"
+
+    entities = {
+        entity_id: components
+        for entity_id, components in fixture.gs.dump().items()
+        if EliminationWinCondition in components or CombatUnit in components
+    }
+    winner = ObjectiveSystem.get_winning_faction(GameState.load(entities))
+    assert (
+        winner == InitiativeState.Faction.BLUE
+    ), "Expects the winner to be worked out again without the cache"
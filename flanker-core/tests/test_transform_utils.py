@@ -1,5 +1,6 @@
 from flanker_core.models.components import Transform
 from flanker_core.models.vec2 import Vec2
+from flanker_core.models.vec2_array import Vec2Array
 from flanker_core.utils.linear_transform import LinearTransform
 
 
@@ -22,3 +23,17 @@ def test_apply() -> None:
     transform = Transform(position=Vec2(1, 1), degrees=90)
     result = LinearTransform.apply(vecs, transform)
     assert result == [Vec2(x=1.0, y=2.0), Vec2(x=0.0, y=1.0)]
+
+
+def test_apply_array() -> None:
+    vecs = [Vec2(1, 0), Vec2(0, 1), Vec2(-2, 3)]
+    transform = Transform(position=Vec2(1, 1), degrees=37)
+    result = LinearTransform.apply_array(Vec2Array.from_vec2s(vecs), transform)
+    assert result.to_vec2s() == LinearTransform.apply(vecs, transform)
+
+
+def test_array_sorted_by_angle() -> None:
+    vecs = [Vec2(0, -1), Vec2(-1, 0), Vec2(1, 0), Vec2(0, 1)]
+    result = Vec2Array.from_vec2s(vecs).sorted_by_angle(Vec2(0, 0))
+    assert result.to_vec2s() == [Vec2(1, 0), Vec2(0, 1), Vec2(-1, 0), Vec2(0, -1)]
+    assert list(result.closed().distances(Vec2(0, 0))) == [1, 1, 1, 1, 1]
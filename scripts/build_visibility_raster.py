@@ -0,0 +1,17 @@
+from timeit import default_timer
+
+from flanker_ai.states.common.visibility_raster import VisibilityRaster
+from perf_test import load_state
+
+if __name__ == "__main__":
+    PATH = "./scenes/demo.json"
+    CELL_SIZE = 10.0
+
+    gs = load_state(PATH)
+    start = default_timer()
+    raster = VisibilityRaster.build(gs, CELL_SIZE)
+    raster_path = VisibilityRaster.get_path(PATH)
+    raster.save(raster_path)
+    elapsed = default_timer() - start
+    print(f"Built {raster.shape[0]}x{raster.shape[1]} cells in {elapsed:.2f}s")
+    print(f"Saved to {raster_path} ({raster.bits.nbytes / 1024:.1f} KiB)")
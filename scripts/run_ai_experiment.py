@@ -1,5 +1,4 @@
 import random
-from copy import deepcopy
 from dataclasses import dataclass, is_dataclass
 from inspect import isclass
 from itertools import product
@@ -106,7 +105,7 @@ def run_experiments(
     for experiment in experiments:
         current_tally = get_results(experiment)
         remaining_matches = max(0, experiment.n_matches - current_tally.n_matches)
-        gs = deepcopy(experiment.gs)
+        gs = experiment.gs.copy()
         for _ in range(remaining_matches):
             matches.append((gs, experiment))
 
@@ -63,9 +63,11 @@ class AiService:
         gs: GameState,
         request: AiWaypointConfigRequest,
     ) -> None:
-        for _, config_component in gs.query(AiConfigComponent):
+        for entity_id, config_component in gs.query(AiConfigComponent):
             if config_component.faction != request.faction:
                 continue
+            # Edit through a mutable copy, as copied states may share configs
+            config_component = gs.get_mut_component(entity_id, AiConfigComponent)
             if not isinstance(config_component.config, SearchPolicyConfig):
                 continue
             if not isinstance(config_component.config.state, WaypointsStateConfig):
@@ -1,5 +1,6 @@
 from dataclasses import dataclass
 
+from flanker_core.utils.component_cloner import ComponentCloner
 from webapi.models import ActionLog, TerrainModel
 
 
@@ -15,3 +16,7 @@ class LogRecords:
     """Singleton component contains past action log snapshots."""
 
     logs: list[ActionLog]
+
+
+# Logs are snapshots that are never mutated once recorded
+ComponentCloner.register(LogRecords, lambda records: LogRecords(list(records.logs)))
@@ -8,22 +8,17 @@ class LoggingService:
 
     @staticmethod
     def log(gs: GameState, log: ActionLog) -> None:
-        if results := gs.query(LogRecords):
-            _, log_records = results[0]
-        else:
-            gs.add_entity(log_records := LogRecords([]))
-
-        log_records.logs.append(log)
+        if gs.try_singleton(LogRecords) is None:
+            gs.set_singleton(LogRecords([]))
+        gs.get_mut_singleton(LogRecords).logs.append(log)
 
     @staticmethod
     def get_logs(gs: GameState) -> list[ActionLog]:
-        if results := gs.query(LogRecords):
-            _, log_records = results[0]
+        if log_records := gs.try_singleton(LogRecords):
             return log_records.logs
         return []
 
     @staticmethod
     def clear_logs(gs: GameState) -> None:
-        if results := gs.query(LogRecords):
-            _, log_records = results[0]
-            log_records.logs = []
+        if gs.try_singleton(LogRecords):
+            gs.get_mut_singleton(LogRecords).logs = []
@@ -3,6 +3,7 @@ from uuid import UUID
 from flanker_core.gamestate import GameState
 from flanker_core.models.components import TerrainFeature, Transform
 from flanker_core.models.vec2 import Vec2
+from flanker_core.systems.terrain_system import TerrainSystem
 
 from webapi.components import TerrainTypeTag
 from webapi.models import TerrainModel
@@ -89,11 +90,12 @@ class TerrainService:
 
     @staticmethod
     def update_terrain(gs: GameState, terrain_model: TerrainModel) -> None:
-        transform = gs.get_component(terrain_model.terrain_id, Transform)
-        terrain = gs.get_component(terrain_model.terrain_id, TerrainFeature)
-        tag = gs.get_component(terrain_model.terrain_id, TerrainTypeTag)
+        transform = gs.get_mut_component(terrain_model.terrain_id, Transform)
+        terrain = gs.get_mut_component(terrain_model.terrain_id, TerrainFeature)
+        tag = gs.get_mut_component(terrain_model.terrain_id, TerrainTypeTag)
         transform.position = terrain_model.position
         transform.degrees = terrain_model.degrees
         terrain.vertices = terrain_model.vertices
         terrain.flag = TerrainService.get_terrain_flags(terrain_model.terrain_type)
         tag.type = terrain_model.terrain_type
+        TerrainSystem.invalidate_geometry(gs, terrain_model.terrain_id)